@@ -0,0 +1,58 @@
+"""Parsing of the free-form contract amounts sources publish into integer cents."""
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Optional
+import re
+
+# "$1,234,567.89", "1234567", "USD 2,500", "$1.2M", "750K", "(1,000.00)"
+AMOUNT_PATTERN = re.compile(
+    r"^\s*(\()?\s*(?:USD|US\$|\$)?\s*(-)?\s*\$?\s*"
+    r"(\d{1,3}(?:,\d{3})+|\d+)?(\.\d+)?\s*"
+    r"(k|thousand|m|mil|million|b|billion)?\s*(?:USD)?\s*(\))?\s*$",
+    re.IGNORECASE,
+)
+
+_MULTIPLIERS = {
+    None: 1,
+    "k": 1_000,
+    "thousand": 1_000,
+    "m": 1_000_000,
+    "mil": 1_000_000,
+    "million": 1_000_000,
+    "b": 1_000_000_000,
+    "billion": 1_000_000_000,
+}
+
+
+def parse_amount_cents(raw: Optional[str]) -> Optional[int]:
+    """
+    Parse a contract amount into whole cents.
+
+    Accepts an optional currency mark, thousands separators, decimals, a
+    k/M/B suffix and accounting-style parentheses for negatives. Fractions
+    of a cent are rounded half up.
+
+    Args:
+        raw: Amount as the source published it
+
+    Returns:
+        Amount in cents, or None if raw is empty or not a recognisable amount
+    """
+    if raw is None:
+        return None
+    if isinstance(raw, (int, float, Decimal)):
+        raw = str(raw)
+    match = AMOUNT_PATTERN.match(raw)
+    if match is None:
+        return None
+    opening, minus, whole, fraction, suffix, closing = match.groups()
+    if whole is None and fraction is None:
+        return None
+    if bool(opening) != bool(closing):
+        return None
+    try:
+        value = Decimal((whole or "0").replace(",", "") + (fraction or ""))
+    except InvalidOperation:
+        return None
+    multiplier = _MULTIPLIERS[suffix.lower() if suffix else None]
+    cents = int((value * multiplier * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    return -cents if (minus or opening) else cents
@@ -0,0 +1,95 @@
+"""Streaming NDJSON/CSV encoding for GET /leads/export."""
+from typing import Any, Callable, Iterable, Iterator, List, Sequence
+from datetime import date
+import csv
+import enum
+import io
+import json
+
+from sqlalchemy import Date, DateTime, Enum
+from sqlalchemy.orm import Session
+
+# Rows fetched from the cursor and encoded per chunk of the response body
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value: Any) -> Any:
+    """Column value as a JSON/CSV scalar."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, date):  # Also datetime
+        return value.isoformat()
+    return value
+
+
+def _needs_plain(column) -> bool:
+    """Whether values of a selected column can be something other than a JSON/CSV scalar."""
+    return isinstance(column.type, (Date, DateTime, Enum))
+
+
+def _plain_rows(rows: Sequence, convert: Sequence[bool]) -> Iterator[tuple]:
+    """Rows with _plain() applied to only the columns that need it."""
+    if not any(convert):
+        return iter(rows)
+    return (
+        tuple(_plain(value) if flag else value for value, flag in zip(row, convert))
+        for row in rows
+    )
+
+
+def _ndjson_chunk(fields: Sequence[str], rows: Iterable[tuple]) -> str:
+    return "".join([json.dumps(dict(zip(fields, row))) + "\n" for row in rows])
+
+
+def _csv_chunk(writer, buffer: io.StringIO, rows: Iterable[tuple]) -> str:
+    writer.writerows(rows)
+    chunk = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    stmt,
+    fields: List[str],
+    fmt: str,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[str]:
+    """
+    Encode the rows of stmt as NDJSON lines or CSV, one chunk per batch.
+
+    Rows are pulled from the cursor batch_size at a time (yield_per), so
+    only one batch is ever held in memory however many rows match. The
+    generator opens its own session because it runs after the request
+    handler has returned, and closes it when the stream ends or the client
+    disconnects.
+
+    Args:
+        session_factory: Opens the session to read from
+        stmt: SELECT returning exactly `fields`, in order
+        fields: Column names, used as JSON keys or the CSV header
+        fmt: "ndjson" or "csv"
+        batch_size: Rows per fetch and per yielded chunk
+
+    Yields:
+        Encoded text chunks
+    """
+    convert = [_needs_plain(column) for column in stmt.selected_columns]
+    db = session_factory()
+    try:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            yield _csv_chunk(writer, buffer, [fields])
+        for rows in result.partitions():
+            rows = _plain_rows(rows, convert)
+            yield _csv_chunk(writer, buffer, rows) if fmt == "csv" else _ndjson_chunk(fields, rows)
+    finally:
+        db.close()
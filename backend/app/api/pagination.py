@@ -0,0 +1,41 @@
+"""Keyset pagination helpers for lead listings."""
+from typing import Tuple
+import base64
+import json
+
+# Order a cursor is issued for when it does not name one
+DEFAULT_SORT = "score"
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor that was not issued by the API."""
+
+
+def encode_cursor(value: int, lead_id: int, sort: str = DEFAULT_SORT) -> str:
+    """Opaque cursor for the position after the lead with this (sort value, id)."""
+    # Score cursors keep their original two-element form
+    position = [value, lead_id] if sort == DEFAULT_SORT else [value, lead_id, sort]
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str = DEFAULT_SORT) -> Tuple[int, int]:
+    """
+    Recover (sort value, id) from a cursor produced by encode_cursor.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, lead_id, *rest = position
+        issued_for = rest[0] if rest else DEFAULT_SORT
+        if len(rest) > 1:
+            raise ValueError(cursor)
+        value, lead_id = int(value), int(lead_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+    if issued_for != sort:
+        raise InvalidCursor(f"Cursor was issued for sort={issued_for}, not sort={sort}")
+    return value, lead_id
@@ -0,0 +1,98 @@
+"""In-process LRU cache of serialized GET /leads responses."""
+from typing import Hashable, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import os
+import threading
+
+# Size limits, overridable for memory-constrained deployments
+LEADS_CACHE_MAX_ENTRIES = int(os.getenv("LEADS_CACHE_MAX_ENTRIES", "256"))
+LEADS_CACHE_MAX_BYTES = int(os.getenv("LEADS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+@dataclass
+class CachedResponse:
+    """A serialized response body and the data version it was built from."""
+    version: int
+    etag: str
+    body: bytes
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches etag (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class ResponseCache:
+    """
+    Response bodies keyed by normalized request parameters.
+
+    An entry is only served for the data version it was built from, so a
+    bump of the database's data version invalidates everything at once
+    without touching the cache. Least recently used entries are evicted
+    beyond max_entries or max_bytes of bodies. Safe to share between the
+    threadpool workers that run the route handlers.
+    """
+
+    def __init__(self, max_entries: int = LEADS_CACHE_MAX_ENTRIES, max_bytes: int = LEADS_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int) -> Optional[CachedResponse]:
+        """Cached response for key built at this data version, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, version: int, body: bytes) -> CachedResponse:
+        """Store body for key and return the entry (bodies over max_bytes are not kept)."""
+        entry = CachedResponse(version=version, etag=make_etag(body), body=body)
+        if len(body) > self.max_bytes:
+            return entry
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+        return entry
+
+    def _remove(self, key: Hashable):
+        self._bytes -= len(self._entries.pop(key).body)
+
+    def clear(self):
+        """Drop every entry and reset the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+leads_cache = ResponseCache()
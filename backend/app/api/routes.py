@@ -1,25 +1,49 @@
 """API route handlers."""
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from typing import List, Optional
+from sqlalchemy import String, exists, func, literal, literal_column, or_, select, text
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
+import json
 
-from ..database import get_db
-from ..models import ContractAward, ContractStatus
+from ..contractors import contractors_page
+from ..data_version import bump_data_version, current_data_version
+from ..database import get_db, get_read_db, get_read_session_factory, get_session_factory
+from ..lead_stats import LeadStatsDelta, read_lead_stats
+from ..metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from ..models import ContractAward, ContractKeyword, ContractStatus, IngestRun, Keyword, contract_awards_fts
 from ..schemas import (
     ContractAwardResponse,
-    IngestResponse,
+    ContractorPage,
+    IngestJobResponse,
+    IngestRunResponse,
+    RescoreJobResponse,
     StatusUpdate,
     HealthResponse,
-    LeadFilterParams
+    LeadFilterParams,
+    LeadPage,
+    LeadSearchResults,
+    LeadStats
 )
-from ..ingest.runner import run_ingestion
+from ..ingest.jobs import job_manager, rescore_job_manager
+from ..ingest.scheduler import run_leased_ingestion
+from ..rescore import rescore
+from .export import EXPORT_MEDIA_TYPES, stream_export
+from .pagination import DEFAULT_SORT, InvalidCursor, decode_cursor, encode_cursor
+from .response_cache import etag_matches, leads_cache
+from .search import InvalidQuery, match_expression
 
 router = APIRouter()
 
+# Handlers that use the database are plain `def`: FastAPI runs them in its
+# threadpool, so blocking SQLite calls never stall the event loop. Only
+# handlers that do no blocking I/O are `async def`. Read-only handlers take
+# get_read_db so they never wait on the single writer connection.
+
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check(db: Session = Depends(get_db)):
+def health_check(db: Session = Depends(get_read_db)):
     """Health check endpoint."""
     try:
         # Test database connection
@@ -29,54 +53,447 @@ async def health_check(db: Session = Depends(get_db)):
         return HealthResponse(status="unhealthy", database=f"error: {str(e)}")
 
 
-@router.post("/ingest/run", response_model=IngestResponse)
-async def run_ingest(db: Session = Depends(get_db)):
+@router.post("/ingest/run", response_model=IngestJobResponse, status_code=202)
+async def run_ingest(
+    response: Response,
+    refresh: bool = Query(False, description="Ignore the page cache and re-parse every page"),
+    session_factory=Depends(get_session_factory)
+):
     """
-    Run ingestion for all sources (KYTC and INDOT).
+    Start ingestion for all sources (KYTC and INDOT) in the background.
     Normalizes, scores, and upserts contracts into database.
+    
+    Returns the job immediately; poll GET /ingest/jobs/{id} for progress.
+    If an ingest is already running, that job is returned instead of
+    starting a second one (with 200 rather than 202). If another process
+    (worker) is ingesting, the job fails at once with LeaseHeld.
     """
-    try:
-        result = run_ingestion(db)
-        return IngestResponse(**result)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
+    def target(job):
+        return run_leased_ingestion(session_factory, refresh=refresh, progress=job.report)
 
+    job, started = job_manager.start(target, params={"refresh": refresh})
+    if not started:
+        response.status_code = 200
+    return job.snapshot()
 
-@router.get("/leads", response_model=List[ContractAwardResponse])
-async def get_leads(
-    state: Optional[str] = Query(None, description="Filter by state (KY or IN)"),
-    status: Optional[str] = Query(None, description="Filter by status (new/contacted/ignored/converted)"),
-    min_score: Optional[int] = Query(None, description="Minimum score threshold"),
-    db: Session = Depends(get_db)
+
+@router.get("/ingest/jobs/{job_id}", response_model=IngestJobResponse)
+async def get_ingest_job(job_id: str):
+    """
+    Get the stage, progress counts and timings of an ingestion job.
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Ingest job {job_id} not found")
+    return job.snapshot()
+
+
+@router.get("/ingest/runs", response_model=List[IngestRunResponse])
+def list_ingest_runs(
+    limit: int = Query(20, ge=1, le=200, description="Number of runs to return, newest first"),
+    db: Session = Depends(get_read_db)
 ):
     """
-    Get leads (contract awards) sorted by score descending.
-    Supports filtering by state, status, and minimum score.
+    Recent ingest runs with their counts and per-source, per-stage summary.
     """
-    query = db.query(ContractAward)
+    runs = db.execute(select(IngestRun).order_by(IngestRun.id.desc()).limit(limit)).scalars().all()
+    return [
+        IngestRunResponse(
+            id=run.id,
+            status=run.status,
+            started_at=run.started_at,
+            finished_at=run.finished_at,
+            duration_seconds=run.duration_seconds,
+            counts=json.loads(run.counts),
+            summary=json.loads(run.summary),
+            error=run.error,
+        )
+        for run in runs
+    ]
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Process metrics in the Prometheus text format: request latency per
+    route and ingest pages, bytes, rows, skips and stage durations.
+    """
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@router.post("/admin/rescore", response_model=RescoreJobResponse, status_code=202)
+async def run_rescore(
+    response: Response,
+    dry_run: bool = Query(False, description="Only count the rows that would be rescored"),
+    session_factory=Depends(get_session_factory)
+):
+    """
+    Rescore stored leads whose score may be stale under the current
+    KEYWORD_WEIGHTS, in the background.
     
-    # Apply filters
+    Only rows containing a keyword whose weight changed since they were
+    scored are rescored. Poll GET /admin/rescore/jobs/{id} for progress;
+    a running rescore is returned (with 200) instead of starting another.
+    """
+    def target(job):
+        db = session_factory()
+        try:
+            return rescore(db, dry_run=dry_run, progress=job.report)
+        finally:
+            db.close()
+    
+    job, started = rescore_job_manager.start(target, params={"dry_run": dry_run})
+    if not started:
+        response.status_code = 200
+    return job.snapshot()
+
+
+@router.get("/admin/rescore/jobs/{job_id}", response_model=RescoreJobResponse)
+async def get_rescore_job(job_id: str):
+    """
+    Get the stage, progress counts and timings of a rescoring job.
+    """
+    job = rescore_job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Rescore job {job_id} not found")
+    return job.snapshot()
+
+
+# Fields a /leads client may request with `fields=`
+LEAD_FIELDS = list(ContractAwardResponse.model_fields)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Columns a lead listing can be ordered by (descending, then id), by `sort` value
+LEAD_SORTS = {
+    "score": ContractAward.score,
+    "amount": ContractAward.amount_cents,
+}
+
+
+def _sqlite_timestamp(value: datetime) -> str:
+    """A datetime as the UTC 'YYYY-MM-DD HH:MM:SS' text SQLite's CURRENT_TIMESTAMP stores."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _cents(dollars: float) -> int:
+    """A dollar amount from a query parameter in the integer cents amount_cents stores."""
+    return int(round(dollars * 100))
+
+
+def _sort_column(sort: str):
+    """
+    Column behind a `sort` parameter.
+    
+    Raises:
+        HTTPException: 400 for an unknown sort
+    """
+    if sort not in LEAD_SORTS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort: {sort} (use {' or '.join(LEAD_SORTS)})")
+    return LEAD_SORTS[sort]
+
+
+def lead_filters(
+    state: Optional[str],
+    status: Optional[str],
+    min_score: Optional[int],
+    updated_since: Optional[datetime] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    sort: str = DEFAULT_SORT,
+    keyword: Optional[str] = None,
+) -> list:
+    """
+    WHERE clauses for the filters shared by the lead listing endpoints.
+
+    min_amount and max_amount are in dollars and only match leads whose
+    amount could be parsed; sort=amount leaves out leads without one too.
+    A range on a column other than the sort column is written as
+    `column + 0`, which SQLite cannot serve from an index, so it keeps
+    walking the sort column's index (filtering as it goes) instead of
+    picking the range's index and sorting the matches. For the same reason
+    keyword is tested per lead, with a primary key lookup in
+    contract_keywords, rather than by reading the keyword's leads first.
+
+    Raises:
+        HTTPException: 400 for an unknown status
+    """
+    sort_column = _sort_column(sort)
+    
+    def ranged(column):
+        return column if column is sort_column else column + 0
+    
+    clauses = []
     if state:
-        query = query.filter(ContractAward.state == state.upper())
+        clauses.append(ContractAward.state == state.upper())
     
     if status:
         try:
             status_enum = ContractStatus(status.lower())
-            query = query.filter(ContractAward.status == status_enum)
+            clauses.append(ContractAward.status == status_enum)
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
     
     if min_score is not None:
-        query = query.filter(ContractAward.score >= min_score)
+        clauses.append(ranged(ContractAward.score) >= min_score)
     
-    # Sort by score descending
-    contracts = query.order_by(ContractAward.score.desc()).all()
+    if updated_since is not None:
+        # Compared as text in the stored format, so the updated_at index applies
+        clauses.append(ContractAward.updated_at >= literal(_sqlite_timestamp(updated_since), String))
     
-    return contracts
+    if min_amount is not None:
+        clauses.append(ranged(ContractAward.amount_cents) >= _cents(min_amount))
+    elif sort == "amount":
+        # Only without a lower bound: a redundant IS NOT NULL next to one
+        # makes SQLite prefer a shorter index
+        clauses.append(ContractAward.amount_cents.is_not(None))
+    
+    if max_amount is not None:
+        clauses.append(ranged(ContractAward.amount_cents) <= _cents(max_amount))
+    
+    if keyword:
+        keyword_id = select(Keyword.id).where(Keyword.keyword == keyword.strip().lower()).scalar_subquery()
+        clauses.append(exists().where(
+            ContractKeyword.contract_award_id == ContractAward.id,
+            ContractKeyword.keyword_id == keyword_id,
+        ))
+    
+    return clauses
+
+
+def _projected_fields(fields: Optional[str]) -> List[str]:
+    """Validate a comma-separated `fields` parameter (all fields when omitted)."""
+    if not fields:
+        return LEAD_FIELDS
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in LEAD_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def leads_page_query(
+    clauses: list,
+    fields: List[str],
+    after: Optional[Tuple[int, int]],
+    limit: int,
+    sort: str = DEFAULT_SORT,
+):
+    """
+    SELECT for one page of leads in (sort column DESC, id) order.
+    
+    The keyset condition is written as v <= s AND (v < s OR id > i) rather
+    than a plain OR so SQLite sees a range on the sort column and keeps
+    walking the (filters..., column DESC) index instead of sorting.
+    
+    Args:
+        clauses: Filter clauses from lead_filters() for the same sort
+        fields: Columns to return; id and the sort column are always included
+        after: (sort value, id) of the last lead on the previous page
+        limit: Maximum rows
+        sort: Key of LEAD_SORTS
+    """
+    column = _sort_column(sort)
+    clauses = list(clauses)
+    if after is not None:
+        after_value, after_id = after
+        clauses.append(column <= after_value)
+        clauses.append(or_(column < after_value, ContractAward.id > after_id))
+    
+    columns = [ContractAward.id, column] + [
+        getattr(ContractAward, f) for f in fields if f not in ("id", column.key)
+    ]
+    return (
+        select(*columns)
+        .where(*clauses)
+        .order_by(column.desc(), ContractAward.id)
+        .limit(limit)
+    )
+
+
+@router.get("/leads", response_model=LeadPage)
+def get_leads(
+    request: Request,
+    state: Optional[str] = Query(None, description="Filter by state (KY or IN)"),
+    status: Optional[str] = Query(None, description="Filter by status (new/contacted/ignored/converted)"),
+    min_score: Optional[int] = Query(None, description="Minimum score threshold"),
+    updated_since: Optional[datetime] = Query(None, description="Only leads whose content or status changed at or after this time (ISO 8601, UTC if no offset)"),
+    min_amount: Optional[float] = Query(None, ge=0, description="Minimum contract amount in dollars"),
+    max_amount: Optional[float] = Query(None, ge=0, description="Maximum contract amount in dollars"),
+    sort: str = Query(DEFAULT_SORT, description="score or amount (largest first; leads without a known amount are left out)"),
+    keyword: Optional[str] = Query(None, description="Only leads that matched this scoring keyword (e.g. earthwork)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum leads per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get leads (contract awards) sorted by score (or amount) descending.
+    Supports filtering by state, status, minimum score, last change time,
+    amount range and matched scoring keyword.
+    
+    Results are paginated by keyset on (sort column DESC, id): pass the returned
+    next_cursor back as `cursor` to get the following page. Each page costs
+    the same however deep it is, since no rows are skipped with OFFSET.
+    
+    Serialized pages are cached until the data version changes, and carry
+    an ETag: a poll sending it back in If-None-Match gets 304 Not Modified
+    while nothing has changed.
+    """
+    projected = _projected_fields(fields)
+    sort_key = _sort_column(sort).key
+    
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, sort)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    # A sort=amount cursor comes from a lead within max_amount, so the keyset
+    # already bounds amount from above; a second upper bound on the index
+    # column makes SQLite pick a shorter index
+    page_max_amount = None if after is not None and sort == "amount" else max_amount
+    clauses = lead_filters(state, status, min_score, updated_since, min_amount, page_max_amount, sort, keyword)
+    
+    # Read in the same transaction as the page, so the version matches the data
+    version = current_data_version(db)
+    key = (
+        state.upper() if state else None,
+        status.lower() if status else None,
+        min_score,
+        _sqlite_timestamp(updated_since) if updated_since else None,
+        _cents(min_amount) if min_amount is not None else None,
+        _cents(max_amount) if max_amount is not None else None,
+        sort,
+        keyword.strip().lower() if keyword else None,
+        limit,
+        after,
+        tuple(projected),
+    )
+    cached = leads_cache.get(key, version)
+    if cached is None:
+        rows = db.execute(leads_page_query(clauses, projected, after, limit + 1, sort)).mappings().all()
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][sort_key], rows[-1]["id"], sort)
+        
+        items = [{f: row[f] for f in projected} for row in rows]
+        body = LeadPage(items=items, next_cursor=next_cursor).model_dump_json().encode()
+        cached = leads_cache.put(key, version, body)
+    
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("If-None-Match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(cached.body, media_type="application/json", headers=headers)
+
+
+def leads_export_query(clauses: list, fields: List[str], sort: str = DEFAULT_SORT):
+    """SELECT for every matching lead, exactly `fields` in order, sorted as GET /leads."""
+    column = _sort_column(sort)
+    return (
+        select(*[getattr(ContractAward, f) for f in fields])
+        .where(*clauses)
+        .order_by(column.desc(), ContractAward.id)
+    )
+
+
+@router.get("/leads/export")
+def export_leads(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    state: Optional[str] = Query(None, description="Filter by state (KY or IN)"),
+    status: Optional[str] = Query(None, description="Filter by status (new/contacted/ignored/converted)"),
+    min_score: Optional[int] = Query(None, description="Minimum score threshold"),
+    updated_since: Optional[datetime] = Query(None, description="Only leads whose content or status changed at or after this time (ISO 8601, UTC if no offset)"),
+    min_amount: Optional[float] = Query(None, ge=0, description="Minimum contract amount in dollars"),
+    max_amount: Optional[float] = Query(None, ge=0, description="Maximum contract amount in dollars"),
+    sort: str = Query(DEFAULT_SORT, description="score or amount (largest first; leads without a known amount are left out)"),
+    keyword: Optional[str] = Query(None, description="Only leads that matched this scoring keyword (e.g. earthwork)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to export (default: all)"),
+    session_factory=Depends(get_read_session_factory)
+):
+    """
+    Export every lead matching the GET /leads filters as NDJSON or CSV.
+    
+    The body is streamed from a database cursor in batches, so memory use
+    stays flat however many leads are exported.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid format: {format} (use ndjson or csv)")
+    projected = _projected_fields(fields)
+    clauses = lead_filters(state, status, min_score, updated_since, min_amount, max_amount, sort, keyword)
+    query = leads_export_query(clauses, projected, sort)
+    
+    return StreamingResponse(
+        stream_export(session_factory, query, projected, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="leads.{format}"'},
+    )
+
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Highlight markers and context length (in tokens) for search snippets
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 12
+
+
+def leads_search_query(match: str, clauses: list, fields: List[str], limit: int):
+    """SELECT for one page of search results, best bm25 rank first."""
+    fts = literal_column(contract_awards_fts.name)
+    rank = func.bm25(fts).label("rank")
+    snippet = func.snippet(fts, -1, SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS).label("snippet")
+    return (
+        select(*[getattr(ContractAward, f) for f in fields], snippet, rank)
+        .select_from(contract_awards_fts.join(ContractAward, ContractAward.id == contract_awards_fts.c.rowid))
+        .where(fts.match(match), *clauses)
+        .order_by(rank, ContractAward.id)
+        .limit(limit)
+    )
+
+
+@router.get("/leads/search", response_model=LeadSearchResults)
+def search_leads(
+    q: str = Query(..., description="Words to find in the description, contractor or contract id"),
+    state: Optional[str] = Query(None, description="Filter by state (KY or IN)"),
+    status: Optional[str] = Query(None, description="Filter by status (new/contacted/ignored/converted)"),
+    min_score: Optional[int] = Query(None, description="Minimum score threshold"),
+    min_amount: Optional[float] = Query(None, ge=0, description="Minimum contract amount in dollars"),
+    max_amount: Optional[float] = Query(None, ge=0, description="Maximum contract amount in dollars"),
+    keyword: Optional[str] = Query(None, description="Only leads that matched this scoring keyword (e.g. earthwork)"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT, description="Maximum results"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (default: all)"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Full-text search over lead descriptions, contractors and contract ids.
+    
+    Every word must match (with stemming, so "haul" finds "hauling").
+    Results are ranked by relevance and carry a `snippet` with the matched
+    words wrapped in <mark></mark>. Accepts the same filters as GET /leads.
+    """
+    projected = _projected_fields(fields)
+    clauses = lead_filters(state, status, min_score, min_amount=min_amount, max_amount=max_amount, keyword=keyword)
+    try:
+        match = match_expression(q)
+    except InvalidQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    rows = db.execute(leads_search_query(match, clauses, projected, limit)).mappings().all()
+    items = [{**{f: row[f] for f in projected}, "snippet": row["snippet"], "rank": row["rank"]} for row in rows]
+    return LeadSearchResults(items=items)
 
 
 @router.post("/leads/{lead_id}/status", response_model=ContractAwardResponse)
-async def update_lead_status(
+def update_lead_status(
     lead_id: int,
     status_update: StatusUpdate,
     db: Session = Depends(get_db)
@@ -91,10 +508,67 @@ async def update_lead_status(
     
     # Update status
     try:
-        contract.status = ContractStatus(status_update.status.value)
+        new_status = ContractStatus(status_update.status.value)
+        if contract.status != new_status:
+            stats = LeadStatsDelta()
+            stats.remove(contract.state, contract.status, contract.score, contract.letting_date, contract.contractor_id)
+            stats.add(contract.state, new_status, contract.score, contract.letting_date, contract.contractor_id)
+            stats.apply(db)
+            contract.status = new_status
+            bump_data_version(db)
         db.commit()
         db.refresh(contract)
         return contract
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid status: {status_update.status}")
 
+
+@router.get("/stats", response_model=LeadStats)
+def get_stats(
+    weeks: int = Query(52, ge=1, le=520, description="Most recent letting weeks to return"),
+    top: int = Query(10, ge=1, le=100, description="Contractors to return, most leads first"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Lead counts by state and status, score histogram, weekly lead volume by
+    letting date and top contractors.
+
+    Read from summary tables that every write to the leads keeps current
+    (see app.lead_stats), so the cost does not grow with the number of leads.
+    """
+    stats = read_lead_stats(db, weeks=weeks, top=top)
+    for row in stats["by_state_status"]:
+        row["status"] = ContractStatus[row["status"]].value
+    return stats
+
+
+# Order the contractor listing's cursors are issued for
+CONTRACTOR_SORT = "leads"
+
+
+@router.get("/contractors", response_model=ContractorPage)
+def list_contractors(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum contractors per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Contractors with their lead counts, most leads first, each with the raw
+    awarded_to names it was published under.
+
+    Counts come from the GET /stats summary tables; pages are keyset on
+    (leads DESC, id) like GET /leads.
+    """
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, CONTRACTOR_SORT)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    items = contractors_page(db, limit + 1, after)
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1]["leads"], items[-1]["id"], CONTRACTOR_SORT)
+    return ContractorPage(items=items, next_cursor=next_cursor)
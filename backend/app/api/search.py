@@ -0,0 +1,23 @@
+"""Full-text query parsing for GET /leads/search."""
+from typing import List
+
+
+class InvalidQuery(ValueError):
+    """Raised for a search query with no terms."""
+
+
+def match_expression(q: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression that finds rows containing every term.
+
+    Each whitespace-separated term is quoted, so user input can never be read
+    as FTS5 syntax (AND/OR/NEAR, column filters, '*', '-'). Punctuation
+    inside a term splits it into a phrase: "dump-truck" matches "dump truck".
+
+    Raises:
+        InvalidQuery: If q has no terms
+    """
+    terms: List[str] = q.split()
+    if not terms:
+        raise InvalidQuery("Search query is empty")
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
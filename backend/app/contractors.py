@@ -0,0 +1,282 @@
+"""
+Contractor entities: canonical company names and fuzzy deduplication.
+
+Sources publish `awarded_to` as scraped, so one company shows up as "ABC
+Paving, Inc.", "ABC PAVING INC" and "A.B.C. Paving". Each distinct raw name
+is resolved once to a contractor and remembered in contractor_aliases, and
+contract_awards.contractor_id links every lead to its contractor.
+
+A new name is resolved in two steps:
+1. canonical_name() folds case, punctuation, "&", spaced-out initials and
+   trailing legal suffixes ("Inc", "LLC", "Co." ...). Names with the same
+   canonical form are the same contractor.
+2. Otherwise it joins the known contractor whose canonical name is most
+   similar, if the Dice coefficient of their character trigrams reaches
+   CONTRACTOR_MATCH_THRESHOLD, and starts a new contractor if none does.
+
+Comparing a name with every known name is quadratic over a backfill.
+ContractorIndex keeps an inverted index of trigram -> names and only
+probes a name's rarest trigrams, just enough of them that any name
+reaching the threshold must share at least one, and counts how many each
+candidate shares. Only candidates that could still reach the threshold
+are scored, and no match above it is missed.
+"""
+from collections import Counter, defaultdict
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+import math
+import os
+import re
+import unicodedata
+
+from sqlalchemy import text
+
+# Lowest trigram Dice coefficient at which two canonical names are taken to
+# be the same contractor
+CONTRACTOR_MATCH_THRESHOLD = float(os.getenv("CONTRACTOR_MATCH_THRESHOLD", "0.8"))
+
+# Dropped from the end of a name (repeatedly), after punctuation is removed
+LEGAL_SUFFIXES = {
+    "INC", "INCORPORATED", "LLC", "LC", "LLP", "LP", "PLLC", "PC", "PSC",
+    "CO", "COMPANY", "CORP", "CORPORATION", "LTD", "LIMITED",
+}
+
+# Raw names looked up per SELECT
+ALIAS_LOOKUP_CHUNK = 500
+
+_JOINED = re.compile(r"[.'’]")
+_SEPARATORS = re.compile(r"[^A-Z0-9]+")
+
+
+def canonical_name(raw: str) -> str:
+    """
+    Name with the differences that do not tell companies apart removed.
+
+    "ABC Paving, Inc.", "ABC PAVING INC" and "A. B. C. Paving" all become
+    "ABC PAVING".
+    """
+    name = unicodedata.normalize("NFKD", raw or "").encode("ascii", "ignore").decode().upper()
+    name = _SEPARATORS.sub(" ", _JOINED.sub("", name.replace("&", " AND "))).split()
+
+    # "A B C" (from "A. B. C.") is one word
+    tokens: List[str] = []
+    initials = False  # Whether tokens[-1] is made of single letters only
+    for token in name:
+        if token.isalpha() and len(token) == 1 and initials:
+            tokens[-1] += token
+        else:
+            tokens.append(token)
+            initials = token.isalpha() and len(token) == 1
+
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    if len(tokens) > 1 and tokens[0] == "THE":
+        tokens.pop(0)
+    return " ".join(tokens) or (raw or "").strip().upper()
+
+
+def trigrams(canonical: str) -> FrozenSet[str]:
+    """Character trigrams of a canonical name, padded so word starts and ends count."""
+    padded = f" {canonical} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def dice(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Dice coefficient of two trigram sets."""
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 1.0
+
+
+class ContractorIndex:
+    """
+    Canonical names of known contractors, blocked by trigram for fuzzy lookup.
+
+    Attributes:
+        scored: Candidate pairs scored so far (for benchmarks)
+    """
+
+    def __init__(self, threshold: float = CONTRACTOR_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.contractors: Dict[str, int] = {}  # canonical name -> contractor id
+        self._names: List[str] = []
+        self._grams: List[FrozenSet[str]] = []
+        self._sizes: List[int] = []  # len(_grams[i])
+        self._postings: Dict[str, List[int]] = defaultdict(list)  # trigram -> positions in _names
+        self.scored = 0
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, canonical: str, contractor_id: int):
+        """Index a canonical name of a contractor."""
+        if canonical in self.contractors:
+            return
+        self.contractors[canonical] = contractor_id
+        grams = trigrams(canonical)
+        position = len(self._names)
+        self._names.append(canonical)
+        self._grams.append(grams)
+        self._sizes.append(len(grams))
+        for gram in grams:
+            self._postings[gram].append(position)
+
+    def match(self, canonical: str) -> Optional[int]:
+        """
+        Contractor id of canonical, or of the most similar indexed name at
+        or above the threshold (ties go to the earliest indexed).
+
+        Returns:
+            Contractor id, or None if no indexed name is similar enough
+        """
+        if canonical in self.contractors:
+            return self.contractors[canonical]
+        grams = trigrams(canonical)
+        n = len(grams)
+        t = self.threshold
+        # 2o / (n + m) >= t needs m >= n*t / (2 - t), so an overlap o of at
+        # least n*t / (2 - t). A name sharing none of n - o + 1 probed
+        # trigrams shares at most o - 1, so probing the rarest ones suffices.
+        min_overlap = max(1, math.ceil(t * n / (2 - t) - 1e-9))
+        probes = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))[:n - min_overlap + 1]
+        shared = Counter()
+        for gram in probes:
+            shared.update(self._postings.get(gram, ()))
+
+        # A candidate sharing c probed trigrams shares at most c plus the
+        # unprobed ones; only those that could still reach t are scored
+        unprobed = n - len(probes)
+        best, best_score = None, t
+        for position in sorted(shared):
+            if 2 * (shared[position] + unprobed) < t * (n + self._sizes[position]) - 1e-9:
+                continue
+            self.scored += 1
+            score = dice(grams, self._grams[position])
+            if score > best_score or (score == best_score and best is None):
+                best, best_score = position, score
+        return None if best is None else self.contractors[self._names[best]]
+
+    def assign(self, canonical: str, create: Callable[[], int]) -> int:
+        """Contractor id of canonical: the matching one, or create()'s new one; indexes canonical either way."""
+        contractor_id = self.match(canonical)
+        if contractor_id is None:
+            contractor_id = create()
+        self.add(canonical, contractor_id)
+        return contractor_id
+
+
+class ContractorResolver:
+    """
+    Resolves raw awarded_to names to contractor ids, creating contractors as needed.
+
+    Keeps the ids it has looked up, and the index of known canonical names
+    once a name needs it, so one resolver should serve a whole ingest run.
+    """
+
+    def __init__(self, threshold: float = CONTRACTOR_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._ids: Dict[str, int] = {}
+        self._index: Optional[ContractorIndex] = None
+
+    def resolve(self, db, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Contractor ids of names (the caller commits).
+
+        Known names cost one SELECT per ALIAS_LOOKUP_CHUNK; new ones are
+        matched against every known contractor and stored as aliases with
+        one executemany. A new contractor is named after the first raw name
+        that created it.
+
+        Args:
+            db: Database session or connection
+            names: Raw awarded_to names
+
+        Returns:
+            Dictionary of raw name -> contractor id
+        """
+        names = list(dict.fromkeys(names))
+        unseen = [name for name in names if name not in self._ids]
+        for start in range(0, len(unseen), ALIAS_LOOKUP_CHUNK):
+            chunk = unseen[start:start + ALIAS_LOOKUP_CHUNK]
+            params = {f"n{i}": name for i, name in enumerate(chunk)}
+            self._ids.update(db.execute(
+                text(f"SELECT awarded_to, contractor_id FROM contractor_aliases "
+                     f"WHERE awarded_to IN ({', '.join(':' + key for key in params)})"),
+                params,
+            ).all())
+
+        new = [name for name in unseen if name not in self._ids]
+        if new:
+            if self._index is None:
+                self._index = ContractorIndex(self.threshold)
+                for canonical, contractor_id in db.execute(text(
+                    "SELECT canonical_name, contractor_id FROM contractor_aliases ORDER BY rowid"
+                )):
+                    self._index.add(canonical, contractor_id)
+            aliases = []
+            for name in new:
+                canonical = canonical_name(name)
+                self._ids[name] = self._index.assign(canonical, lambda: _create_contractor(db, name, canonical))
+                aliases.append({"awarded_to": name, "contractor_id": self._ids[name], "canonical_name": canonical})
+            db.execute(
+                text("INSERT INTO contractor_aliases (awarded_to, contractor_id, canonical_name) "
+                     "VALUES (:awarded_to, :contractor_id, :canonical_name) ON CONFLICT (awarded_to) DO NOTHING"),
+                aliases,
+            )
+        return {name: self._ids[name] for name in names}
+
+
+def _create_contractor(db, name: str, canonical: str) -> int:
+    """Insert a contractor, or return the one another writer created for canonical."""
+    return db.execute(
+        text("INSERT INTO contractors (name, canonical_name) VALUES (:name, :canonical) "
+             "ON CONFLICT (canonical_name) DO UPDATE SET canonical_name = excluded.canonical_name RETURNING id"),
+        {"name": name, "canonical": canonical},
+    ).scalar()
+
+
+def link_contract_contractors(db, resolver: Optional[ContractorResolver] = None):
+    """
+    Resolve the awarded_to of every lead not linked to a contractor yet, and
+    link them (the caller commits). Names are resolved in the order leads
+    were first stored.
+    """
+    names = db.execute(text(
+        "SELECT awarded_to FROM contract_awards WHERE contractor_id IS NULL "
+        "GROUP BY awarded_to ORDER BY min(id)"
+    )).scalars().all()
+    (resolver or ContractorResolver()).resolve(db, names)
+    db.execute(text(
+        "UPDATE contract_awards SET contractor_id = "
+        "(SELECT contractor_id FROM contractor_aliases a WHERE a.awarded_to = contract_awards.awarded_to) "
+        "WHERE contractor_id IS NULL"
+    ))
+
+
+def contractors_page(db, limit: int, after: Optional[tuple] = None) -> List[Dict]:
+    """
+    Contractors with leads, most leads first, with the raw names they were published under.
+
+    Args:
+        db: Database session
+        limit: Number of contractors to return
+        after: (leads, contractor id) of the last contractor of the previous page
+
+    Returns:
+        List of dictionaries with 'id', 'name', 'leads' and 'aliases'
+    """
+    where, params = "", {"limit": limit}
+    if after is not None:
+        where = "WHERE s.leads < :leads OR (s.leads = :leads AND s.contractor_id > :id) "
+        params.update(leads=after[0], id=after[1])
+    rows = db.execute(text(
+        "SELECT c.id, c.name, s.leads FROM lead_stats_contractors s "
+        "JOIN contractors c ON c.id = s.contractor_id "
+        f"{where}ORDER BY s.leads DESC, s.contractor_id LIMIT :limit"
+    ), params).mappings().all()
+    aliases = defaultdict(list)
+    if rows:
+        ids = {f"c{i}": row["id"] for i, row in enumerate(rows)}
+        for contractor_id, name in db.execute(text(
+            f"SELECT contractor_id, awarded_to FROM contractor_aliases "
+            f"WHERE contractor_id IN ({', '.join(':' + key for key in ids)}) ORDER BY contractor_id, awarded_to"
+        ), ids):
+            aliases[contractor_id].append(name)
+    return [{**row, "aliases": aliases[row["id"]]} for row in rows]
@@ -0,0 +1,21 @@
+"""Database-wide counter of changes to lead data."""
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from .models import DataVersion
+
+
+def current_data_version(db: Session) -> int:
+    """Current value of the counter (0 if it was never bumped)."""
+    return db.execute(select(DataVersion.version).where(DataVersion.id == 1)).scalar() or 0
+
+
+def bump_data_version(db: Session):
+    """
+    Increment the counter inside the caller's transaction.
+
+    Every write that changes what GET /leads returns must call this before
+    committing, so cached responses from other workers and processes are
+    invalidated at the same moment the change becomes visible.
+    """
+    db.execute(update(DataVersion).where(DataVersion.id == 1).values(version=DataVersion.version + 1))
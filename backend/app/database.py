@@ -1,26 +1,120 @@
 """Database configuration and session management."""
-from sqlalchemy import create_engine, text
+from dataclasses import dataclass
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 
+from .migrations import migrate
+
 # SQLite database path - using /data/app.db (mounted persistent volume)
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:////data/app.db")
 
 
+@dataclass
+class SQLiteProfile:
+    """PRAGMAs applied to every new SQLite connection."""
+    journal_mode: str = "WAL"         # WAL lets readers run while a write transaction is open
+    synchronous: str = "NORMAL"       # fsync at checkpoints only; safe with WAL
+    cache_size_kb: int = 65536        # Page cache per connection
+    mmap_size: int = 268435456        # Bytes of the file read through mmap (0 disables)
+    busy_timeout_ms: int = 5000       # Wait this long for a lock before "database is locked"
+
+    @classmethod
+    def from_env(cls) -> "SQLiteProfile":
+        """Build a profile from SQLITE_* environment variables, falling back to defaults."""
+        return cls(
+            journal_mode=os.getenv("SQLITE_JOURNAL_MODE", cls.journal_mode),
+            synchronous=os.getenv("SQLITE_SYNCHRONOUS", cls.synchronous),
+            cache_size_kb=int(os.getenv("SQLITE_CACHE_SIZE_KB", cls.cache_size_kb)),
+            mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", cls.mmap_size)),
+            busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", cls.busy_timeout_ms)),
+        )
+
+    def pragmas(self):
+        """PRAGMA statements for this profile, in the order they are applied."""
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA cache_size = -{self.cache_size_kb}",  # Negative means KiB, not pages
+            f"PRAGMA mmap_size = {self.mmap_size}",
+            f"PRAGMA busy_timeout = {self.busy_timeout_ms}",
+        ]
+
+
+def py_lower(value):
+    """
+    SQL function py_lower(): Python's str.lower(), registered on every connection.
+
+    SQLite's lower() only folds ASCII letters, so SQL that must agree with
+    Python's case folding (e.g. rescore picking rows KeywordScorer would
+    match) uses this instead.
+    """
+    return value.lower() if isinstance(value, str) else value
+
+
+def create_sqlite_engine(url: str, profile: SQLiteProfile = None, readonly: bool = False, **kwargs) -> Engine:
+    """
+    Create a SQLite engine that applies a performance profile (and registers py_lower) on connect.
+
+    Args:
+        url: SQLite database URL
+        profile: PRAGMAs to apply (defaults to SQLiteProfile.from_env())
+        readonly: Open every connection with query_only so writes fail
+        **kwargs: Passed through to create_engine (e.g. pool sizing)
+
+    Returns:
+        The configured engine
+    """
+    profile = profile or SQLiteProfile.from_env()
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},  # Needed for SQLite
+        **kwargs,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _apply_profile(dbapi_connection, connection_record):
+        dbapi_connection.create_function("py_lower", 1, py_lower, deterministic=True)
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in profile.pragmas():
+                cursor.execute(pragma)
+            if readonly:
+                cursor.execute("PRAGMA query_only = ON")
+        finally:
+            cursor.close()
+
+    return engine
+
+
 # Ensure the /data directory exists
 db_path = DATABASE_URL.replace("sqlite:///", "")
-if db_path != ":memory:":
+in_memory = db_path == ":memory:"
+if not in_memory:
     db_dir = os.path.dirname(db_path)
     if db_dir:
         os.makedirs(db_dir, exist_ok=True)
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
-)
+# SQLite allows one writer at a time, so writes go through a single pooled
+# connection and queue in the pool instead of contending for the file lock.
+# Read-only routes use their own pool; under WAL they keep reading the last
+# committed data while an ingest transaction is open.
+if in_memory:
+    # Every :memory: engine is a separate database, so both roles share one
+    engine = create_sqlite_engine(DATABASE_URL)
+    read_engine = engine
+else:
+    engine = create_sqlite_engine(DATABASE_URL, pool_size=1, max_overflow=0)
+    read_engine = create_sqlite_engine(
+        DATABASE_URL,
+        readonly=True,
+        pool_size=int(os.getenv("SQLITE_READ_POOL_SIZE", "5")),
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
@@ -34,7 +128,26 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Dependency for a session on the read-only pool."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_session_factory():
+    """Dependency for work that outlives the request and opens its own sessions."""
+    return SessionLocal
+
+
+def get_read_session_factory():
+    """Dependency for read-only work that outlives the request (e.g. a streamed response)."""
+    return ReadSessionLocal
+
+
 def init_db():
-    """Initialize database tables."""
+    """Initialize database tables and apply pending migrations."""
     Base.metadata.create_all(bind=engine)
-
+    migrate(engine)
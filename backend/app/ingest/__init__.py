@@ -1,6 +1,6 @@
 """Ingestion modules for contract data."""
+from .sources import Source, get_sources, register_source
 from .kytc import ingest_kytc
 from .indot import ingest_indot
 
-__all__ = ["ingest_kytc", "ingest_indot"]
-
+__all__ = ["Source", "get_sources", "register_source", "ingest_kytc", "ingest_indot"]
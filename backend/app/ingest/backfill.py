@@ -0,0 +1,146 @@
+"""
+Backfill of historical lettings in resumable batches.
+
+Regular ingests only fetch the lettings after each source's watermark plus
+a re-check window (see app.ingest.watermark). The backfill walks the rest
+of the history of every source that can list its lettings, newest first.
+Each batch of lettings is fetched concurrently and ingested as one run, so
+it is stored in ingest_runs and its lettings are recorded as ingested in
+the same commit. An interrupted backfill loses at most the batch in
+flight: the next one skips every letting already ingested.
+
+Run from backend/:
+    python -m app.ingest.backfill [--source kytc] [--batch-size 10] [--max-batches N] [--dry-run]
+"""
+from dataclasses import replace
+from functools import partial
+from typing import Callable, Dict, Optional, Sequence
+import argparse
+import json
+import logging
+import os
+import threading
+
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal, init_db
+from .lease import held_lease
+from .runner import SUCCEEDED, run_ingestion
+from .sources import Source, get_sources
+from .watermark import load_watermark, pending_lettings
+
+logger = logging.getLogger(__name__)
+
+# Lettings fetched (concurrently) and committed per backfill run
+INGEST_BACKFILL_BATCH = int(os.getenv("INGEST_BACKFILL_BATCH", "10"))
+
+
+def _no_progress(stage: str, **counts: int):
+    pass
+
+
+def backfill(
+    db: Session,
+    sources: Optional[Sequence[Source]] = None,
+    batch_size: int = INGEST_BACKFILL_BATCH,
+    max_batches: Optional[int] = None,
+    dry_run: bool = False,
+    progress: Callable[..., None] = _no_progress,
+    cancelled: Optional[threading.Event] = None,
+) -> Dict:
+    """
+    Ingest every discovered letting not yet fully ingested, batch_size at a time.
+
+    A source's backfill stops at the first batch that does not succeed (its
+    lettings stay pending for the next backfill); other sources carry on.
+
+    Args:
+        db: Database session (committed after every batch)
+        sources: Sources to backfill (defaults to every registered source
+            that can list its lettings)
+        batch_size: Lettings per run
+        max_batches: Stop each source after this many batches
+        dry_run: Only count the pending lettings
+        progress: Called as progress(stage, **counts) after every batch
+        cancelled: Passed to every run; once set, the backfill stops with
+            IngestCancelled (see run_ingestion)
+
+    Returns:
+        Per source: lettings discovered and pending, batches run, lettings
+        ingested, inserted/updated/unchanged counts, and the error that
+        stopped it, if any
+    """
+    if sources is None:
+        sources = get_sources()
+
+    results = {}
+    for source in sources:
+        if source.discover is None:
+            continue
+        discovered = source.discover()
+        pending = pending_lettings(discovered, load_watermark(db, source.name))
+        result = {
+            "discovered": len(discovered),
+            "pending": len(pending),
+            "batches": 0,
+            "lettings": 0,
+            "inserted": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "error": None,
+        }
+        results[source.name] = result
+        if dry_run:
+            continue
+
+        for start in range(0, len(pending), batch_size):
+            if max_batches is not None and result["batches"] >= max_batches:
+                break
+            batch = pending[start:start + batch_size]
+            run = run_ingestion(
+                db, sources=[replace(source, fetch=partial(source.fetch, letting_dates=batch))], cancelled=cancelled,
+            )
+            result["batches"] += 1
+            for key in ("inserted", "updated", "unchanged"):
+                result[key] += run[key]
+            if run["status"] != SUCCEEDED:
+                result["error"] = run["sources"][source.name]["error"]
+                logger.warning("Backfill of %s stopped at a failed batch: %s", source.name, result["error"])
+                break
+            # Pages that failed to download leave their letting pending
+            completed = load_watermark(db, source.name).completed
+            result["lettings"] += sum(1 for letting in batch if letting in completed)
+            progress("backfill", batches=result["batches"], lettings=result["lettings"])
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest historical lettings that regular runs skip.")
+    parser.add_argument("--source", action="append", help="Source to backfill (repeatable; default all)")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BACKFILL_BATCH, help="Lettings per run")
+    parser.add_argument("--max-batches", type=int, help="Stop each source after this many batches")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the pending lettings")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sources = get_sources()
+    if args.source:
+        sources = [source for source in sources if source.name in args.source]
+
+    init_db()
+    # Hold the ingest lease so the app's workers do not ingest at the same time
+    with held_lease(SessionLocal) as lease:
+        db = SessionLocal()
+        try:
+            result = backfill(
+                db, sources, batch_size=args.batch_size, max_batches=args.max_batches, dry_run=args.dry_run,
+                cancelled=lease.lost,
+            )
+        finally:
+            db.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
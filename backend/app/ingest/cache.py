@@ -0,0 +1,107 @@
+"""On-disk conditional-GET cache for source pages."""
+from typing import Dict, Optional
+from datetime import datetime, timezone
+import copy
+import hashlib
+import json
+import os
+
+
+# Cache lives next to the database on the persistent /data volume
+CACHE_DIR = os.getenv("INGEST_CACHE_DIR", "/data/http_cache")
+
+
+def content_hash(body: bytes) -> str:
+    """Stable hash of a response body."""
+    return hashlib.sha256(body).hexdigest()
+
+
+class PageCache:
+    """
+    Validators and content hashes for previously ingested pages.
+
+    Each URL maps to its ETag, Last-Modified and body hash. The fetch stage
+    turns these into If-None-Match / If-Modified-Since headers, and treats a
+    304 or an identical body hash as a cache hit so the page is not parsed
+    or upserted again.
+
+    New entries are only staged while a run is in progress and are written
+    by flush(), which the runner calls after the database commit. A run that
+    fails part-way therefore never marks its pages as already ingested.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, refresh: bool = False):
+        self.directory = directory
+        self.path = os.path.join(directory, "pages.json")
+        self.refresh = refresh  # Ignore stored validators (entries are still updated)
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict] = self._load()
+        self._pending: Dict[str, Dict] = {}
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Stored entry for url, or None."""
+        return self._entries.get(url)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified."""
+        entry = self._entries.get(url)
+        if self.refresh or not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def is_unchanged(self, url: str, body_hash: str) -> bool:
+        """True when the stored body hash for url matches body_hash."""
+        entry = self._entries.get(url)
+        return not self.refresh and entry is not None and entry.get("content_hash") == body_hash
+
+    def stage(self, url: str, etag: Optional[str], last_modified: Optional[str], body_hash: str):
+        """Record a freshly ingested page; written on the next flush()."""
+        self._pending[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": body_hash,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def scope(self) -> "PageCache":
+        """
+        A cache for one source: it reads this cache's entries but stages and
+        counts on its own, so its pages can be kept or dropped with merge().
+        """
+        scoped = copy.copy(self)
+        scoped.hits = 0
+        scoped.misses = 0
+        scoped._pending = {}
+        return scoped
+
+    def merge(self, scoped: "PageCache", keep_staged: bool = True):
+        """Add a scope's hit and miss counts and (if keep_staged) its staged pages."""
+        self.hits += scoped.hits
+        self.misses += scoped.misses
+        if keep_staged:
+            self._pending.update(scoped._pending)
+
+    def flush(self):
+        """Persist staged entries atomically."""
+        if not self._pending:
+            return
+        self._entries.update(self._pending)
+        self._pending = {}
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,272 @@
+"""Concurrent HTTP fetch stage shared by the ingest sources."""
+from typing import AsyncIterator, Dict, Iterable, Iterator, Optional, TypeVar
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import asyncio
+import os
+import queue
+import threading
+import time
+import httpx
+
+from .cache import PageCache, content_hash
+
+
+# Headers with polite User-Agent
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# Responses worth retrying; anything else non-2xx fails immediately
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+T = TypeVar("T")
+
+
+@dataclass
+class FetchConfig:
+    """Limits for the fetch stage."""
+    concurrency: int = 4          # Requests in flight across all hosts
+    per_host_delay: float = 0.5   # Minimum seconds between request starts to one host
+    retries: int = 3              # Extra attempts after the first one
+    backoff: float = 1.0          # Seconds before the first retry, doubled for each further retry
+    timeout: float = 30.0         # Per-request timeout in seconds
+
+    @classmethod
+    def from_env(cls) -> "FetchConfig":
+        """Build a config from INGEST_FETCH_* environment variables, falling back to defaults."""
+        return cls(
+            concurrency=int(os.getenv("INGEST_FETCH_CONCURRENCY", cls.concurrency)),
+            per_host_delay=float(os.getenv("INGEST_FETCH_PER_HOST_DELAY", cls.per_host_delay)),
+            retries=int(os.getenv("INGEST_FETCH_RETRIES", cls.retries)),
+            backoff=float(os.getenv("INGEST_FETCH_BACKOFF", cls.backoff)),
+            timeout=float(os.getenv("INGEST_FETCH_TIMEOUT", cls.timeout)),
+        )
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching one URL."""
+    url: str
+    text: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    not_modified: bool = False    # 304, or a body identical to the cached one
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    size: int = 0                 # Body bytes downloaded
+    elapsed: float = 0.0          # Seconds from the first attempt to the result, backoff included
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class HostThrottle:
+    """Spaces out request starts to the same host by a fixed delay."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._next_start: Dict[str, float] = {}
+
+    async def wait(self, host: str):
+        """Reserve the next start slot for host and sleep until it arrives."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next_start.get(host, now))
+        self._next_start[host] = start + self.delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def fetch_one(
+    client: httpx.AsyncClient,
+    url: str,
+    config: FetchConfig,
+    semaphore: asyncio.Semaphore,
+    throttle: HostThrottle,
+    cache: Optional[PageCache] = None,
+) -> FetchResult:
+    """
+    Fetch a single URL with retries and exponential backoff.
+
+    Transport errors, timeouts and RETRY_STATUS_CODES responses are retried;
+    the semaphore is released while backing off so other URLs keep moving.
+    Errors are returned on the result rather than raised.
+
+    With a cache, the request is conditional and the result is flagged
+    not_modified on a 304 or when the body hash matches the cached one.
+    """
+    started = time.perf_counter()
+    result = await _fetch_with_retries(client, url, config, semaphore, throttle, cache)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def _fetch_with_retries(
+    client: httpx.AsyncClient,
+    url: str,
+    config: FetchConfig,
+    semaphore: asyncio.Semaphore,
+    throttle: HostThrottle,
+    cache: Optional[PageCache],
+) -> FetchResult:
+    host = urlsplit(url).netloc
+    headers = cache.conditional_headers(url) if cache is not None else {}
+    result = FetchResult(url=url)
+    for attempt in range(config.retries + 1):
+        result.attempts = attempt + 1
+        async with semaphore:
+            await throttle.wait(host)
+            try:
+                response = await client.get(url, headers=headers, timeout=config.timeout)
+            except httpx.TransportError as e:
+                result.error = f"{type(e).__name__}: {e}"
+            else:
+                result.status_code = response.status_code
+                if response.status_code == 304 and headers:
+                    result.error = None
+                    result.not_modified = True
+                    return result
+                if response.is_success:
+                    result.text = response.text
+                    result.size = len(response.content)
+                    result.error = None
+                    result.etag = response.headers.get("ETag")
+                    result.last_modified = response.headers.get("Last-Modified")
+                    result.content_hash = content_hash(response.content)
+                    result.not_modified = cache is not None and cache.is_unchanged(url, result.content_hash)
+                    return result
+                result.error = f"HTTP {response.status_code}"
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return result
+        if attempt < config.retries:
+            await asyncio.sleep(config.backoff * (2 ** attempt))
+    return result
+
+
+async def fetch_pages(
+    urls: Iterable[str],
+    config: Optional[FetchConfig] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    cache: Optional[PageCache] = None,
+) -> AsyncIterator[FetchResult]:
+    """
+    Fetch URLs concurrently, yielding each result as soon as it completes.
+
+    Args:
+        urls: URLs to fetch
+        config: Fetch limits (defaults to FetchConfig.from_env())
+        client: Client to use; one with DEFAULT_HEADERS is created if omitted
+        cache: Page cache for conditional requests; hits and misses are
+            counted on it
+
+    Yields:
+        FetchResult for every URL, in completion order
+    """
+    config = config or FetchConfig.from_env()
+    owns_client = client is None
+    if owns_client:
+        client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            timeout=config.timeout,
+            limits=httpx.Limits(max_connections=config.concurrency),
+        )
+
+    semaphore = asyncio.Semaphore(config.concurrency)
+    throttle = HostThrottle(config.per_host_delay)
+    tasks = [
+        asyncio.ensure_future(fetch_one(client, url, config, semaphore, throttle, cache))
+        for url in urls
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if cache is not None and result.ok:
+                if result.not_modified:
+                    cache.hits += 1
+                else:
+                    cache.misses += 1
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if owns_client:
+            await client.aclose()
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Uses asyncio.run() directly, or a worker thread with its own event loop
+    when called from inside a running loop (e.g. an async route handler).
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def iter_sync(agen: AsyncIterator[T], maxsize: int = 1000) -> Iterator[T]:
+    """
+    Iterate an async generator from synchronous code.
+
+    The generator runs on its own event loop in a worker thread and hands
+    items over through a queue of at most maxsize items, so it never runs
+    more than that far ahead of the consumer. Exceptions it raises are
+    re-raised in the consumer. Closing the iterator early stops the
+    generator and waits for its thread.
+    """
+    items: "queue.Queue" = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        # Blocking put that gives up once the consumer has gone away
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    async def pump():
+        try:
+            async for item in agen:
+                try:
+                    items.put_nowait((True, item))
+                except queue.Full:
+                    # Wait off the loop so in-flight fetches keep going meanwhile
+                    if not await asyncio.to_thread(put, (True, item)):
+                        return
+        finally:
+            await agen.aclose()
+
+    def run():
+        try:
+            asyncio.run(pump())
+        except BaseException as e:
+            put((False, e))
+        else:
+            put((False, None))
+
+    thread = threading.Thread(target=run, name="iter-sync", daemon=True)
+    thread.start()
+    try:
+        while True:
+            is_item, value = items.get()
+            if not is_item:
+                if value is not None:
+                    raise value
+                return
+            yield value
+    finally:
+        stop.set()
+        thread.join()
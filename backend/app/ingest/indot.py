@@ -1,33 +1,51 @@
 """INDOT (Indiana Department of Transportation) ingestion module."""
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, Optional
 from datetime import date
 
+from .cache import PageCache
+from .sources import Source, register_source
+from .stats import IngestStats
+from .watermark import Watermark
 
-def ingest_indot() -> List[Dict]:
+# Source label in IngestStats and /metrics
+SOURCE = "indot"
+
+
+def ingest_indot(
+    cache: Optional[PageCache] = None,
+    stats: Optional[IngestStats] = None,
+    watermark: Optional[Watermark] = None,
+) -> Iterator[Dict]:
     """
     Placeholder ingestion function for INDOT contracts.
     
-    Returns:
-        List of raw contract dictionaries (empty for now - stub implementation)
+    Args:
+        cache: Page cache for conditional requests (unused until pages are fetched)
+        watermark: Source watermark; the scraper should only fetch the lettings
+            select_lettings picks and complete() each one, as ingest_kytc_async does
+        stats: Run instrumentation; the scraper should record pages, bytes,
+            parse time, rows and skips in it as ingest_kytc_async does
+    
+    Yields:
+        Raw contract dictionaries (none for now - stub implementation)
     """
     # TODO: Implement web scraping for INDOT
-    # For now, return empty list as placeholder
-    return []
+    # For now, yield nothing as placeholder
+    yield from ()
 
 
-def normalize_indot(raw_contracts: List[Dict]) -> List[Dict]:
+def normalize_indot(raw_contracts: Iterable[Dict]) -> Iterator[Dict]:
     """
     Normalize INDOT contract data to standard format.
     
     Args:
-        raw_contracts: List of raw contract dictionaries from INDOT
+        raw_contracts: Raw contract dictionaries from INDOT
         
-    Returns:
-        List of normalized contract dictionaries
+    Yields:
+        Normalized contract dictionaries
     """
-    normalized = []
     for contract in raw_contracts:
-        normalized.append({
+        yield {
             "state": "IN",
             "letting_date": contract.get("letting_date"),
             "contract_id": contract.get("contract_id", ""),
@@ -35,6 +53,7 @@ def normalize_indot(raw_contracts: List[Dict]) -> List[Dict]:
             "description": contract.get("description", ""),
             "amount": contract.get("amount"),
             "source_url": contract.get("source_url", ""),
-        })
-    return normalized
+        }
+
 
+register_source(Source(SOURCE, fetch=ingest_indot, normalize=normalize_indot))
@@ -0,0 +1,149 @@
+"""Background ingestion jobs with progress tracking."""
+from typing import Callable, Dict, Optional
+from datetime import datetime, timezone
+from collections import OrderedDict
+import enum
+import threading
+import time
+import uuid
+
+
+class JobStatus(str, enum.Enum):
+    """Job lifecycle states."""
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class IngestJob:
+    """
+    One ingestion run executing on a worker thread.
+
+    The runner reports progress through `report(stage, **counts)`; each new
+    stage closes the timing of the previous one. Readers take a consistent
+    copy with `snapshot()`.
+    """
+
+    def __init__(self, params: Optional[Dict] = None):
+        self.id = uuid.uuid4().hex
+        self.params = params or {}
+        self.status = JobStatus.RUNNING
+        self.stage: Optional[str] = None
+        self.progress: Dict[str, int] = {}
+        self.timings: Dict[str, float] = {}
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self._stage_started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def report(self, stage: str, **counts: int):
+        """Record the current stage and update progress counters."""
+        with self._lock:
+            if stage != self.stage:
+                self._close_stage()
+                self.stage = stage
+            self.progress.update(counts)
+
+    def _close_stage(self):
+        now = time.perf_counter()
+        if self.stage is not None:
+            self.timings[self.stage] = round(self.timings.get(self.stage, 0.0) + now - self._stage_started, 6)
+        self._stage_started = now
+
+    def finish(self, result: Optional[Dict] = None, error: Optional[str] = None):
+        """Mark the job succeeded (with its result) or failed (with an error)."""
+        with self._lock:
+            self._close_stage()
+            self.stage = None
+            self.result = result
+            self.error = error
+            self.status = JobStatus.FAILED if error else JobStatus.SUCCEEDED
+            self.finished_at = datetime.now(timezone.utc)
+        self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes; returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def snapshot(self) -> Dict:
+        """Point-in-time copy of the job for API responses."""
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "stage": self.stage,
+                "progress": dict(self.progress),
+                "timings": dict(self.timings),
+                "result": self.result,
+                "error": self.error,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class JobManager:
+    """
+    Runs at most one ingestion at a time in this process.
+
+    Starting a job while another is running coalesces onto the running one,
+    so overlapping POST /ingest/run calls (e.g. an impatient cron) share a
+    single run instead of competing for the SQLite write lock. Finished jobs
+    are kept for polling, oldest evicted first beyond `history`.
+    """
+
+    def __init__(self, history: int = 50):
+        self.history = history
+        self._jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._current: Optional[IngestJob] = None
+        self._lock = threading.Lock()
+
+    def start(self, target: Callable[[IngestJob], Dict], params: Optional[Dict] = None):
+        """
+        Start target(job) on a worker thread unless a job is already running.
+
+        Returns:
+            (job, started) where started is False if an existing job was returned
+        """
+        with self._lock:
+            if self._current is not None and not self._current.done:
+                return self._current, False
+            job = IngestJob(params)
+            self._current = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history:
+                self._jobs.popitem(last=False)
+
+        thread = threading.Thread(target=self._run, args=(job, target), name=f"ingest-{job.id[:8]}", daemon=True)
+        thread.start()
+        return job, True
+
+    @staticmethod
+    def _run(job: IngestJob, target: Callable[[IngestJob], Dict]):
+        try:
+            result = target(job)
+        except Exception as e:
+            job.finish(error=f"{type(e).__name__}: {e}")
+        else:
+            job.finish(result=result)
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        return self._jobs.get(job_id)
+
+    @property
+    def current(self) -> Optional[IngestJob]:
+        """The running job, if any."""
+        job = self._current
+        return job if job is not None and not job.done else None
+
+
+job_manager = JobManager()
+
+# Rescoring runs are single-flight among themselves, independently of ingests
+rescore_job_manager = JobManager()
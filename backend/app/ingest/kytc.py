@@ -1,18 +1,120 @@
 """KYTC (Kentucky Transportation Cabinet) ingestion module."""
-from typing import List, Dict
+from typing import AsyncIterator, Callable, List, Dict, Iterable, Iterator, Optional, Union
 from datetime import date, datetime
-import httpx
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+import logging
 import re
+import time
+import httpx
 from urllib.parse import unquote
 
+try:
+    import lxml.html
+    HTML_PARSER = "lxml"
+except ImportError:  # Optional: falls back to the standard library parser
+    HTML_PARSER = "html.parser"
+
+from .cache import PageCache
+from .fetch import FetchConfig, fetch_pages, iter_sync, run_sync
+from .sources import Source, register_source
+from .stats import IngestStats
+from .watermark import Watermark, select_lettings
+
+logger = logging.getLogger(__name__)
+
+# Source label in IngestStats and /metrics
+SOURCE = "kytc"
+
+KYTC_LETTING_CONTRACTS_URL = "https://transportation.ky.gov/Construction-Procurement/Pages/Letting-Contracts.aspx"
+
+
+# Letting dates on the lettings index, as ?letting= links or dropdown option values
+LETTING_LINK_PATTERN = re.compile(
+    r"""(?:letting=|value=["'])(\d{1,2})(?:/|%2F)(\d{1,2})(?:/|%2F)(\d{4})""",
+    re.IGNORECASE,
+)
+
+
+def letting_url(date_str: str, base_url: str = KYTC_LETTING_CONTRACTS_URL) -> str:
+    """Build the letting contracts page URL for a MM/DD/YYYY letting date."""
+    return f"{base_url}?letting={date_str.replace('/', '%2F')}"
+
+
+def _letting_str(letting: Union[str, date]) -> str:
+    """MM/DD/YYYY form of a letting date."""
+    return letting.strftime("%m/%d/%Y") if isinstance(letting, date) else letting
 
-def ingest_kytc() -> List[Dict]:
+
+def parse_lettings_index(html: str) -> List[date]:
     """
-    Fetch KYTC contract awards from HTML pages.
+    Letting dates listed on the KYTC lettings index page, oldest first.
+    
+    Args:
+        html: Index page HTML
     
     Returns:
-        List of raw contract dictionaries with keys:
+        Distinct letting dates (impossible dates are ignored)
+    """
+    lettings = set()
+    for month, day, year in LETTING_LINK_PATTERN.findall(html):
+        try:
+            lettings.add(date(int(year), int(month), int(day)))
+        except ValueError:
+            continue
+    return sorted(lettings)
+
+
+async def discover_lettings_async(
+    config: Optional[FetchConfig] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    base_url: str = KYTC_LETTING_CONTRACTS_URL,
+) -> List[date]:
+    """
+    Fetch the lettings index and list every letting on it.
+    
+    Raises:
+        RuntimeError: If the index cannot be downloaded
+    """
+    async for result in fetch_pages([base_url], config, client):
+        if not result.ok:
+            raise RuntimeError(f"Could not fetch the KYTC lettings index {result.url}: {result.error}")
+        lettings = parse_lettings_index(result.text)
+        if not lettings:
+            logger.warning("No lettings found on the KYTC lettings index %s", result.url)
+        return lettings
+    return []
+
+
+def discover_lettings(config: Optional[FetchConfig] = None) -> List[date]:
+    """Every letting on the KYTC lettings index (see discover_lettings_async)."""
+    return run_sync(discover_lettings_async(config))
+
+
+def ingest_kytc(
+    letting_dates: Optional[List[Union[str, date]]] = None,
+    config: Optional[FetchConfig] = None,
+    cache: Optional[PageCache] = None,
+    stats: Optional[IngestStats] = None,
+    watermark: Optional[Watermark] = None,
+) -> Iterator[Dict]:
+    """
+    Fetch KYTC contract awards from HTML pages.
+    
+    Pages are fetched concurrently in a background thread (see iter_sync)
+    while the caller consumes the records.
+    
+    Args:
+        letting_dates: Letting dates (date or MM/DD/YYYY) to fetch; by default
+            the lettings index is read and the watermark picks the new and
+            recent ones (see select_lettings)
+        config: Fetch limits (defaults to FetchConfig.from_env())
+        cache: Page cache; pages it reports unchanged are not parsed
+        stats: Run instrumentation to record pages, bytes, timings and skips in
+        watermark: Where regular runs got to; each fully ingested letting is
+            staged in it
+    
+    Yields:
+        Raw contract dictionaries with keys:
         - letting_date (date or ISO string)
         - contract_id
         - awarded_to
@@ -20,202 +122,332 @@ def ingest_kytc() -> List[Dict]:
         - amount (None if not present)
         - source_url
     """
-    contracts = []
+    return iter_sync(ingest_kytc_async(letting_dates, config, cache=cache, stats=stats, watermark=watermark))
+
+
+async def ingest_kytc_async(
+    letting_dates: Optional[List[str]] = None,
+    config: Optional[FetchConfig] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    base_url: str = KYTC_LETTING_CONTRACTS_URL,
+    cache: Optional[PageCache] = None,
+    stats: Optional[IngestStats] = None,
+    watermark: Optional[Watermark] = None,
+) -> AsyncIterator[Dict]:
+    """
+    Fetch letting pages concurrently and yield the records of each page as it arrives.
     
-    # Temporarily bypass lettings list discovery - use hardcoded date for testing
-    letting_dates = ["11/20/2025"]
+    Pages that fail to download or parse are logged, counted in stats and
+    skipped, so one bad letting does not stop the others. Pages the cache
+    reports unchanged are skipped without parsing; a page is staged in the
+    cache, and its letting in the watermark, for the runner to save after
+    its last commit, once all its records have been consumed.
     
-    letting_contracts_base = "https://transportation.ky.gov/Construction-Procurement/Pages/Letting-Contracts.aspx"
+    Args:
+        letting_dates: Letting dates (date or MM/DD/YYYY) to fetch; discovered
+            from the lettings index at base_url if omitted
+        config: Fetch limits (defaults to FetchConfig.from_env())
+        client: HTTP client to use instead of a fresh one
+        base_url: Letting contracts page URL
+        cache: Page cache for conditional requests
+        stats: Run instrumentation (a throwaway one if omitted)
+        watermark: Source watermark (an empty one if omitted)
     
-    # Headers with polite User-Agent
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
+    Yields:
+        Raw contract dictionaries (see ingest_kytc)
+    """
+    if stats is None:
+        stats = IngestStats()
+    if watermark is None:
+        watermark = Watermark(SOURCE)
     
-    try:
-        with httpx.Client(headers=headers, timeout=30.0) as client:
-            # For each letting date, fetch the contracts page
-            for date_str in letting_dates:
-                try:
-                    # Construct the full URL
-                    letting_url = f"{letting_contracts_base}?letting={date_str.replace('/', '%2F')}"
-                    
-                    # Fetch the letting contracts page
-                    contracts_response = client.get(letting_url)
-                    contracts_response.raise_for_status()
-                    
-                    contracts_soup = BeautifulSoup(contracts_response.text, 'html.parser')
-                    
-                    # Parse contract data from table/div
-                    table = contracts_soup.find('table')
-                    if not table:
-                        # Try alternative selectors
-                        table = contracts_soup.find('div', class_=re.compile(r'table|contract', re.I))
-                    
-                    if table:
-                        # Extract all text cells into a flat list
-                        flat_text = table.get_text(" | ", strip=True)
-                        items = flat_text.split(" | ")
-                        
-                        # Expected header: ["Call","Status","Awarded To","Contract ID","District","County","Project Description"]
-                        expected_header = ["Call", "Status", "Awarded To", "Contract ID", "District", "County", "Project Description"]
-                        
-                        # Find the index where the header starts
-                        header_start_idx = None
-                        for i in range(len(items) - len(expected_header) + 1):
-                            # Check if the next N items match the header (case-insensitive, allowing for variations)
-                            potential_header = [item.strip() for item in items[i:i+len(expected_header)]]
-                            # Check if all expected header terms are present in order
-                            matches = 0
-                            for j, expected in enumerate(expected_header):
-                                if expected.lower() in potential_header[j].lower():
-                                    matches += 1
-                            if matches >= len(expected_header) - 1:  # Allow one mismatch
-                                header_start_idx = i
-                                break
-                        
-                        if header_start_idx is None:
-                            print("rows found: 0 (header not found)")
-                        else:
-                            # Remove the header tokens
-                            data_items = items[header_start_idx + len(expected_header):]
-                            
-                            # Known status values
-                            known_statuses = ["Awarded", "Withdrawn", "Rejected"]
-                            
-                            # Streaming parser: iterate through tokens
-                            i = 0
-                            while i < len(data_items):
-                                token = data_items[i].strip()
-                                
-                                # Check if token looks like a call number (numeric string)
-                                if token and token.isdigit() and i + 1 < len(data_items):
-                                    next_token = data_items[i + 1].strip()
-                                    
-                                    # Check if next token is a known status
-                                    if next_token in known_statuses:
-                                        call = token
-                                        status = next_token
-                                        i += 2  # Move past call and status
-                                        
-                                        # If status is "Awarded", collect fields until next call/status pair
-                                        if status == "Awarded":
-                                            awarded_to = ""
-                                            contract_id = ""
-                                            description_parts = []
-                                            field_state = "awarded_to"
-                                            
-                                            # Collect fields until we hit the next call/status pair
-                                            while i < len(data_items):
-                                                current_token = data_items[i].strip()
-                                                
-                                                # Check if we've hit the next call/status pair
-                                                if current_token.isdigit() and i + 1 < len(data_items):
-                                                    next_check = data_items[i + 1].strip()
-                                                    if next_check in known_statuses:
-                                                        break  # Found next record, stop collecting
-                                                
-                                                if not current_token:
-                                                    i += 1
-                                                    continue
-                                                
-                                                # Collect fields in order: awarded_to, contract_id, county (skip), description
-                                                if field_state == "awarded_to":
-                                                    # First token is awarded_to
-                                                    awarded_to = current_token
-                                                    field_state = "contract_id"
-                                                elif field_state == "contract_id":
-                                                    # Next token that is all digits is contract_id
-                                                    if current_token.isdigit():
-                                                        contract_id = current_token
-                                                        field_state = "county"
-                                                    # If not digits, might be continuation, but per pattern should be digits
-                                                elif field_state == "county":
-                                                    # Skip county token (ignore it)
-                                                    field_state = "description"
-                                                    # Don't increment i here, let description handle it
-                                                    i += 1
-                                                    continue
-                                                else:  # field_state == "description"
-                                                    # All remaining tokens go to description
-                                                    description_parts.append(current_token)
-                                                
-                                                i += 1
-                                            
-                                            # Only emit if we have required fields
-                                            if awarded_to and contract_id:
-                                                # Parse the letting date
-                                                try:
-                                                    # Date format is typically MM/DD/YYYY
-                                                    date_parts = date_str.split('/')
-                                                    if len(date_parts) == 3:
-                                                        letting_date = date(
-                                                            int(date_parts[2]),
-                                                            int(date_parts[0]),
-                                                            int(date_parts[1])
-                                                        )
-                                                    else:
-                                                        # Try ISO format or other formats
-                                                        letting_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                                                except (ValueError, IndexError):
-                                                    # If parsing fails, use the string as-is
-                                                    letting_date = date_str
-                                                
-                                                contract_data = {
-                                                    "letting_date": letting_date,
-                                                    "contract_id": contract_id,
-                                                    "awarded_to": awarded_to,
-                                                    "description": " ".join(description_parts) if description_parts else "",
-                                                    "amount": None,
-                                                    "source_url": letting_url
-                                                }
-                                                
-                                                contracts.append(contract_data)
-                                        else:
-                                            # For non-Awarded status, skip until next call/status pair
-                                            while i < len(data_items):
-                                                current_token = data_items[i].strip()
-                                                if current_token.isdigit() and i + 1 < len(data_items):
-                                                    next_check = data_items[i + 1].strip()
-                                                    if next_check in known_statuses:
-                                                        break  # Found next record
-                                                i += 1
-                                    else:
-                                        i += 1
-                                else:
-                                    i += 1
-                    
-                except httpx.HTTPError as e:
-                    # Skip this letting date if there's an error
-                    continue
-                except Exception as e:
-                    # Skip this letting date on any other error
-                    continue
-        
+    if letting_dates is None:
+        with stats.span("discover", SOURCE):
+            discovered = await discover_lettings_async(config, client, base_url)
+        letting_dates = select_lettings(discovered, watermark)
+        logger.info(
+            "KYTC: %d lettings on the index, fetching %d (watermark %s)",
+            len(discovered), len(letting_dates), watermark.latest,
+        )
     
-    except httpx.HTTPError as e:
-        # Return empty list if main page fails
-        return []
-    except Exception as e:
-        # Return empty list on any other error
-        return []
+    dates_by_url = {letting_url(_letting_str(letting), base_url): _letting_str(letting) for letting in letting_dates}
     
-    return contracts
+    async for result in fetch_pages(dates_by_url, config, client, cache):
+        stats.observe("fetch", result.elapsed, SOURCE)
+        letting = parse_letting_date(dates_by_url[result.url])
+        if not result.ok:
+            logger.warning("KYTC letting page %s failed after %d attempt(s): %s", result.url, result.attempts, result.error)
+            stats.page(SOURCE, "failed")
+            continue
+        if result.not_modified:
+            # Already ingested and unchanged since
+            stats.page(SOURCE, "not_modified", result.size)
+            watermark.complete(letting)
+            continue
+        stats.page(SOURCE, "fetched", result.size)
+        
+        skipped: Dict[str, int] = {}
+        
+        def on_skip(reason: str):
+            skipped[reason] = skipped.get(reason, 0) + 1
+        
+        started = time.perf_counter()
+        try:
+            # Parse the whole page first so a bad page yields nothing
+            contracts = parse_letting_page(result.text, dates_by_url[result.url], result.url, on_skip=on_skip)
+        except Exception:
+            logger.exception("Could not parse KYTC letting page %s", result.url)
+            stats.skip(SOURCE, "parse_error")
+            continue
+        finally:
+            stats.observe("parse", time.perf_counter() - started, SOURCE)
+        for reason, count in skipped.items():
+            stats.skip(SOURCE, reason, count)
+        stats.rows(SOURCE, len(contracts))
+        
+        for contract in contracts:
+            yield contract
+        if cache is not None:
+            cache.stage(result.url, result.etag, result.last_modified, result.content_hash)
+        watermark.complete(letting, len(contracts))
+
+
+# Letting table columns, matched case-insensitively against the header cells
+CALL_COLUMN = "Call"
+STATUS_COLUMN = "Status"
+AWARDED_TO_COLUMN = "Awarded To"
+CONTRACT_ID_COLUMN = "Contract ID"
+DESCRIPTION_COLUMN = "Project Description"
+REQUIRED_COLUMNS = [CALL_COLUMN, STATUS_COLUMN, AWARDED_TO_COLUMN, CONTRACT_ID_COLUMN, DESCRIPTION_COLUMN]
 
 
-def normalize_kytc(raw_contracts: List[Dict]) -> List[Dict]:
+def parse_letting_date(date_str: str):
+    """Parse a MM/DD/YYYY (or ISO) letting date, returning the string as-is if neither fits."""
+    try:
+        # Date format is typically MM/DD/YYYY
+        date_parts = date_str.split('/')
+        if len(date_parts) == 3:
+            return date(int(date_parts[2]), int(date_parts[0]), int(date_parts[1]))
+        # Try ISO format or other formats
+        return datetime.strptime(date_str, '%Y-%m-%d').date()
+    except (ValueError, IndexError):
+        # If parsing fails, use the string as-is
+        return date_str
+
+
+def _header_columns(cells: List[str]) -> Optional[Dict[str, int]]:
+    """Map column names to cell positions if cells form the letting table header."""
+    columns = {}
+    for name in REQUIRED_COLUMNS:
+        for position, cell in enumerate(cells):
+            if name.lower() in cell.lower():
+                columns[name] = position
+                break
+        else:
+            return None
+    return columns
+
+
+def _cell_text(texts: Iterable[str]) -> str:
+    """Join a cell's text nodes, stripped and space-separated."""
+    return " ".join(t.strip() for t in texts if t.strip())
+
+
+class _TableRowParser(HTMLParser):
+    """
+    Stream table rows out of HTML without building a document tree.
+
+    Collects the text of every <td>/<th> per <tr>, for each <table> in
+    document order. Omitted </td> and </tr> end tags are closed implicitly
+    as browsers do. Rows of a table nested inside a cell belong to the inner
+    table.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables: List[List[List[str]]] = []
+        self._open: List[Dict] = []  # Stack of {"rows", "row", "cell"} for open tables
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            table = {"rows": [], "row": None, "cell": None}
+            self.tables.append(table["rows"])
+            self._open.append(table)
+        elif self._open:
+            table = self._open[-1]
+            if tag == "tr":
+                self._end_row(table)
+                table["row"] = []
+            elif tag in ("td", "th"):
+                self._end_cell(table)
+                if table["row"] is None:
+                    table["row"] = []
+                table["cell"] = []
+
+    def handle_endtag(self, tag):
+        if not self._open:
+            return
+        table = self._open[-1]
+        if tag in ("td", "th"):
+            self._end_cell(table)
+        elif tag == "tr":
+            self._end_row(table)
+        elif tag == "table":
+            self._end_row(table)
+            self._open.pop()
+
+    def handle_data(self, data):
+        if self._open and self._open[-1]["cell"] is not None:
+            self._open[-1]["cell"].append(data)
+
+    @staticmethod
+    def _end_cell(table):
+        if table["cell"] is not None:
+            table["row"].append(_cell_text(table["cell"]))
+            table["cell"] = None
+
+    def _end_row(self, table):
+        self._end_cell(table)
+        if table["row"] is not None:
+            table["rows"].append(table["row"])
+            table["row"] = None
+
+
+def _lxml_cell_text(cell) -> str:
+    """Text of an lxml cell, leaving out any table nested inside it (as _TableRowParser does)."""
+    if cell.find(".//table") is None:
+        return _cell_text(cell.itertext())
+    depth = sum(1 for _ in cell.iterancestors("table"))
+    return _cell_text(cell.xpath(".//text()[count(ancestor::table) = $depth]", depth=depth))
+
+
+def _iter_tables(html: str, features: str) -> Iterator[Iterable[List[str]]]:
+    """Yield each table on the page as an iterable of row cell texts."""
+    if features == "lxml":
+        for table in lxml.html.document_fromstring(html).iter("table"):
+            # Only the table's own rows; those of a table nested in a cell are the inner table's
+            yield (
+                [_lxml_cell_text(cell) for cell in tr if cell.tag in ("td", "th")]
+                for tr in table.xpath("./tr|./thead/tr|./tbody/tr|./tfoot/tr")
+            )
+        return
+
+    parser = _TableRowParser()
+    parser.feed(html)
+    parser.close()
+    yield from parser.tables
+
+
+def _ignore_skip(reason: str):
+    pass
+
+
+def iter_letting_rows(
+    html: str,
+    date_str: str,
+    page_url: str,
+    features: str = HTML_PARSER,
+    on_skip: Callable[[str], None] = _ignore_skip,
+) -> Iterator[Dict]:
+    """
+    Yield awarded contracts from one letting contracts page.
+
+    Walks the table row by row: the first row whose cells name all of
+    REQUIRED_COLUMNS is the header, and every later row is read by column
+    position, so cell text containing separators and empty cells (e.g. a
+    missing county) cannot shift fields. Only rows with a numeric call, an
+    "Awarded" status, a company and a numeric contract ID are yielded.
+
+    Args:
+        html: Page HTML
+        date_str: Letting date the page belongs to (MM/DD/YYYY)
+        page_url: URL the page was fetched from
+        features: "lxml" to walk an lxml tree (the default when installed)
+            or "html.parser" for the standard library parser
+        on_skip: Called with a reason for every row after the header that is
+            not yielded (short_row, no_call, not_awarded, no_company,
+            bad_contract_id), and with "no_header" if no table has the header
+
+    Yields:
+        Raw contract dictionaries (see ingest_kytc)
+    """
+    letting_date = parse_letting_date(date_str)
+
+    for table in _iter_tables(html, features):
+        columns = None
+        for cells in table:
+            if columns is None:
+                columns = _header_columns(cells)
+                continue
+            if len(cells) <= max(columns.values()):
+                on_skip("short_row")
+                continue
+
+            if not cells[columns[CALL_COLUMN]].isdigit():
+                on_skip("no_call")
+                continue
+            if cells[columns[STATUS_COLUMN]] != "Awarded":
+                on_skip("not_awarded")
+                continue
+            awarded_to = cells[columns[AWARDED_TO_COLUMN]]
+            contract_id = cells[columns[CONTRACT_ID_COLUMN]]
+            if not awarded_to:
+                on_skip("no_company")
+                continue
+            if not contract_id.isdigit():
+                on_skip("bad_contract_id")
+                continue
+
+            yield {
+                "letting_date": letting_date,
+                "contract_id": contract_id,
+                "awarded_to": awarded_to,
+                "description": cells[columns[DESCRIPTION_COLUMN]],
+                "amount": None,
+                "source_url": page_url,
+            }
+
+        if columns is not None:
+            # Only the first letting table on the page holds contracts
+            return
+
+    logger.warning("No letting table header found on %s", page_url)
+    on_skip("no_header")
+
+
+def parse_letting_page(
+    html: str,
+    date_str: str,
+    page_url: str,
+    on_skip: Callable[[str], None] = _ignore_skip,
+) -> List[Dict]:
+    """
+    Parse awarded contracts out of one letting contracts page.
+
+    Args:
+        html: Page HTML
+        date_str: Letting date the page belongs to (MM/DD/YYYY)
+        page_url: URL the page was fetched from
+        on_skip: Called with the reason for each dropped row (see iter_letting_rows)
+
+    Returns:
+        List of raw contract dictionaries (see ingest_kytc)
+    """
+    return list(iter_letting_rows(html, date_str, page_url, on_skip=on_skip))
+
+
+def normalize_kytc(raw_contracts: Iterable[Dict]) -> Iterator[Dict]:
     """
     Normalize KYTC contract data to standard format.
     
     Args:
-        raw_contracts: List of raw contract dictionaries from KYTC
+        raw_contracts: Raw contract dictionaries from KYTC
         
-    Returns:
-        List of normalized contract dictionaries
+    Yields:
+        Normalized contract dictionaries
     """
-    normalized = []
     for contract in raw_contracts:
-        normalized.append({
+        yield {
             "state": "KY",
             "letting_date": contract.get("letting_date"),
             "contract_id": contract.get("contract_id", ""),
@@ -223,6 +455,7 @@ def normalize_kytc(raw_contracts: List[Dict]) -> List[Dict]:
             "description": contract.get("description", ""),
             "amount": contract.get("amount"),
             "source_url": contract.get("source_url", ""),
-        })
-    return normalized
+        }
+
 
+register_source(Source(SOURCE, fetch=ingest_kytc, normalize=normalize_kytc, discover=discover_lettings))
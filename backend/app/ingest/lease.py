@@ -0,0 +1,175 @@
+"""
+Database-backed leases, so only one process ingests at a time.
+
+Every uvicorn worker has its own JobManager, which keeps ingests in that
+process single-flight but knows nothing of the others. A lease is a row in
+the shared leases table naming its holder and when it expires: taking it
+is one upsert that only succeeds if the row is free, expired or already
+ours, and SQLite serializes writers, so two processes cannot both win.
+While the work runs, a heartbeat thread pushes the expiry forward; if the
+holder dies, the lease simply lapses after INGEST_LEASE_SECONDS.
+
+The heartbeat writes through its own connections, not the single-connection
+writer pool the ingest itself is using. If the lease is lost anyway (taken
+over, or about to expire unrenewed), held_lease sets its lost event, and
+the holder must stop writing.
+"""
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from ..database import create_sqlite_engine
+from ..models import Lease
+
+logger = logging.getLogger(__name__)
+
+# Name of the lease every ingest (scheduled or POST /ingest/run) holds
+INGEST_LEASE = "ingest"
+
+# Seconds a lease lasts without a heartbeat; renewed every third of that
+INGEST_LEASE_SECONDS = float(os.getenv("INGEST_LEASE_SECONDS", "300"))
+
+# Identifies this process as a lease holder
+HOLDER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_lease_engines: Dict[str, Engine] = {}
+_lease_engines_lock = threading.Lock()
+
+
+class LeaseHeld(RuntimeError):
+    """Another process holds the lease."""
+
+
+def acquire_lease(db: Session, name: str, holder: str = HOLDER, seconds: float = INGEST_LEASE_SECONDS,
+                  now: Optional[float] = None) -> bool:
+    """
+    Take (or extend) lease name for holder unless someone else holds it, and commit.
+
+    Returns:
+        Whether holder now holds the lease
+    """
+    now = time.time() if now is None else now
+    insert = sqlite_insert(Lease).values(name=name, holder=holder, expires_at=now + seconds)
+    db.execute(insert.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"holder": insert.excluded.holder, "expires_at": insert.excluded.expires_at},
+        where=(Lease.holder == insert.excluded.holder) | (Lease.expires_at <= now),
+    ))
+    acquired = db.execute(select(Lease.holder).where(Lease.name == name)).scalar() == holder
+    db.commit()
+    return acquired
+
+
+def renew_lease(db: Session, name: str, holder: str = HOLDER, seconds: float = INGEST_LEASE_SECONDS) -> bool:
+    """Push holder's lease forward and commit; False if it was lost (expired and taken by another)."""
+    renewed = db.execute(
+        update(Lease).where(Lease.name == name, Lease.holder == holder).values(expires_at=time.time() + seconds)
+    ).rowcount == 1
+    db.commit()
+    return renewed
+
+
+def release_lease(db: Session, name: str, holder: str = HOLDER):
+    """Give up holder's lease (if it still holds it) and commit."""
+    db.execute(delete(Lease).where(Lease.name == name, Lease.holder == holder))
+    db.commit()
+
+
+def lease_holder(db: Session, name: str, now: Optional[float] = None) -> Optional[Tuple[str, float]]:
+    """(holder, expires_at) of lease name, or None if it is free or expired."""
+    now = time.time() if now is None else now
+    row = db.execute(select(Lease.holder, Lease.expires_at).where(Lease.name == name, Lease.expires_at > now)).first()
+    return None if row is None else tuple(row)
+
+
+def lease_engine(engine: Engine) -> Engine:
+    """
+    Engine on engine's database whose connections are opened per use, so
+    lease writes never wait for a connection the ingest has checked out.
+
+    An in-memory database exists only on its own connections, so engine is
+    used as it is.
+    """
+    if engine.url.database in (None, "", ":memory:"):
+        return engine
+    url = engine.url.render_as_string(hide_password=False)
+    with _lease_engines_lock:
+        if url not in _lease_engines:
+            _lease_engines[url] = create_sqlite_engine(url, poolclass=NullPool)
+        return _lease_engines[url]
+
+
+class HeldLease:
+    """
+    A lease held by a held_lease block.
+
+    Attributes:
+        lost: Set once the lease cannot be counted on any more; stop writing
+    """
+
+    def __init__(self, name: str, holder: str):
+        self.name = name
+        self.holder = holder
+        self.lost = threading.Event()
+
+
+@contextmanager
+def held_lease(session_factory: Callable[[], Session], name: str = INGEST_LEASE, holder: str = HOLDER,
+               seconds: float = INGEST_LEASE_SECONDS) -> Iterator[HeldLease]:
+    """
+    Hold lease name for the duration of the block, renewing it in the background.
+
+    Yields:
+        The HeldLease, whose lost event is set if the lease is taken over or
+        is about to expire because renewals keep failing
+
+    Raises:
+        LeaseHeld: If another process holds it
+    """
+    with session_factory() as db:
+        engine = lease_engine(db.get_bind())
+    with Session(engine) as db:
+        if not acquire_lease(db, name, holder, seconds):
+            current = lease_holder(db, name)
+            raise LeaseHeld(f"lease {name!r} is held by {current[0] if current else 'another process'}")
+    lease = HeldLease(name, holder)
+    stop = threading.Event()
+
+    def heartbeat():
+        renewed_at = time.time()
+        while not stop.wait(seconds / 3):
+            renewed = None
+            try:
+                with Session(engine) as db:
+                    renewed = renew_lease(db, name, holder, seconds)
+            except Exception:
+                # e.g. a write transaction outlasted the busy timeout; the next beat retries
+                logger.exception("Could not renew lease %r", name)
+            if renewed:
+                renewed_at = time.time()
+            elif renewed is False or time.time() + seconds / 3 >= renewed_at + seconds:
+                # Taken over, or it would expire before the next beat could renew it
+                logger.warning("Lost lease %r while holding it", name)
+                lease.lost.set()
+                return
+
+    thread = threading.Thread(target=heartbeat, name=f"lease-{name}", daemon=True)
+    thread.start()
+    try:
+        yield lease
+    finally:
+        stop.set()
+        thread.join()
+        with Session(engine) as db:
+            release_lease(db, name, holder)
@@ -1,95 +1,588 @@
 """Ingestion orchestrator that runs all ingest modules."""
-from typing import List, Dict
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Sequence
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql import func
+from collections import deque
+from datetime import datetime, timezone
+from itertools import islice
+import json
+import logging
+import os
+import queue
+import threading
+import time
 
-from ..ingest.kytc import ingest_kytc, normalize_kytc
-from ..ingest.indot import ingest_indot, normalize_indot
-from ..models import ContractAward
-from ..scoring import score_contract
+from ..amount import parse_amount_cents
+from ..contractors import ContractorResolver
+from ..data_version import bump_data_version
+from ..ingest.cache import PageCache
+from ..ingest.sources import INGEST_SOURCE_WORKERS, Source, get_sources
+from ..ingest.stats import IngestStats, record_run
+from ..ingest.watermark import Watermark, load_watermark, save_watermark
+from ..keyword_matches import MATCHES_KEY, replace_matches
+from ..lead_stats import LeadStatsDelta
+from ..models import ContractAward, ContractStatus, IngestRun
+from ..rescore import record_scoring_version
+from ..row_hash import HASHED_COLUMNS, row_hash
+from ..scoring import get_scorer, score_many
 
+logger = logging.getLogger(__name__)
 
-def run_ingestion(db: Session) -> Dict:
+# Rows per SELECT/upsert round trip
+UPSERT_CHUNK_SIZE = 500
+
+# Records scored, upserted and committed together; bounds the memory a run
+# holds and the work lost if it fails part way through
+INGEST_COMMIT_EVERY = int(os.getenv("INGEST_COMMIT_EVERY", "5000"))
+
+# Records a source worker hands to the pipeline at a time, and how many such
+# batches may wait in the queue between them
+SOURCE_BATCH_SIZE = 200
+SOURCE_QUEUE_SIZE = 5
+
+# How often (seconds) the pipeline checks source timeouts while it waits
+SOURCE_POLL_SECONDS = 0.1
+
+# How a source's part of a run ended
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+
+# Status of a run in which some sources succeeded and others did not
+PARTIAL = "partial"
+
+# Columns refreshed from the source on every ingest. `status` is deliberately
+# absent so a lead that was manually moved off "new" keeps its status.
+UPSERT_COLUMNS = HASHED_COLUMNS
+
+# Stored row_hash of UPSERT_COLUMNS: an incoming row with the same hash is
+# skipped, so only new and changed contracts are written
+HASH_COLUMN = "content_hash"
+
+# Parsed from `amount` and written with it; covered by the hash through `amount`
+AMOUNT_CENTS_COLUMN = "amount_cents"
+
+# Resolved from `awarded_to` (see app.contractors); covered by the hash through it
+CONTRACTOR_COLUMN = "contractor_id"
+
+# Written with every inserted or updated row but not compared: a row whose
+# score is the same under new scoring rules is still current (see app.rescore)
+VERSION_COLUMN = "score_version"
+
+
+# Loaded for the stored rows of each chunk: the hash to compare, and the
+# values the GET /stats summaries counted them under
+STORED_COLUMNS = (
+    ContractAward.state,
+    ContractAward.contract_id,
+    ContractAward.id,
+    ContractAward.content_hash,
+    ContractAward.status,
+    ContractAward.score,
+    ContractAward.letting_date,
+    ContractAward.contractor_id,
+)
+
+
+def _upsert_statement():
+    """INSERT ... ON CONFLICT (state, contract_id) DO UPDATE, executed once per chunk."""
+    # Built on the Table rather than the mapped class so the session runs a
+    # plain executemany instead of the ORM's row-at-a-time bulk insert path
+    stmt = sqlite_insert(ContractAward.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["state", "contract_id"],
+        set_={
+            **{column: stmt.excluded[column] for column in (*UPSERT_COLUMNS, HASH_COLUMN, AMOUNT_CENTS_COLUMN, CONTRACTOR_COLUMN, VERSION_COLUMN)},
+            # onupdate= is not applied to ON CONFLICT updates
+            "updated_at": func.now(),
+        },
+    )
+
+
+def upsert_contracts(
+    db: Session,
+    rows: Iterable[Dict],
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[Dict], None]] = None,
+    contractors: Optional[ContractorResolver] = None,
+) -> Dict:
     """
-    Run all ingestion modules, normalize, score, and upsert into database.
-    
+    Bulk upsert scored contract rows keyed on (state, contract_id).
+
+    Each chunk costs one SELECT per state to load the stored ids and content
+    hashes for its keys and at most one executemany of INSERT ... ON
+    CONFLICT DO UPDATE for the rows that are new or whose hash differs.
+    Unchanged rows are not written at all, so their `updated_at` keeps the
+    time their content last changed. The keyword matches of written rows
+    replace their stored ones with one DELETE and one executemany INSERT;
+    new rows' ids are read back only if they have matches. Written rows are
+    linked to the contractor their awarded_to resolves to, and the GET
+    /stats summaries are adjusted for them in the same transaction (see
+    app.contractors and app.lead_stats).
+
     Args:
-        db: Database session
-        
+        db: Database session (the caller commits)
+        rows: Normalized contract dictionaries including 'score' and
+            optionally 'matches' and 'score_version'
+        chunk_size: Number of rows per round trip
+        on_chunk: Called with the running counts after each chunk
+        contractors: Resolver of awarded_to names (a run passes one for all
+            its chunks; defaults to a new one)
+
     Returns:
-        Dictionary with counts of processed and upserted contracts
+        Dictionary with 'inserted', 'updated' and 'unchanged' counts
     """
-    kytc_count = 0
-    indot_count = 0
-    total_upserted = 0
-    
-    # Ingest KYTC
-    kytc_raw = ingest_kytc()
-    kytc_normalized = normalize_kytc(kytc_raw)
-    kytc_count = len(kytc_normalized)
-    
-    # Ingest INDOT
-    indot_raw = ingest_indot()
-    indot_normalized = normalize_indot(indot_raw)
-    indot_count = len(indot_normalized)
-    
-    # Combine all contracts
-    all_contracts = kytc_normalized + indot_normalized
-    
-    # Process each contract: score and upsert
-    for contract_data in all_contracts:
-        # Score the contract
-        scoring_result = score_contract(
-            description=contract_data.get("description", ""),
-            contract_id=contract_data.get("contract_id", ""),
-            awarded_to=contract_data.get("awarded_to", "")
-        )
-        
-        # Check if contract already exists (by state + contract_id)
-        existing = db.query(ContractAward).filter(
-            and_(
-                ContractAward.state == contract_data["state"],
-                ContractAward.contract_id == contract_data["contract_id"]
-            )
-        ).first()
-        
-        if existing:
-            # Update existing contract
-            existing.letting_date = contract_data["letting_date"]
-            existing.awarded_to = contract_data["awarded_to"]
-            existing.description = contract_data["description"]
-            existing.amount = contract_data.get("amount")
-            existing.source_url = contract_data["source_url"]
-            existing.score = scoring_result["score"]
-            existing.score_reasons = scoring_result["score_reasons"]
-            # Don't update status if it's been manually changed from NEW
-            if existing.status.value == "new":
-                pass  # Keep as new
-        else:
-            # Create new contract
-            new_contract = ContractAward(
-                state=contract_data["state"],
-                letting_date=contract_data["letting_date"],
-                contract_id=contract_data["contract_id"],
-                awarded_to=contract_data["awarded_to"],
-                description=contract_data["description"],
-                amount=contract_data.get("amount"),
-                source_url=contract_data["source_url"],
-                score=scoring_result["score"],
-                score_reasons=scoring_result["score_reasons"]
-            )
-            db.add(new_contract)
-        
-        total_upserted += 1
-    
-    # Commit all changes
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    # Last occurrence wins when a source repeats a contract within one run
+    by_key = {}
+    for row in rows:
+        by_key[(row["state"], row["contract_id"])] = row
+    keyed = list(by_key.items())
+    keyword_ids = {}
+    stats = LeadStatsDelta()
+    contractors = contractors or ContractorResolver()
+
+    for start in range(0, len(keyed), chunk_size):
+        chunk = keyed[start:start + chunk_size]
+
+        # One lookup per state: SQLite plans a row-value IN as a full scan,
+        # but state = ? AND contract_id IN (...) is a search on the unique index
+        ids_by_state = {}
+        for (state, contract_id), _ in chunk:
+            ids_by_state.setdefault(state, []).append(contract_id)
+        stored = {}
+        for state, contract_ids in ids_by_state.items():
+            for r in db.execute(
+                select(*STORED_COLUMNS)
+                .where(ContractAward.state == state, ContractAward.contract_id.in_(contract_ids))
+            ):
+                stored[(r.state, r.contract_id)] = r
+
+        to_write = []
+        matches = {}
+        for key, row in chunk:
+            values = [row.get(column) for column in UPSERT_COLUMNS]
+            digest = row_hash(values)
+            old = stored.get(key)
+            if old is None:
+                counts["inserted"] += 1
+            elif old.content_hash == digest:
+                counts["unchanged"] += 1
+                continue
+            else:
+                counts["updated"] += 1
+                stats.remove(key[0], old.status, old.score, old.letting_date, old.contractor_id)
+            matches[key] = row.get(MATCHES_KEY) or ()
+            to_write.append({
+                "state": key[0],
+                "contract_id": key[1],
+                **dict(zip(UPSERT_COLUMNS, values)),
+                HASH_COLUMN: digest,
+                AMOUNT_CENTS_COLUMN: parse_amount_cents(row.get("amount")),
+                VERSION_COLUMN: row.get(VERSION_COLUMN),
+            })
+
+        if to_write:
+            contractor_ids = contractors.resolve(db, [row["awarded_to"] for row in to_write])
+            for row in to_write:
+                row[CONTRACTOR_COLUMN] = contractor_ids[row["awarded_to"]]
+                old = stored.get((row["state"], row["contract_id"]))
+                # status is not upserted: a new row starts as "new", an updated one keeps its own
+                status = ContractStatus.NEW if old is None else old.status
+                stats.add(row["state"], status, row["score"], row["letting_date"], row[CONTRACTOR_COLUMN])
+            db.execute(_upsert_statement(), to_write)
+            _write_matches(db, matches, stored, keyword_ids)
+            stats.apply(db)
+
+        if on_chunk:
+            on_chunk(counts)
+
+    return counts
+
+
+def _write_matches(db: Session, matches: Dict, stored: Dict, keyword_ids: Dict[str, int]):
+    """Replace the keyword matches of the rows just written, keyed (state, contract_id)."""
+    ids = {key: stored[key].id for key in matches if key in stored}
+    new_ids_by_state = {}
+    for key, pairs in matches.items():
+        if key not in stored and pairs:
+            new_ids_by_state.setdefault(key[0], []).append(key[1])
+    for state, contract_ids in new_ids_by_state.items():
+        for r in db.execute(
+            select(ContractAward.contract_id, ContractAward.id)
+            .where(ContractAward.state == state, ContractAward.contract_id.in_(contract_ids))
+        ):
+            ids[(state, r[0])] = r[1]
+    replace_matches(
+        db,
+        {ids[key]: pairs for key, pairs in matches.items() if pairs},
+        stored_ids=[ids[key] for key in matches if key in stored],
+        ids=keyword_ids,
+    )
+
+
+class IngestCancelled(RuntimeError):
+    """The run's cancelled event was set (e.g. its ingest lease was lost)."""
+
+
+def _check_cancelled(cancelled: Optional[threading.Event]):
+    if cancelled is not None and cancelled.is_set():
+        raise IngestCancelled("ingest run cancelled before its next write")
+
+
+def _no_progress(stage: str, **counts: int):
+    pass
+
+
+# Queued by a source worker after its last batch
+_END = object()
+
+
+class _SourceRun:
+    """One source's worker thread and what the pipeline knows about it."""
+
+    def __init__(self, source: Source, cache: PageCache, watermark: Watermark):
+        self.source = source
+        self.timeout = float(os.getenv(f"INGEST_SOURCE_TIMEOUT_{source.name.upper()}", source.timeout_seconds))
+        self.cache = cache.scope()
+        self.watermark = watermark
+        self.status: Optional[str] = None
+        self.records = 0
+        self.error: Optional[str] = None
+        self.cancelled = threading.Event()
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._blocked = 0.0
+        self._blocked_since: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def start(self, out: queue.Queue, stats: IngestStats):
+        self._started = time.perf_counter()
+        # Daemon, so a source stuck in a call that never returns cannot keep the process alive
+        threading.Thread(
+            target=self._produce, args=(out, stats), name=f"ingest-source-{self.source.name}", daemon=True
+        ).start()
+
+    def _produce(self, out: queue.Queue, stats: IngestStats):
+        records = None
+        batch = []
+        try:
+            records = self.source.normalize(self.source.fetch(cache=self.cache, stats=stats, watermark=self.watermark))
+            for record in records:
+                batch.append(record)
+                if len(batch) >= SOURCE_BATCH_SIZE:
+                    if not self._put(out, batch):
+                        return
+                    batch = []
+            if batch and not self._put(out, batch):
+                return
+            self._put(out, _END)
+        except Exception as e:
+            logger.exception("Ingest source %s failed", self.source.name)
+            # What the source produced before failing is still ingested
+            if not batch or self._put(out, batch):
+                self._put(out, e)
+        finally:
+            self._finished = time.perf_counter()
+            close = getattr(records, "close", None)
+            if close is not None:
+                close()
+
+    def _put(self, out: queue.Queue, item) -> bool:
+        """Queue item for the pipeline; False if the run was cancelled while waiting for room."""
+        try:
+            out.put_nowait((self, item))
+            return True
+        except queue.Full:
+            pass
+        with self._lock:
+            self._blocked_since = time.perf_counter()
+        try:
+            while not self.cancelled.is_set():
+                try:
+                    out.put((self, item), timeout=SOURCE_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            with self._lock:
+                self._blocked += time.perf_counter() - self._blocked_since
+                self._blocked_since = None
+
+    def producing_seconds(self, now: float) -> float:
+        """Seconds since the start spent producing, leaving out waits for room in the queue."""
+        if self._started is None:
+            return 0.0
+        with self._lock:
+            blocked = self._blocked
+            if self._blocked_since is not None:
+                blocked += now - self._blocked_since
+        return (self._finished or now) - self._started - blocked
+
+    def finish(self, status: str, stats: IngestStats, error: Optional[str] = None):
+        self.status = status
+        self.error = error
+        if status != SUCCEEDED:
+            self.cancelled.set()
+        stats.observe("source", self.producing_seconds(time.perf_counter()), self.source.name)
+        stats.finish(self.source.name, status, error)
+
+    def result(self) -> Dict:
+        """This source's entry in the run result."""
+        return {
+            "status": self.status,
+            "records": self.records,
+            "seconds": round(self.producing_seconds(time.perf_counter()), 6),
+            "error": self.error,
+        }
+
+
+def _source_records(runs: Sequence[_SourceRun], stats: IngestStats, workers: int) -> Iterator[Dict]:
+    """
+    Run the sources on up to workers threads and yield their records as they arrive.
+
+    A source that raises is marked failed and one that produces for longer
+    than its timeout is marked timed out and abandoned (a late record from
+    it is dropped); either way the other sources carry on.
+    """
+    out: queue.Queue = queue.Queue(maxsize=SOURCE_QUEUE_SIZE)
+    waiting = deque(runs)
+    active = set()
+
+    def start_waiting():
+        while waiting and len(active) < workers:
+            run = waiting.popleft()
+            run.start(out, stats)
+            active.add(run)
+
+    start_waiting()
+    next_check = time.perf_counter() + SOURCE_POLL_SECONDS
+    try:
+        while active:
+            now = time.perf_counter()
+            if now >= next_check:
+                next_check = now + SOURCE_POLL_SECONDS
+                for run in [run for run in active if run.producing_seconds(now) > run.timeout]:
+                    logger.warning("Ingest source %s timed out after %ss", run.source.name, run.timeout)
+                    run.finish(TIMED_OUT, stats, f"Did not finish within {run.timeout}s")
+                    active.discard(run)
+                start_waiting()
+                if not active:
+                    break
+
+            try:
+                run, item = out.get(timeout=SOURCE_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if run not in active:
+                continue
+            if item is _END or isinstance(item, Exception):
+                if item is _END:
+                    run.finish(SUCCEEDED, stats)
+                else:
+                    run.finish(FAILED, stats, f"{type(item).__name__}: {item}")
+                active.discard(run)
+                start_waiting()
+                continue
+            run.records += len(item)
+            yield from item
+    finally:
+        # Stops the workers when the pipeline gives up early (e.g. an upsert failed)
+        for run in [*active, *waiting]:
+            run.cancelled.set()
+
+
+def _chunked(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Group records into lists of at most size."""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _ingest(
+    db: Session,
+    progress: Callable[..., None],
+    commit_every: int,
+    stats: IngestStats,
+    runs: Sequence[_SourceRun],
+    workers: int,
+    cancelled: Optional[threading.Event] = None,
+) -> Dict:
+    """Stream every source through score, upsert and commit (see run_ingestion); the caller makes the last commit."""
+    counts = {
+        "total_processed": 0,
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "chunks": 0,
+    }
+    scorer = get_scorer()
+    record_scoring_version(db, scorer)
+    # End the setup transaction (and the watermark reads) before fetching:
+    # an open session keeps the only writer connection checked out, and a
+    # chunk can take the whole run to fetch
     db.commit()
-    
+    contractors = ContractorResolver()
+
+    progress("fetch")
+    records = _source_records(runs, stats, workers)
+    try:
+        for chunk in _chunked(records, commit_every):
+            _check_cancelled(cancelled)
+            progress("score")
+            with stats.span("score"):
+                scored = [
+                    {**contract_data, **scoring_result, "score_version": scorer.fingerprint}
+                    for contract_data, scoring_result in zip(chunk, score_many(chunk))
+                ]
+
+            # Bulk upsert by (state, contract_id)
+            progress("upsert")
+            with stats.span("upsert"):
+                chunk_counts = upsert_contracts(db, scored, contractors=contractors)
+
+            progress("commit")
+            with stats.span("commit"):
+                if chunk_counts["inserted"] or chunk_counts["updated"]:
+                    bump_data_version(db)
+                db.commit()
+
+            for key, value in chunk_counts.items():
+                counts[key] += value
+            counts["total_processed"] += len(chunk)
+            counts["chunks"] += 1
+            progress("fetch", **counts)
+        _check_cancelled(cancelled)
+    finally:
+        # Cancels the source workers if the pipeline failed
+        records.close()
+
+    return counts
+
+
+def _record_run(db: Session, status: str, started_at: datetime, seconds: float, stats: IngestStats,
+                counts: Optional[Dict] = None, error: Optional[str] = None) -> IngestRun:
+    """Add the run's ingest_runs row (the caller commits) and count it in /metrics."""
+    run = IngestRun(
+        status=status,
+        started_at=started_at,
+        finished_at=datetime.now(timezone.utc),
+        duration_seconds=round(seconds, 6),
+        counts=json.dumps(counts or {}),
+        summary=json.dumps(stats.summary()),
+        error=error,
+    )
+    db.add(run)
+    record_run(status, seconds)
+    return run
+
+
+def run_ingestion(
+    db: Session,
+    cache: Optional[PageCache] = None,
+    refresh: bool = False,
+    progress: Callable[..., None] = _no_progress,
+    commit_every: int = INGEST_COMMIT_EVERY,
+    sources: Optional[Sequence[Source]] = None,
+    workers: int = INGEST_SOURCE_WORKERS,
+    cancelled: Optional[threading.Event] = None,
+) -> Dict:
+    """
+    Run all ingestion sources, normalize, score, and upsert into database.
+
+    The registered sources (see app.ingest.sources) run concurrently, up to
+    workers at a time, each on its own thread. Their records are merged into
+    one stream that flows through the pipeline commit_every at a time: each
+    chunk is scored, upserted and committed before the next one is pulled,
+    so memory stays bounded by the chunk size however large the sources
+    are, and a failure late in a run keeps the chunks already committed.
+
+    A source that raises or exceeds its timeout is isolated: its status is
+    recorded, the records it already delivered are kept, and the other
+    sources carry on. The run is then stored as "partial" ("failed" if no
+    source succeeded). Only a failure of the pipeline itself aborts the run.
+    The page cache is only flushed after the last commit, and only with the
+    pages of sources that succeeded, so the rest are re-read next time;
+    likewise only succeeded sources' watermarks move (in the last commit).
+
+    Every run, failed or not, is stored in ingest_runs with its counts and
+    the IngestStats summary (pages, bytes, rows emitted and skipped by
+    reason, and seconds per stage), which also feed GET /metrics.
+
+    Args:
+        db: Database session (committed after every chunk)
+        cache: Page cache for conditional requests (defaults to the one in CACHE_DIR)
+        refresh: Re-download and re-parse every page regardless of the cache
+        progress: Called as progress(stage, **counts) when a stage starts and
+            with the running counts after every chunk (see IngestJob.report)
+        commit_every: Records per scored, upserted and committed chunk
+        sources: Sources to run (defaults to every registered source)
+        workers: Sources fetched at the same time
+        cancelled: Checked before every chunk is written and before the
+            run is finished; once set, the run fails with IngestCancelled
+            and keeps only the chunks already committed
+
+    Returns:
+        Dictionary with counts of processed and upserted contracts, each
+        source's status, record count, seconds and error, the ingest_runs id
+        and the instrumentation summary
+    """
+    if cache is None:
+        cache = PageCache(refresh=refresh)
+    if sources is None:
+        sources = get_sources()
+
+    stats = IngestStats()
+    runs = [_SourceRun(source, cache, load_watermark(db, source.name)) for source in sources]
+    started_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    try:
+        counts = _ingest(db, progress, commit_every, stats, runs, max(1, workers), cancelled)
+    except Exception as e:
+        db.rollback()
+        try:
+            _record_run(db, FAILED, started_at, time.perf_counter() - started, stats, error=f"{type(e).__name__}: {e}")
+            db.commit()
+        except Exception:
+            logger.exception("Could not record the failed ingest run")
+            db.rollback()
+        raise
+
+    # Pages and lettings only count as ingested for sources that delivered
+    # everything (a timed-out one may even still be staging)
+    for source_run in runs:
+        cache.merge(source_run.cache, keep_staged=source_run.status == SUCCEEDED)
+        if source_run.status == SUCCEEDED:
+            save_watermark(db, source_run.watermark)
+
+    counts.update({
+        "total_upserted": counts["inserted"] + counts["updated"] + counts["unchanged"],
+        "cache_hits": cache.hits,
+        "cache_misses": cache.misses,
+    })
+    failed = [source_run for source_run in runs if source_run.status != SUCCEEDED]
+    if not failed:
+        status, error = SUCCEEDED, None
+    else:
+        status = FAILED if len(failed) == len(runs) else PARTIAL
+        error = "; ".join(f"{source_run.source.name}: {source_run.error}" for source_run in failed)
+    run = _record_run(db, status, started_at, time.perf_counter() - started, stats, counts, error)
+
+    # Commits the run, then remember which pages are now ingested
+    db.commit()
+    cache.flush()
+
     return {
-        "kytc_count": kytc_count,
-        "indot_count": indot_count,
-        "total_processed": len(all_contracts),
-        "total_upserted": total_upserted
+        **counts,
+        "status": status,
+        "sources": {source_run.source.name: source_run.result() for source_run in runs},
+        "run_id": run.id,
+        "summary": json.loads(run.summary),
     }
-
@@ -0,0 +1,230 @@
+"""
+In-process ingest scheduler.
+
+Started from app startup, it wakes every INGEST_SCHEDULER_POLL_SECONDS and
+ingests the sources that are due. Each source has its own interval
+(Source.interval_seconds), and ingest_schedule stores when it is next due,
+so the cadence survives restarts and is shared by every worker process.
+
+- Jitter: every delay is stretched or shrunk by up to INGEST_SCHEDULE_JITTER
+  (a fraction), so workers and sources drift apart instead of waking in step.
+- Overlap: every ingest, scheduled or from POST /ingest/run, holds the
+  ingest lease (see app.ingest.lease), so only one process ingests at a
+  time; within a process the JobManager coalesces them.
+- Backoff: a source whose run did not succeed is retried after
+  INGEST_RETRY_SECONDS, doubled for every further consecutive failure up to
+  INGEST_RETRY_MAX_SECONDS, instead of at its regular interval.
+"""
+from typing import Callable, Dict, List, Optional, Sequence
+import logging
+import os
+import random
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..models import SourceSchedule
+from .jobs import IngestJob, JobManager, job_manager
+from .lease import HOLDER, INGEST_LEASE, held_lease, lease_holder
+from .runner import FAILED, SUCCEEDED, _no_progress, run_ingestion
+from .sources import Source, get_sources
+
+logger = logging.getLogger(__name__)
+
+# Whether app startup starts the scheduler (off: only POST /ingest/run ingests)
+INGEST_SCHEDULER_ENABLED = os.getenv("INGEST_SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Seconds between checks for due sources
+INGEST_SCHEDULER_POLL_SECONDS = float(os.getenv("INGEST_SCHEDULER_POLL_SECONDS", "30"))
+
+# Fraction every scheduled delay is randomly stretched or shrunk by
+INGEST_SCHEDULE_JITTER = float(os.getenv("INGEST_SCHEDULE_JITTER", "0.1"))
+
+# Seconds before a source that failed is retried, doubled per consecutive failure up to the maximum
+INGEST_RETRY_SECONDS = float(os.getenv("INGEST_RETRY_SECONDS", "300"))
+INGEST_RETRY_MAX_SECONDS = float(os.getenv("INGEST_RETRY_MAX_SECONDS", "86400"))
+
+# Run status when, by the time the lease was taken, no source was due any more
+SKIPPED = "skipped"
+
+
+def next_delay(source: Source, failures: int, rng: random.Random = random, jitter: Optional[float] = None) -> float:
+    """
+    Seconds until source is next due.
+
+    Args:
+        source: The source
+        failures: Consecutive runs it has not succeeded in, including the last one
+        rng: Random source for the jitter
+        jitter: Fraction the delay is randomly stretched or shrunk by
+            (defaults to INGEST_SCHEDULE_JITTER)
+
+    Returns:
+        Its interval after a success, its backoff after a failure, with jitter
+    """
+    if failures:
+        delay = min(INGEST_RETRY_SECONDS * 2 ** (failures - 1), INGEST_RETRY_MAX_SECONDS)
+    else:
+        delay = source.interval_seconds
+    jitter = INGEST_SCHEDULE_JITTER if jitter is None else jitter
+    return delay * (1 + rng.uniform(-jitter, jitter))
+
+
+def due_sources(db: Session, sources: Sequence[Source], now: float) -> List[Source]:
+    """Sources due at now (a source never scheduled is due at once)."""
+    next_runs = dict(db.execute(select(SourceSchedule.source, SourceSchedule.next_run_at)).all())
+    return [source for source in sources if next_runs.get(source.name, now) <= now]
+
+
+def reschedule(db: Session, sources: Sequence[Source], statuses: Dict[str, str], now: float,
+               rng: random.Random = random):
+    """Record how each source's run went and when it is next due (the caller commits)."""
+    failures = dict(db.execute(select(SourceSchedule.source, SourceSchedule.failures)).all())
+    rows = []
+    for source in sources:
+        status = statuses.get(source.name, FAILED)
+        source_failures = 0 if status == SUCCEEDED else failures.get(source.name, 0) + 1
+        rows.append({
+            "source": source.name,
+            "next_run_at": now + next_delay(source, source_failures, rng),
+            "failures": source_failures,
+            "last_status": status,
+            "last_run_at": now,
+        })
+    if not rows:
+        return
+    insert = sqlite_insert(SourceSchedule)
+    db.execute(
+        insert.on_conflict_do_update(
+            index_elements=["source"],
+            set_={column: insert.excluded[column] for column in ("next_run_at", "failures", "last_status", "last_run_at")},
+        ),
+        rows,
+    )
+
+
+def run_leased_ingestion(
+    session_factory: Callable[[], Session],
+    sources: Optional[Sequence[Source]] = None,
+    refresh: bool = False,
+    progress: Callable[..., None] = _no_progress,
+    due_at: Optional[float] = None,
+) -> Dict:
+    """
+    run_ingestion while holding the ingest lease, then reschedule the sources it ran.
+
+    Args:
+        session_factory: Opens the sessions for the lease and the run
+        sources: Sources to run (defaults to every registered source)
+        refresh: Re-download and re-parse every page regardless of the cache
+        progress: See run_ingestion
+        due_at: Only run those of sources still due at this time once the
+            lease is held (another process may have ingested them meanwhile)
+
+    Returns:
+        The run_ingestion result, or a SKIPPED one if no source was due
+
+    Raises:
+        LeaseHeld: If another process is ingesting
+        IngestCancelled: If the lease was lost during the run
+    """
+    sources = list(sources) if sources is not None else get_sources()
+    with held_lease(session_factory) as lease:
+        db = session_factory()
+        try:
+            if due_at is not None:
+                sources = due_sources(db, sources, due_at)
+                if not sources:
+                    return {"status": SKIPPED, "sources": {}, "total_processed": 0, "total_upserted": 0}
+            try:
+                result = run_ingestion(db, refresh=refresh, progress=progress, sources=sources, cancelled=lease.lost)
+            except Exception:
+                db.rollback()
+                try:
+                    reschedule(db, sources, {}, time.time())
+                    db.commit()
+                except Exception:
+                    logger.exception("Could not reschedule the failed ingest's sources")
+                    db.rollback()
+                raise
+            reschedule(db, sources, {name: source["status"] for name, source in result["sources"].items()}, time.time())
+            db.commit()
+            return result
+        finally:
+            db.close()
+
+
+class IngestScheduler:
+    """
+    Background thread that starts an ingest of the due sources whenever some are due.
+
+    Runs go through the JobManager, so they show up in GET /ingest/jobs and
+    coalesce with POST /ingest/run in this process.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        jobs: JobManager = job_manager,
+        poll_seconds: float = INGEST_SCHEDULER_POLL_SECONDS,
+        rng: random.Random = random,
+    ):
+        self.session_factory = session_factory
+        self.jobs = jobs
+        self.poll_seconds = poll_seconds
+        self.rng = rng
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def tick(self, now: Optional[float] = None) -> Optional[IngestJob]:
+        """
+        Start an ingest of the sources due at now, unless none are, or
+        another process holds the ingest lease, or this one is ingesting.
+
+        Returns:
+            The job started, if any
+        """
+        now = time.time() if now is None else now
+        if self.jobs.current is not None:
+            return None
+        db = self.session_factory()
+        try:
+            holder = lease_holder(db, INGEST_LEASE, now)
+            if holder is not None and holder[0] != HOLDER:
+                return None
+            due = due_sources(db, get_sources(), now)
+        finally:
+            db.close()
+        if not due:
+            return None
+
+        def target(job: IngestJob) -> Dict:
+            return run_leased_ingestion(self.session_factory, due, progress=job.report, due_at=now)
+
+        job, started = self.jobs.start(target, params={"refresh": False, "sources": [source.name for source in due]})
+        return job if started else None
+
+    def _run(self):
+        while not self._stop.wait(self.poll_seconds * (1 + self.rng.uniform(-INGEST_SCHEDULE_JITTER, INGEST_SCHEDULE_JITTER))):
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("Ingest scheduler check failed")
+
+    def start(self):
+        """Start checking for due sources in a daemon thread (no-op if already started)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ingest-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop checking; an ingest already started runs to completion."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
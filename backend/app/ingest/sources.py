@@ -0,0 +1,97 @@
+"""
+Registry of ingest sources.
+
+A source is a module in this package that registers a Source at import
+time, naming its fetch and normalize callables (and optionally how to list
+its lettings, for the backfill):
+
+    register_source(Source(SOURCE, fetch=ingest_ohio, normalize=normalize_ohio))
+
+get_sources() imports every module of the package once, so adding a state
+DOT is a matter of adding its module; the runner picks it up without
+changes.
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional
+import importlib
+import os
+import pkgutil
+import threading
+
+# Seconds a source may spend producing records before the runner abandons it
+# (time it spends blocked because the pipeline is behind does not count)
+INGEST_SOURCE_TIMEOUT = float(os.getenv("INGEST_SOURCE_TIMEOUT", "1800"))
+
+# Sources fetched at the same time
+INGEST_SOURCE_WORKERS = int(os.getenv("INGEST_SOURCE_WORKERS", "4"))
+
+# Seconds between scheduled ingests of a source (see app.ingest.scheduler)
+INGEST_INTERVAL_SECONDS = float(os.getenv("INGEST_INTERVAL_SECONDS", "21600"))
+
+
+@dataclass(frozen=True)
+class Source:
+    """
+    One ingest source.
+
+    fetch is called as fetch(cache=..., stats=..., watermark=...) and returns
+    raw records (ideally a generator, so records stream); normalize turns
+    them into contract dictionaries (see normalize_kytc). The source's name
+    labels its results, its IngestStats entries, its /metrics series and
+    its watermark.
+
+    A source that can list its lettings sets discover; the backfill then
+    calls fetch(letting_dates=[...], ...) for the ones not yet ingested.
+
+    The scheduler ingests it every interval seconds (INGEST_INTERVAL_SECONDS
+    by default, INGEST_INTERVAL_SECONDS_<NAME> overrides either).
+    """
+    name: str
+    fetch: Callable[..., Iterable[Dict]]
+    normalize: Callable[[Iterable[Dict]], Iterable[Dict]]
+    timeout: Optional[float] = None  # Defaults to INGEST_SOURCE_TIMEOUT
+    discover: Optional[Callable[[], List[date]]] = None
+    interval: Optional[float] = None  # Defaults to INGEST_INTERVAL_SECONDS
+
+    @property
+    def timeout_seconds(self) -> float:
+        return self.timeout if self.timeout is not None else INGEST_SOURCE_TIMEOUT
+
+    @property
+    def interval_seconds(self) -> float:
+        default = self.interval if self.interval is not None else INGEST_INTERVAL_SECONDS
+        return float(os.getenv(f"INGEST_INTERVAL_SECONDS_{self.name.upper()}", default))
+
+
+SOURCES: Dict[str, Source] = {}
+
+_discovered = False
+_discover_lock = threading.Lock()
+
+
+def register_source(source: Source) -> Source:
+    """Add source to the registry (a second source with the same name is an error)."""
+    existing = SOURCES.get(source.name)
+    if existing is not None and existing != source:
+        raise ValueError(f"ingest source {source.name!r} is already registered")
+    SOURCES[source.name] = source
+    return source
+
+
+def discover_sources():
+    """Import every module of this package so their sources register."""
+    global _discovered
+    with _discover_lock:
+        if _discovered:
+            return
+        package = importlib.import_module(__package__)
+        for module in pkgutil.iter_modules(package.__path__):
+            importlib.import_module(f"{__package__}.{module.name}")
+        _discovered = True
+
+
+def get_sources() -> List[Source]:
+    """Registered sources, in registration order."""
+    discover_sources()
+    return list(SOURCES.values())
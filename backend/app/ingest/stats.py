@@ -0,0 +1,120 @@
+"""Per-run ingest instrumentation, mirrored into the process-wide metrics."""
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+import copy
+import threading
+import time
+
+from ..metrics import registry
+
+PAGES = registry.counter(
+    "ingest_pages_total",
+    "Source pages by fetch outcome (fetched, not_modified, failed)",
+    ("source", "outcome"),
+)
+BYTES = registry.counter("ingest_bytes_total", "Bytes downloaded from sources", ("source",))
+ROWS = registry.counter("ingest_rows_total", "Records emitted by sources", ("source",))
+SKIPPED = registry.counter(
+    "ingest_rows_skipped_total",
+    "Source rows (or whole pages) dropped, by reason",
+    ("source", "reason"),
+)
+STAGE_SECONDS = registry.histogram(
+    "ingest_stage_seconds",
+    "Duration of one instrumented span of an ingest stage",
+    ("source", "stage"),
+)
+SOURCE_RUNS = registry.counter(
+    "ingest_source_runs_total",
+    "Sources run by outcome (succeeded, failed, timed_out)",
+    ("source", "status"),
+)
+RUNS = registry.counter("ingest_runs_total", "Finished ingest runs by status", ("status",))
+RUN_SECONDS = registry.histogram("ingest_run_seconds", "Wall time of whole ingest runs", ("status",))
+
+# Source label for spans that belong to the run rather than one source
+RUN_SOURCE = "all"
+
+
+class IngestStats:
+    """
+    Counters and stage timings for one ingest run.
+
+    Sources and the runner record into it from any thread (the KYTC fetch
+    runs on its own); every update also goes to the matching process-wide
+    metric for GET /metrics. `summary()` is the copy stored with the run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Dict] = {}
+        self._stages: Dict[str, float] = {}
+
+    def _source(self, source: str) -> Dict:
+        entry = self._sources.get(source)
+        if entry is None:
+            entry = self._sources[source] = {"pages": {}, "bytes": 0, "rows": 0, "skipped": {}, "seconds": {}}
+        return entry
+
+    def page(self, source: str, outcome: str, size: int = 0):
+        """Count one page by fetch outcome, and the bytes downloaded for it."""
+        with self._lock:
+            entry = self._source(source)
+            entry["pages"][outcome] = entry["pages"].get(outcome, 0) + 1
+            entry["bytes"] += size
+        PAGES.inc(source=source, outcome=outcome)
+        if size:
+            BYTES.inc(size, source=source)
+
+    def rows(self, source: str, count: int = 1):
+        """Count records a source emitted."""
+        with self._lock:
+            self._source(source)["rows"] += count
+        ROWS.inc(count, source=source)
+
+    def skip(self, source: str, reason: str, count: int = 1):
+        """Count rows (or pages) a source dropped, by reason."""
+        with self._lock:
+            skipped = self._source(source)["skipped"]
+            skipped[reason] = skipped.get(reason, 0) + count
+        SKIPPED.inc(count, source=source, reason=reason)
+
+    def finish(self, source: str, status: str, error: Optional[str] = None):
+        """Record how a source's run ended, and why if it did not succeed."""
+        with self._lock:
+            entry = self._source(source)
+            entry["status"] = status
+            if error:
+                entry["error"] = error
+        SOURCE_RUNS.inc(source=source, status=status)
+
+    def observe(self, stage: str, seconds: float, source: Optional[str] = None):
+        """Add seconds spent in stage, for one source or (source=None) the run."""
+        with self._lock:
+            timings = self._stages if source is None else self._source(source)["seconds"]
+            timings[stage] = timings.get(stage, 0.0) + seconds
+        STAGE_SECONDS.observe(seconds, source=source or RUN_SOURCE, stage=stage)
+
+    @contextmanager
+    def span(self, stage: str, source: Optional[str] = None) -> Iterator[None]:
+        """Time the with-block as stage (see observe)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, source)
+
+    def summary(self) -> Dict:
+        """JSON-ready copy: per-source counters and seconds, and run-level stage seconds."""
+        with self._lock:
+            sources = copy.deepcopy(self._sources)
+            stages = dict(self._stages)
+        for entry in sources.values():
+            entry["seconds"] = {stage: round(s, 6) for stage, s in entry["seconds"].items()}
+        return {"sources": sources, "stages": {stage: round(s, 6) for stage, s in stages.items()}}
+
+
+def record_run(status: str, seconds: float):
+    """Count a finished run in the process-wide metrics."""
+    RUNS.inc(status=status)
+    RUN_SECONDS.observe(seconds, status=status)
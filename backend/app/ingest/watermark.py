@@ -0,0 +1,124 @@
+"""
+Per-source high-water marks, so regular ingests only fetch recent lettings.
+
+Each source has a watermark row (the latest letting it has fully ingested)
+and one ingested_lettings row per letting it has fully ingested. A regular
+run fetches the lettings after the watermark plus a re-check window before
+it, where awards are still being posted; older history is left to the
+backfill (see app.ingest.backfill).
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+import os
+import threading
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from ..models import IngestedLetting, SourceWatermark
+
+# Days before the watermark whose lettings every regular run fetches again
+INGEST_RECHECK_DAYS = int(os.getenv("INGEST_RECHECK_DAYS", "45"))
+
+
+class Watermark:
+    """
+    One source's progress through its lettings.
+
+    Loaded before a run and passed to the source's fetch, which calls
+    complete() once every record of a letting has been yielded. Completions
+    are only staged; save_watermark() writes them, and the runner calls it
+    in the run's last transaction for sources that succeeded, so a letting
+    is never recorded before its records are committed.
+    """
+
+    def __init__(self, source: str, latest: Optional[date] = None, completed: Iterable[date] = ()):
+        self.source = source
+        self.latest = latest
+        self.completed = set(completed)
+        self._staged: Dict[date, Optional[int]] = {}
+        self._lock = threading.Lock()
+
+    def complete(self, letting: date, records: Optional[int] = None):
+        """
+        Stage letting as fully ingested.
+
+        Args:
+            letting: Letting date
+            records: Records it held (added up over calls); None when its
+                pages were unchanged and not parsed, which keeps the stored count
+        """
+        with self._lock:
+            previous = self._staged.get(letting)
+            if records is None:
+                self._staged[letting] = previous
+            else:
+                self._staged[letting] = (previous or 0) + records
+
+    def staged(self) -> Dict[date, Optional[int]]:
+        """Lettings completed in this run so far, with their record counts."""
+        with self._lock:
+            return dict(self._staged)
+
+
+def load_watermark(db: Session, source: str) -> Watermark:
+    """The stored watermark of source (empty if it never completed a letting)."""
+    latest = db.execute(
+        select(SourceWatermark.latest_letting).where(SourceWatermark.source == source)
+    ).scalar()
+    completed = db.execute(
+        select(IngestedLetting.letting_date).where(IngestedLetting.source == source)
+    ).scalars().all()
+    return Watermark(source, latest, completed)
+
+
+def save_watermark(db: Session, watermark: Watermark):
+    """Write the lettings watermark completed and move its latest letting forward (the caller commits)."""
+    with watermark._lock:
+        staged, watermark._staged = watermark._staged, {}
+    if not staged:
+        return
+    insert = sqlite_insert(IngestedLetting)
+    db.execute(
+        insert.on_conflict_do_update(
+            index_elements=["source", "letting_date"],
+            set_={"records": func.coalesce(insert.excluded.records, IngestedLetting.records), "ingested_at": func.now()},
+        ),
+        [{"source": watermark.source, "letting_date": letting, "records": records} for letting, records in staged.items()],
+    )
+    watermark.completed.update(staged)
+
+    latest = max(staged)
+    if watermark.latest is None or latest > watermark.latest:
+        insert = sqlite_insert(SourceWatermark).values(source=watermark.source, latest_letting=latest)
+        db.execute(insert.on_conflict_do_update(
+            index_elements=["source"],
+            set_={"latest_letting": insert.excluded.latest_letting, "updated_at": func.now()},
+        ))
+        watermark.latest = latest
+
+
+def select_lettings(
+    discovered: Iterable[date],
+    watermark: Watermark,
+    recheck_days: int = INGEST_RECHECK_DAYS,
+) -> List[date]:
+    """
+    Lettings a regular run fetches, oldest first.
+
+    Every letting after the watermark, and those within recheck_days before
+    it. On a source's first run the window ends at the newest discovered
+    letting instead, so history is only crawled by the backfill.
+    """
+    discovered = sorted(set(discovered))
+    if not discovered:
+        return []
+    since = (watermark.latest or discovered[-1]) - timedelta(days=recheck_days)
+    return [letting for letting in discovered if letting >= since]
+
+
+def pending_lettings(discovered: Iterable[date], watermark: Watermark) -> List[date]:
+    """Discovered lettings not yet fully ingested, newest first (the backfill's to-do list)."""
+    return sorted(set(discovered) - watermark.completed, reverse=True)
@@ -0,0 +1,84 @@
+"""
+Keyword matches of scored contracts, stored as (contract, keyword id, weight) rows.
+
+Scoring used to store each contract's reasons as a JSON list of sentences,
+which could only be queried by loading and parsing every row. The matches
+now live in contract_keywords, indexed by keyword, and the reasons text is
+rendered from them when read (ContractAward.score_reasons).
+"""
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from .models import ContractKeyword, Keyword
+
+# Key of the (keyword, weight) pairs in a scored row (see KeywordScorer.score)
+MATCHES_KEY = "matches"
+
+Matches = Sequence[Tuple[str, int]]
+
+
+def keyword_ids(db: Session, keywords: Iterable[str]) -> Dict[str, int]:
+    """
+    Ids of keywords, numbering those not seen before in the order given (the caller commits).
+
+    Returns:
+        Dictionary of keyword -> id
+    """
+    keywords = list(dict.fromkeys(keywords))
+    if not keywords:
+        return {}
+    ids = dict(db.execute(select(Keyword.keyword, Keyword.id).where(Keyword.keyword.in_(keywords))).all())
+    missing = [keyword for keyword in keywords if keyword not in ids]
+    if missing:
+        db.execute(insert(Keyword.__table__), [{"keyword": keyword} for keyword in missing])
+        ids.update(db.execute(select(Keyword.keyword, Keyword.id).where(Keyword.keyword.in_(missing))).all())
+    return ids
+
+
+def replace_matches(
+    db: Session,
+    matches: Mapping[int, Matches],
+    stored_ids: Iterable[int] = (),
+    ids: Optional[Dict[str, int]] = None,
+):
+    """
+    Store the matches of scored contracts (the caller commits).
+
+    Args:
+        db: Database session
+        matches: Contract id -> (keyword, weight) pairs it matched
+        stored_ids: Contracts that may already have matches, which are
+            dropped first (the rest are known to have none)
+        ids: keyword -> id cache, filled in as keywords are looked up
+    """
+    stored_ids = list(stored_ids)
+    if stored_ids:
+        db.execute(delete(ContractKeyword).where(ContractKeyword.contract_award_id.in_(stored_ids)))
+
+    ids = {} if ids is None else ids
+    unknown = [keyword for pairs in matches.values() for keyword, _ in pairs if keyword not in ids]
+    if unknown:
+        ids.update(keyword_ids(db, unknown))
+    rows = [
+        {"contract_award_id": contract_id, "keyword_id": ids[keyword], "weight": weight}
+        for contract_id, pairs in matches.items()
+        for keyword, weight in pairs
+    ]
+    if rows:
+        db.execute(insert(ContractKeyword.__table__), rows)
+
+
+def stored_matches(db: Session, contract_ids: Iterable[int]) -> Dict[int, Tuple[Tuple[str, int], ...]]:
+    """(keyword, weight) pairs stored for each contract in contract_ids, in keyword id order."""
+    found: Dict[int, list] = {}
+    rows = db.execute(
+        select(ContractKeyword.contract_award_id, Keyword.keyword, ContractKeyword.weight)
+        .join(Keyword, Keyword.id == ContractKeyword.keyword_id)
+        .where(ContractKeyword.contract_award_id.in_(list(contract_ids)))
+        .order_by(ContractKeyword.contract_award_id, ContractKeyword.keyword_id)
+    )
+    for contract_id, keyword, weight in rows:
+        found.setdefault(contract_id, []).append((keyword, weight))
+    return {contract_id: tuple(pairs) for contract_id, pairs in found.items()}
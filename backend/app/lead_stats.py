@@ -0,0 +1,195 @@
+"""
+Lead statistics for GET /stats, kept in summary tables.
+
+Counting leads by state and status, score bucket, letting week and
+contractor by scanning contract_awards on every dashboard refresh grows
+with the table. Each count lives instead in a small summary table that
+the writes to contract_awards adjust in their own transaction: the ingest
+upsert, rescoring and lead status updates collect a LeadStatsDelta of the
+rows they change and apply it before committing, so the summaries are
+always exactly as current as the leads.
+
+rebuild_lead_stats recomputes every summary from contract_awards, for
+databases that predate the tables and as a repair.
+
+Rebuild from backend/:
+    python -m app.lead_stats
+"""
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Tuple, Union
+import argparse
+import json
+
+from sqlalchemy import text
+
+from .database import SessionLocal, init_db
+
+# Width of the score ranges counted in lead_stats_score; the tables must be
+# rebuilt after changing it
+SCORE_BUCKET_WIDTH = 5
+
+
+@dataclass(frozen=True)
+class Summary:
+    """A summary table: lead counts keyed by columns computed from each contract_awards row."""
+
+    table: str
+    columns: Tuple[str, ...]
+    # SQL computing each key column from a contract_awards row
+    expressions: Tuple[str, ...]
+    # SQL condition on the contract_awards rows counted, if not all of them
+    where: Optional[str] = None
+
+
+STATUS_SUMMARY = Summary("lead_stats_status", ("state", "status"), ("state", "status"))
+SCORE_SUMMARY = Summary(
+    "lead_stats_score", ("bucket",), (f"(coalesce(score, 0) / {SCORE_BUCKET_WIDTH}) * {SCORE_BUCKET_WIDTH}",)
+)
+# Weeks start on Monday: the next Sunday (or the day itself), less six days
+WEEKLY_SUMMARY = Summary("lead_stats_weekly", ("week",), ("date(letting_date, 'weekday 0', '-6 days')",))
+CONTRACTOR_SUMMARY = Summary(
+    "lead_stats_contractors", ("contractor_id",), ("contractor_id",), where="contractor_id IS NOT NULL"
+)
+
+SUMMARIES = (STATUS_SUMMARY, SCORE_SUMMARY, WEEKLY_SUMMARY, CONTRACTOR_SUMMARY)
+
+
+def score_bucket(score: int) -> int:
+    """Lowest score of the SCORE_BUCKET_WIDTH-wide range score falls in."""
+    return (score or 0) // SCORE_BUCKET_WIDTH * SCORE_BUCKET_WIDTH
+
+
+def letting_week(letting_date: Union[date, str]) -> str:
+    """ISO date of the Monday starting the week of letting_date (a date or ISO string)."""
+    if isinstance(letting_date, str):
+        letting_date = date.fromisoformat(letting_date[:10])
+    return (letting_date - timedelta(days=letting_date.weekday())).isoformat()
+
+
+class LeadStatsDelta:
+    """Changes to the summary counts from a batch of writes, applied in the writer's transaction."""
+
+    def __init__(self):
+        self.counts: Dict[str, Counter] = {summary.table: Counter() for summary in SUMMARIES}
+
+    def add(self, state: str, status, score: int, letting_date: Union[date, str], contractor_id: Optional[int],
+            leads: int = 1):
+        """
+        Count a lead with these values (leads=-1 uncounts one).
+
+        Args:
+            status: ContractStatus of the lead
+            contractor_id: Its contractor, None if not linked to one
+        """
+        self.counts[STATUS_SUMMARY.table][(state, status.name)] += leads
+        self.counts[SCORE_SUMMARY.table][(score_bucket(score),)] += leads
+        self.counts[WEEKLY_SUMMARY.table][(letting_week(letting_date),)] += leads
+        if contractor_id is not None:
+            self.counts[CONTRACTOR_SUMMARY.table][(contractor_id,)] += leads
+
+    def remove(self, state: str, status, score: int, letting_date: Union[date, str], contractor_id: Optional[int]):
+        """Uncount a lead with these values, e.g. the old version of an updated row."""
+        self.add(state, status, score, letting_date, contractor_id, leads=-1)
+
+    def apply(self, db):
+        """
+        Add the counts to the summary tables (the caller commits) and reset them.
+
+        One executemany per summary whose counts changed, plus one DELETE of
+        the keys no lead has any more.
+        """
+        for summary in SUMMARIES:
+            changed = {key: leads for key, leads in self.counts[summary.table].items() if leads}
+            if not changed:
+                continue
+            columns = ", ".join(summary.columns)
+            db.execute(
+                text(
+                    f"INSERT INTO {summary.table} ({columns}, leads) "
+                    f"VALUES ({', '.join(':' + column for column in summary.columns)}, :leads) "
+                    f"ON CONFLICT ({columns}) DO UPDATE SET leads = leads + excluded.leads"
+                ),
+                [{**dict(zip(summary.columns, key)), "leads": leads} for key, leads in changed.items()],
+            )
+            emptied = [dict(zip(summary.columns, key)) for key, leads in changed.items() if leads < 0]
+            if emptied:
+                db.execute(
+                    text(
+                        f"DELETE FROM {summary.table} WHERE leads <= 0 AND "
+                        + " AND ".join(f"{column} = :{column}" for column in summary.columns)
+                    ),
+                    emptied,
+                )
+            self.counts[summary.table].clear()
+
+
+def rebuild_lead_stats(db, summaries: Iterable[Summary] = SUMMARIES):
+    """Recompute summary tables (by default all of them) from contract_awards (the caller commits)."""
+    for summary in summaries:
+        expressions = ", ".join(summary.expressions)
+        where = f" WHERE {summary.where}" if summary.where else ""
+        db.execute(text(f"DELETE FROM {summary.table}"))
+        db.execute(text(
+            f"INSERT INTO {summary.table} ({', '.join(summary.columns)}, leads) "
+            f"SELECT {expressions}, count(*) FROM contract_awards{where} GROUP BY {expressions}"
+        ))
+
+
+def read_lead_stats(db, weeks: int, top: int) -> Dict:
+    """
+    The summaries as GET /stats returns them.
+
+    Args:
+        db: Database session
+        weeks: Number of most recent letting weeks to return
+        top: Number of contractors to return, most leads first
+
+    Returns:
+        Dictionary with 'total', 'by_state_status' (status as the stored
+        ContractStatus name), 'score_buckets', 'weekly' (oldest first) and
+        'top_contractors'
+    """
+    by_state_status = db.execute(text(
+        "SELECT state, status, leads FROM lead_stats_status ORDER BY state, status"
+    )).mappings().all()
+    buckets = db.execute(text("SELECT bucket, leads FROM lead_stats_score ORDER BY bucket")).all()
+    weekly = db.execute(
+        text("SELECT week, leads FROM lead_stats_weekly ORDER BY week DESC LIMIT :weeks"), {"weeks": weeks}
+    ).mappings().all()
+    contractors = db.execute(
+        text(
+            "SELECT s.contractor_id, c.name, s.leads FROM lead_stats_contractors s "
+            "JOIN contractors c ON c.id = s.contractor_id ORDER BY s.leads DESC, s.contractor_id LIMIT :top"
+        ),
+        {"top": top},
+    ).mappings().all()
+    return {
+        "total": sum(row["leads"] for row in by_state_status),
+        "by_state_status": [dict(row) for row in by_state_status],
+        "score_buckets": [
+            {"min_score": bucket, "max_score": bucket + SCORE_BUCKET_WIDTH - 1, "leads": leads}
+            for bucket, leads in buckets
+        ],
+        "weekly": [dict(row) for row in reversed(weekly)],
+        "top_contractors": [dict(row) for row in contractors],
+    }
+
+
+def main():
+    argparse.ArgumentParser(description="Recompute the GET /stats summary tables from contract_awards.").parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        rebuild_lead_stats(db)
+        db.commit()
+        result = read_lead_stats(db, weeks=0, top=0)
+    finally:
+        db.close()
+    print(json.dumps({"total": result["total"], "by_state_status": result["by_state_status"]}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
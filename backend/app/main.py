@@ -1,7 +1,9 @@
 """FastAPI main application."""
 from fastapi import FastAPI
-from .database import init_db
+from .database import SessionLocal, init_db
 from .api.routes import router
+from .ingest.scheduler import INGEST_SCHEDULER_ENABLED, IngestScheduler
+from .metrics import RequestLatencyMiddleware
 
 app = FastAPI(
     title="Dump Truck Contract Finder API",
@@ -12,11 +14,23 @@ app = FastAPI(
 # Include routers
 app.include_router(router, prefix="", tags=["api"])
 
+app.add_middleware(RequestLatencyMiddleware)
+
+scheduler = IngestScheduler(SessionLocal)
+
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on application startup."""
+    """Initialize database and start the ingest scheduler on application startup."""
     init_db()
+    if INGEST_SCHEDULER_ENABLED:
+        scheduler.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop scheduling ingests (a running one is left to finish or be abandoned)."""
+    scheduler.stop(timeout=5)
 
 
 @app.get("/")
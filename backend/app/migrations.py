@@ -0,0 +1,652 @@
+"""
+Versioned schema migrations for the SQLite database.
+
+A migration must keep doing what it did when it was written, however the
+app changes later, so migrations do not import app logic: what one needs
+(a hash, a parser, a keyword table) is copied in next to it, frozen at
+that version.
+"""
+from collections import Counter, defaultdict
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import unicodedata
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+
+def _add_column(conn: Connection, table: str, column: str, ddl: str):
+    """ALTER TABLE ... ADD COLUMN unless create_all() already made the column."""
+    existing = {c["name"] for c in inspect(conn).get_columns(table)}
+    if column not in existing:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def _unique_contract_key(conn: Connection):
+    """Unique (state, contract_id), keeping the newest row of any duplicated key."""
+    existing = {ix["name"] for ix in inspect(conn).get_indexes("contract_awards")}
+    if "uq_contract_awards_state_contract_id" in existing:
+        return
+    removed = conn.execute(text(
+        "DELETE FROM contract_awards WHERE id NOT IN "
+        "(SELECT MAX(id) FROM contract_awards GROUP BY state, contract_id)"
+    )).rowcount
+    if removed:
+        logger.warning(
+            "Removed %d duplicate contract_awards row(s) sharing a (state, contract_id), "
+            "keeping the newest of each", removed,
+        )
+    conn.execute(text(
+        "CREATE UNIQUE INDEX uq_contract_awards_state_contract_id "
+        "ON contract_awards (state, contract_id)"
+    ))
+
+
+def _leads_composite_indexes(conn: Connection):
+    """Replace single-column indexes with ones matching the GET /leads query shapes."""
+    # ix_contract_awards_score is rebuilt because the old one was ascending
+    for name in (
+        "ix_contract_awards_state",
+        "ix_contract_awards_status",
+        "ix_contract_awards_contract_id",
+        "ix_contract_awards_score",
+    ):
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    for ddl in (
+        "ix_contract_awards_score ON contract_awards (score DESC)",
+        "ix_contract_awards_state_score ON contract_awards (state, score DESC)",
+        "ix_contract_awards_status_score ON contract_awards (status, score DESC)",
+        "ix_contract_awards_state_status_score ON contract_awards (state, status, score DESC)",
+    ):
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {ddl}"))
+
+
+def _score_version(conn: Connection):
+    """Track which scoring rules produced each row's score; existing rows start unversioned."""
+    _add_column(conn, "contract_awards", "score_version", "VARCHAR(16)")
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_contract_awards_score_version "
+        "ON contract_awards (score_version)"
+    ))
+
+
+# Searchable text of contract_awards, indexed by FTS5 as an external-content
+# table (the text itself is only stored once, in contract_awards)
+FTS_COLUMNS = ("description", "awarded_to", "contract_id")
+
+
+def _contract_search_index(conn: Connection):
+    """FTS5 index for GET /leads/search, kept in sync with contract_awards by triggers."""
+    columns = ", ".join(FTS_COLUMNS)
+    new_values = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+    old_values = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS contract_awards_fts USING fts5("
+        f"{columns}, content='contract_awards', content_rowid='id', tokenize='porter unicode61')"
+    ))
+    # Status and score updates do not touch the indexed columns, so they skip the index
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS contract_awards_fts_insert AFTER INSERT ON contract_awards BEGIN "
+        f"INSERT INTO contract_awards_fts (rowid, {columns}) VALUES (new.id, {new_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS contract_awards_fts_delete AFTER DELETE ON contract_awards BEGIN "
+        f"INSERT INTO contract_awards_fts (contract_awards_fts, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS contract_awards_fts_update AFTER UPDATE OF {columns} ON contract_awards BEGIN "
+        f"INSERT INTO contract_awards_fts (contract_awards_fts, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO contract_awards_fts (rowid, {columns}) VALUES (new.id, {new_values}); END"
+    ))
+    # Index the rows that already exist
+    conn.execute(text("INSERT INTO contract_awards_fts (contract_awards_fts) VALUES ('rebuild')"))
+
+
+def _data_version(conn: Connection):
+    """Counter that invalidates cached GET /leads responses."""
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS data_version "
+        "(id INTEGER NOT NULL, version INTEGER NOT NULL, PRIMARY KEY (id))"
+    ))
+    conn.execute(text("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)"))
+
+
+def _ingest_runs(conn: Connection):
+    """Per-run ingest summaries."""
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS ingest_runs ("
+        "id INTEGER NOT NULL, "
+        "status VARCHAR(16) NOT NULL, "
+        "started_at DATETIME NOT NULL, "
+        "finished_at DATETIME NOT NULL, "
+        "duration_seconds FLOAT NOT NULL, "
+        "counts TEXT NOT NULL, "
+        "summary TEXT NOT NULL, "
+        "error TEXT, "
+        "PRIMARY KEY (id))"
+    ))
+
+
+def _frozen_row_hash(values: Sequence[Any]) -> str:
+    """row_hash.row_hash as migrations 7 and 10 were written against."""
+    def encode(value: Any) -> str:
+        if value is None:
+            return "\x00"
+        if isinstance(value, date):
+            return value.isoformat()
+        return value if type(value) is str else repr(value)
+
+    return hashlib.blake2b("\x1f".join(map(encode, values)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+# row_hash.HASHED_COLUMNS at migration 7
+_V7_HASHED_COLUMNS = ("letting_date", "awarded_to", "description", "amount", "source_url", "score", "score_reasons")
+
+
+def _content_hash(conn: Connection, batch_size: int = 5000):
+    """Hash of each row's ingested columns, backfilled so the next ingest can skip unchanged rows, and an updated_at index."""
+    _add_column(conn, "contract_awards", "content_hash", "VARCHAR(32)")
+    # updated_at now only moves when a row really changes, so it is worth filtering on
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_contract_awards_updated_at ON contract_awards (updated_at)"
+    ))
+    existing = {c["name"] for c in inspect(conn).get_columns("contract_awards")}
+    if not existing.issuperset(_V7_HASHED_COLUMNS):
+        # Built by create_all() at a later schema: the app hashes its rows itself
+        return
+    columns = ", ".join(_V7_HASHED_COLUMNS)
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            f"SELECT id, {columns} FROM contract_awards "
+            f"WHERE id > :last_id AND content_hash IS NULL ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": batch_size}).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        conn.execute(
+            text("UPDATE contract_awards SET content_hash = :content_hash WHERE id = :id"),
+            [{"id": row[0], "content_hash": _frozen_row_hash(row[1:])} for row in rows],
+        )
+
+
+def _watermarks(conn: Connection):
+    """Per-source high-water mark and the lettings each source has fully ingested."""
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS source_watermarks ("
+        "source VARCHAR(32) NOT NULL, "
+        "latest_letting DATE, "
+        "updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP), "
+        "PRIMARY KEY (source))"
+    ))
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS ingested_lettings ("
+        "source VARCHAR(32) NOT NULL, "
+        "letting_date DATE NOT NULL, "
+        "records INTEGER, "
+        "ingested_at DATETIME DEFAULT (CURRENT_TIMESTAMP), "
+        "PRIMARY KEY (source, letting_date))"
+    ))
+
+
+# amount.AMOUNT_PATTERN and multipliers at migration 9
+_V9_AMOUNT_PATTERN = re.compile(
+    r"^\s*(\()?\s*(?:USD|US\$|\$)?\s*(-)?\s*\$?\s*"
+    r"(\d{1,3}(?:,\d{3})+|\d+)?(\.\d+)?\s*"
+    r"(k|thousand|m|mil|million|b|billion)?\s*(?:USD)?\s*(\))?\s*$",
+    re.IGNORECASE,
+)
+_V9_MULTIPLIERS = {
+    None: 1, "k": 1_000, "thousand": 1_000, "m": 1_000_000, "mil": 1_000_000, "million": 1_000_000,
+    "b": 1_000_000_000, "billion": 1_000_000_000,
+}
+
+
+def _v9_amount_cents(raw: Any) -> Optional[int]:
+    """amount.parse_amount_cents as migration 9 was written against."""
+    if raw is None:
+        return None
+    if isinstance(raw, (int, float, Decimal)):
+        raw = str(raw)
+    match = _V9_AMOUNT_PATTERN.match(raw)
+    if match is None:
+        return None
+    opening, minus, whole, fraction, suffix, closing = match.groups()
+    if whole is None and fraction is None:
+        return None
+    if bool(opening) != bool(closing):
+        return None
+    try:
+        value = Decimal((whole or "0").replace(",", "") + (fraction or ""))
+    except InvalidOperation:
+        return None
+    multiplier = _V9_MULTIPLIERS[suffix.lower() if suffix else None]
+    cents = int((value * multiplier * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    return -cents if (minus or opening) else cents
+
+
+def _amount_cents(conn: Connection, batch_size: int = 5000):
+    """Integer-cents amount column and its GET /leads indexes, backfilled from the raw amount strings."""
+    _add_column(conn, "contract_awards", "amount_cents", "INTEGER")
+    for ddl in (
+        "ix_contract_awards_amount ON contract_awards (amount_cents DESC)",
+        "ix_contract_awards_state_amount ON contract_awards (state, amount_cents DESC)",
+        "ix_contract_awards_status_amount ON contract_awards (status, amount_cents DESC)",
+        "ix_contract_awards_state_status_amount ON contract_awards (state, status, amount_cents DESC)",
+    ):
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {ddl}"))
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, amount FROM contract_awards "
+            "WHERE id > :last_id AND amount IS NOT NULL AND amount_cents IS NULL ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": batch_size}).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        parsed = [{"id": row[0], "amount_cents": _v9_amount_cents(row[1])} for row in rows]
+        parsed = [row for row in parsed if row["amount_cents"] is not None]
+        if parsed:
+            conn.execute(text("UPDATE contract_awards SET amount_cents = :amount_cents WHERE id = :id"), parsed)
+
+
+# scoring.KEYWORD_WEIGHTS keywords and row_hash.HASHED_COLUMNS at migration 10
+_V10_KEYWORDS = (
+    "dump truck", "dumptruck", "dump-truck", "hauling", "haul", "earthwork", "excavation", "grading",
+    "fill", "aggregate", "gravel", "stone", "sand", "material hauling", "trucking", "transport",
+)
+_V10_HASHED_COLUMNS = ("letting_date", "awarded_to", "description", "amount", "source_url", "score")
+
+# A keyword reason in the score_reasons text scoring used to store
+LEGACY_REASON_PATTERN = re.compile(r"^Matched keyword '(.*)' \(\+(-?\d+) points\)$")
+
+
+def _keyword_matches(conn: Connection, batch_size: int = 5000):
+    """Move score_reasons JSON text into the indexed keywords/contract_keywords tables."""
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS keywords ("
+        "id INTEGER NOT NULL, "
+        "keyword VARCHAR NOT NULL, "
+        "PRIMARY KEY (id), "
+        "UNIQUE (keyword))"
+    ))
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS contract_keywords ("
+        "contract_award_id INTEGER NOT NULL, "
+        "keyword_id INTEGER NOT NULL, "
+        "weight INTEGER NOT NULL, "
+        "PRIMARY KEY (contract_award_id, keyword_id), "
+        "FOREIGN KEY(contract_award_id) REFERENCES contract_awards (id), "
+        "FOREIGN KEY(keyword_id) REFERENCES keywords (id)"
+        ") WITHOUT ROWID"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_contract_keywords_keyword "
+        "ON contract_keywords (keyword_id, contract_award_id)"
+    ))
+    # Foreign keys are not enforced, so deleted contracts drop their matches here
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS contract_keywords_delete AFTER DELETE ON contract_awards BEGIN "
+        "DELETE FROM contract_keywords WHERE contract_award_id = old.id; END"
+    ))
+
+    existing = {c["name"] for c in inspect(conn).get_columns("contract_awards")}
+    if "score_reasons" not in existing:
+        return
+
+    # Number the current keywords first, in the order reasons list them
+    insert_keyword = text("INSERT OR IGNORE INTO keywords (keyword) VALUES (:keyword)")
+    conn.execute(insert_keyword, [{"keyword": keyword} for keyword in _V10_KEYWORDS])
+    ids = dict(conn.execute(text("SELECT keyword, id FROM keywords")).all())
+
+    columns = ", ".join(_V10_HASHED_COLUMNS)
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            f"SELECT id, score_reasons, {columns} FROM contract_awards "
+            f"WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": batch_size}).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        matches = []
+        for row in rows:
+            for reason in json.loads(row[1]) if row[1] else ():
+                match = LEGACY_REASON_PATTERN.match(reason)
+                if match:
+                    matches.append((row[0], match.group(1), int(match.group(2))))
+        unknown = [{"keyword": keyword} for keyword in dict.fromkeys(m[1] for m in matches) if keyword not in ids]
+        if unknown:
+            conn.execute(insert_keyword, unknown)
+            ids = dict(conn.execute(text("SELECT keyword, id FROM keywords")).all())
+        if matches:
+            conn.execute(
+                text("INSERT OR IGNORE INTO contract_keywords (contract_award_id, keyword_id, weight) "
+                     "VALUES (:contract_award_id, :keyword_id, :weight)"),
+                [{"contract_award_id": row_id, "keyword_id": ids[keyword], "weight": weight}
+                 for row_id, keyword, weight in matches],
+            )
+        # The hash no longer covers score_reasons
+        conn.execute(
+            text("UPDATE contract_awards SET content_hash = :content_hash WHERE id = :id"),
+            [{"id": row[0], "content_hash": _frozen_row_hash(row[2:])} for row in rows],
+        )
+
+    conn.execute(text("ALTER TABLE contract_awards DROP COLUMN score_reasons"))
+
+
+def _lead_stats(conn: Connection):
+    """Summary tables behind GET /stats, filled from the existing leads."""
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS lead_stats_status ("
+        "state VARCHAR(2) NOT NULL, "
+        "status VARCHAR(9) NOT NULL, "
+        "leads INTEGER NOT NULL, "
+        "PRIMARY KEY (state, status))"
+    ))
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS lead_stats_score ("
+        "bucket INTEGER NOT NULL, "
+        "leads INTEGER NOT NULL, "
+        "PRIMARY KEY (bucket))"
+    ))
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS lead_stats_weekly ("
+        "week DATE NOT NULL, "
+        "leads INTEGER NOT NULL, "
+        "PRIMARY KEY (week))"
+    ))
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS lead_stats_contractors ("
+        "awarded_to VARCHAR NOT NULL, "
+        "leads INTEGER NOT NULL, "
+        "PRIMARY KEY (awarded_to))"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_lead_stats_contractors_leads "
+        "ON lead_stats_contractors (leads DESC, awarded_to)"
+    ))
+    # lead_stats.rebuild_lead_stats at migration 11 (score buckets 5 wide, weeks
+    # starting on Monday). The contractor counts are keyed by contractor since
+    # migration 12, which builds them.
+    for table, columns, expressions in (
+        ("lead_stats_status", "state, status", "state, status"),
+        ("lead_stats_score", "bucket", "(coalesce(score, 0) / 5) * 5"),
+        ("lead_stats_weekly", "week", "date(letting_date, 'weekday 0', '-6 days')"),
+    ):
+        conn.execute(text(f"DELETE FROM {table}"))
+        conn.execute(text(
+            f"INSERT INTO {table} ({columns}, leads) "
+            f"SELECT {expressions}, count(*) FROM contract_awards GROUP BY {expressions}"
+        ))
+
+
+# contractors.py at migration 12: canonical names, and the known contractor
+# whose canonical name has the most similar character trigrams (Dice
+# coefficient) at or above the match threshold
+_V12_LEGAL_SUFFIXES = {
+    "INC", "INCORPORATED", "LLC", "LC", "LLP", "LP", "PLLC", "PC", "PSC",
+    "CO", "COMPANY", "CORP", "CORPORATION", "LTD", "LIMITED",
+}
+_V12_JOINED = re.compile(r"[.'’]")
+_V12_SEPARATORS = re.compile(r"[^A-Z0-9]+")
+
+
+def _v12_canonical_name(raw: str) -> str:
+    """contractors.canonical_name as migration 12 was written against."""
+    name = unicodedata.normalize("NFKD", raw or "").encode("ascii", "ignore").decode().upper()
+    name = _V12_SEPARATORS.sub(" ", _V12_JOINED.sub("", name.replace("&", " AND "))).split()
+    tokens: List[str] = []
+    initials = False
+    for token in name:
+        if token.isalpha() and len(token) == 1 and initials:
+            tokens[-1] += token
+        else:
+            tokens.append(token)
+            initials = token.isalpha() and len(token) == 1
+    while len(tokens) > 1 and tokens[-1] in _V12_LEGAL_SUFFIXES:
+        tokens.pop()
+    if len(tokens) > 1 and tokens[0] == "THE":
+        tokens.pop(0)
+    return " ".join(tokens) or (raw or "").strip().upper()
+
+
+def _v12_trigrams(canonical: str) -> FrozenSet[str]:
+    padded = f" {canonical} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class _V12ContractorIndex:
+    """contractors.ContractorIndex as migration 12 was written against."""
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.contractors: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._grams: List[FrozenSet[str]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+    def add(self, canonical: str, contractor_id: int):
+        if canonical in self.contractors:
+            return
+        self.contractors[canonical] = contractor_id
+        grams = _v12_trigrams(canonical)
+        for gram in grams:
+            self._postings[gram].append(len(self._names))
+        self._names.append(canonical)
+        self._grams.append(grams)
+
+    def match(self, canonical: str) -> Optional[int]:
+        if canonical in self.contractors:
+            return self.contractors[canonical]
+        grams = _v12_trigrams(canonical)
+        n, t = len(grams), self.threshold
+        min_overlap = max(1, math.ceil(t * n / (2 - t) - 1e-9))
+        probes = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))[:n - min_overlap + 1]
+        shared = Counter()
+        for gram in probes:
+            shared.update(self._postings.get(gram, ()))
+        unprobed = n - len(probes)
+        best, best_score = None, t
+        for position in sorted(shared):
+            other = self._grams[position]
+            if 2 * (shared[position] + unprobed) < t * (n + len(other)) - 1e-9:
+                continue
+            score = 2 * len(grams & other) / (n + len(other)) if grams or other else 1.0
+            if score > best_score or (score == best_score and best is None):
+                best, best_score = position, score
+        return None if best is None else self.contractors[self._names[best]]
+
+
+def _v12_link_contractors(conn: Connection):
+    """contractors.link_contract_contractors as migration 12 was written against."""
+    index = _V12ContractorIndex(float(os.getenv("CONTRACTOR_MATCH_THRESHOLD", "0.8")))
+    for canonical, contractor_id in conn.execute(text(
+        "SELECT canonical_name, contractor_id FROM contractor_aliases ORDER BY rowid"
+    )):
+        index.add(canonical, contractor_id)
+    known = set(conn.execute(text("SELECT awarded_to FROM contractor_aliases")).scalars())
+    names = conn.execute(text(
+        "SELECT awarded_to FROM contract_awards WHERE contractor_id IS NULL "
+        "GROUP BY awarded_to ORDER BY min(id)"
+    )).scalars().all()
+
+    aliases = []
+    for name in names:
+        if name in known:
+            continue
+        known.add(name)
+        canonical = _v12_canonical_name(name)
+        contractor_id = index.match(canonical)
+        if contractor_id is None:
+            # A new contractor is named after the first raw name that created it
+            contractor_id = conn.execute(
+                text("INSERT INTO contractors (name, canonical_name) VALUES (:name, :canonical) "
+                     "ON CONFLICT (canonical_name) DO UPDATE SET canonical_name = excluded.canonical_name "
+                     "RETURNING id"),
+                {"name": name, "canonical": canonical},
+            ).scalar()
+        index.add(canonical, contractor_id)
+        aliases.append({"awarded_to": name, "contractor_id": contractor_id, "canonical_name": canonical})
+    if aliases:
+        conn.execute(
+            text("INSERT INTO contractor_aliases (awarded_to, contractor_id, canonical_name) "
+                 "VALUES (:awarded_to, :contractor_id, :canonical_name) ON CONFLICT (awarded_to) DO NOTHING"),
+            aliases,
+        )
+    conn.execute(text(
+        "UPDATE contract_awards SET contractor_id = "
+        "(SELECT contractor_id FROM contractor_aliases a WHERE a.awarded_to = contract_awards.awarded_to) "
+        "WHERE contractor_id IS NULL"
+    ))
+
+
+def _contractors(conn: Connection):
+    """Contractor entities, every lead linked to one, and contractor lead counts keyed by them."""
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS contractors ("
+        "id INTEGER NOT NULL, "
+        "name VARCHAR NOT NULL, "
+        "canonical_name VARCHAR NOT NULL, "
+        "PRIMARY KEY (id), "
+        "UNIQUE (canonical_name))"
+    ))
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS contractor_aliases ("
+        "awarded_to VARCHAR NOT NULL, "
+        "contractor_id INTEGER NOT NULL, "
+        "canonical_name VARCHAR NOT NULL, "
+        "PRIMARY KEY (awarded_to), "
+        "FOREIGN KEY(contractor_id) REFERENCES contractors (id))"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_contractor_aliases_contractor_id ON contractor_aliases (contractor_id)"
+    ))
+    _add_column(conn, "contract_awards", "contractor_id", "INTEGER REFERENCES contractors (id)")
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_contract_awards_contractor_id ON contract_awards (contractor_id)"
+    ))
+    _v12_link_contractors(conn)
+
+    existing = {c["name"] for c in inspect(conn).get_columns("lead_stats_contractors")}
+    if "contractor_id" not in existing:
+        conn.execute(text("DROP TABLE lead_stats_contractors"))
+        conn.execute(text(
+            "CREATE TABLE lead_stats_contractors ("
+            "contractor_id INTEGER NOT NULL, "
+            "leads INTEGER NOT NULL, "
+            "PRIMARY KEY (contractor_id), "
+            "FOREIGN KEY(contractor_id) REFERENCES contractors (id))"
+        ))
+        conn.execute(text(
+            "CREATE INDEX ix_lead_stats_contractors_leads ON lead_stats_contractors (leads DESC, contractor_id)"
+        ))
+    conn.execute(text("DELETE FROM lead_stats_contractors"))
+    conn.execute(text(
+        "INSERT INTO lead_stats_contractors (contractor_id, leads) "
+        "SELECT contractor_id, count(*) FROM contract_awards WHERE contractor_id IS NOT NULL GROUP BY contractor_id"
+    ))
+
+
+def _ingest_scheduler(conn: Connection):
+    """Leases (one ingesting process at a time) and the scheduler's per-source state."""
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS leases ("
+        "name VARCHAR(32) NOT NULL, "
+        "holder VARCHAR NOT NULL, "
+        "expires_at FLOAT NOT NULL, "
+        "PRIMARY KEY (name))"
+    ))
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS ingest_schedule ("
+        "source VARCHAR(32) NOT NULL, "
+        "next_run_at FLOAT NOT NULL, "
+        "failures INTEGER NOT NULL, "
+        "last_status VARCHAR(16), "
+        "last_run_at FLOAT, "
+        "PRIMARY KEY (source))"
+    ))
+
+
+# (version, description, upgrade) in order. Upgrades must tolerate running on
+# a database that create_all() just built at the latest schema, and must be
+# safe to re-run: pysqlite commits DDL immediately, so a migration that
+# fails part-way is retried from the start on the next init_db().
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "unique (state, contract_id) key", _unique_contract_key),
+    (2, "composite indexes for GET /leads", _leads_composite_indexes),
+    (3, "contract_awards.score_version", _score_version),
+    (4, "FTS5 search index over contract text", _contract_search_index),
+    (5, "data_version counter", _data_version),
+    (6, "ingest_runs summaries", _ingest_runs),
+    (7, "contract_awards.content_hash", _content_hash),
+    (8, "source_watermarks and ingested_lettings", _watermarks),
+    (9, "contract_awards.amount_cents", _amount_cents),
+    (10, "keyword matches table replacing score_reasons text", _keyword_matches),
+    (11, "lead_stats summary tables for GET /stats", _lead_stats),
+    (12, "contractors, contract_awards.contractor_id and contractor lead counts", _contractors),
+    (13, "leases and ingest_schedule", _ingest_scheduler),
+]
+
+
+# Oldest SQLite library the migrations run on: 3.35 added ALTER TABLE ... DROP COLUMN (migration 10)
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+
+def check_sqlite_version(version: Optional[Tuple[int, ...]] = None):
+    """
+    Fail early if the SQLite library is too old for the migrations.
+
+    Args:
+        version: Library version to check (defaults to the one sqlite3 is linked against)
+
+    Raises:
+        RuntimeError: If version is older than MIN_SQLITE_VERSION
+    """
+    version = tuple(version or sqlite3.sqlite_version_info)
+    if version < MIN_SQLITE_VERSION:
+        raise RuntimeError(
+            f"SQLite {'.'.join(map(str, version))} is too old: the schema migrations need "
+            f"{'.'.join(map(str, MIN_SQLITE_VERSION))} or newer (ALTER TABLE ... DROP COLUMN). "
+            f"Upgrade the SQLite library Python's sqlite3 module is linked against."
+        )
+
+
+def schema_version(conn: Connection) -> int:
+    """Schema version recorded in the database (PRAGMA user_version)."""
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+
+def migrate(engine: Engine) -> int:
+    """
+    Apply pending migrations, each in its own transaction.
+
+    Returns:
+        The schema version after migrating
+
+    Raises:
+        RuntimeError: If the SQLite library is too old (see check_sqlite_version)
+    """
+    check_sqlite_version()
+    with engine.connect() as conn:
+        version = schema_version(conn)
+    for number, description, upgrade in MIGRATIONS:
+        if number <= version:
+            continue
+        with engine.begin() as conn:
+            upgrade(conn)
+            conn.execute(text(f"PRAGMA user_version = {number}"))
+        version = number
+    return version
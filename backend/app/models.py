@@ -1,6 +1,10 @@
 """SQLAlchemy database models."""
-from sqlalchemy import Column, Integer, String, Date, Enum, Text, JSON, DateTime
+from sqlalchemy import (
+    Column, Integer, Float, String, Date, Enum, Text, JSON, DateTime, ForeignKey, Index, MetaData, Table,
+    case, cast, literal, select,
+)
 from sqlalchemy.dialects.sqlite import JSON as SQLiteJSON
+from sqlalchemy.orm import column_property
 from sqlalchemy.sql import func
 import enum
 import uuid
@@ -18,21 +22,252 @@ class ContractStatus(str, enum.Enum):
 class ContractAward(Base):
     """Contract award model."""
     __tablename__ = "contract_awards"
+    __table_args__ = (
+        # Natural key used by the ingest upsert (ON CONFLICT target)
+        Index("uq_contract_awards_state_contract_id", "state", "contract_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    state = Column(String(2), nullable=False, index=True)  # "KY" or "IN"
+    state = Column(String(2), nullable=False)  # "KY" or "IN"
     letting_date = Column(Date, nullable=False, index=True)
-    contract_id = Column(String, nullable=False, index=True)
+    contract_id = Column(String, nullable=False)
     awarded_to = Column(String, nullable=False)
     description = Column(Text, nullable=False)
-    amount = Column(String, nullable=True)  # Stored as string to handle various formats
+    amount = Column(String, nullable=True)  # As the source published it
+    amount_cents = Column(Integer, nullable=True)  # amount parsed by app.amount; None if unparseable
+    contractor_id = Column(Integer, ForeignKey("contractors.id"), nullable=True, index=True)  # awarded_to resolved by app.contractors
     source_url = Column(String, nullable=False)
-    score = Column(Integer, default=0, index=True)
-    score_reasons = Column(Text, nullable=True)  # JSON stored as text
-    status = Column(Enum(ContractStatus), default=ContractStatus.NEW, index=True)
+    score = Column(Integer, default=0)
+    # score_reasons is rendered from contract_keywords (see below)
+    score_version = Column(String(16), nullable=True, index=True)  # KeywordScorer.fingerprint that produced score
+    content_hash = Column(String(32), nullable=True)  # row_hash of the ingested columns (see app.row_hash)
+    status = Column(Enum(ContractStatus), default=ContractStatus.NEW)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
 
     def __repr__(self):
         return f"<ContractAward(id={self.id}, contract_id={self.contract_id}, state={self.state}, score={self.score})>"
 
+
+class Contractor(Base):
+    """A company, under whichever of its published names (see app.contractors)."""
+    __tablename__ = "contractors"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)  # First raw awarded_to it was created for
+    canonical_name = Column(String, nullable=False, unique=True)
+
+
+class ContractorAlias(Base):
+    """A raw awarded_to name and the contractor it resolved to."""
+    __tablename__ = "contractor_aliases"
+
+    awarded_to = Column(String, primary_key=True)
+    contractor_id = Column(Integer, ForeignKey("contractors.id"), nullable=False, index=True)
+    canonical_name = Column(String, nullable=False)
+
+
+class Keyword(Base):
+    """A scoring keyword, numbered the first time any scoring rules use it."""
+    __tablename__ = "keywords"
+
+    id = Column(Integer, primary_key=True)
+    keyword = Column(String, nullable=False, unique=True)
+
+
+class ContractKeyword(Base):
+    """A keyword a contract matched when it was last scored, and the weight it scored."""
+    __tablename__ = "contract_keywords"
+    __table_args__ = (
+        # "Which leads matched X": a search on keyword_id, already in contract order
+        Index("ix_contract_keywords_keyword", "keyword_id", "contract_award_id"),
+        {"sqlite_with_rowid": False},
+    )
+
+    contract_award_id = Column(Integer, ForeignKey("contract_awards.id"), primary_key=True)
+    keyword_id = Column(Integer, ForeignKey("keywords.id"), primary_key=True)
+    weight = Column(Integer, nullable=False)
+
+
+def _score_reasons():
+    """
+    SQL rendering of a contract's matches as the JSON reasons list scoring used to store.
+
+    Gives the same text as scoring.render_score_reasons for the matches in
+    keyword id order, as keyword_matches.stored_matches returns them.
+    Keywords are numbered the first time any scoring rules use them, so
+    that is KEYWORD_WEIGHTS order except that a keyword added to the table
+    later is listed after the ones numbered before it. The multiple-keyword
+    bonus is whatever the score holds beyond the matched weights. NULL when
+    nothing matched.
+    """
+    matched = ContractKeyword.__table__
+    keywords = Keyword.__table__
+    reason = func.json_quote(
+        literal("Matched keyword '") + keywords.c.keyword + "' (+" + cast(matched.c.weight, Text) + " points)"
+    )
+    # group_concat has no ORDER BY before SQLite 3.44; it concatenates an
+    # ordered subquery in that order (SQLite does not flatten it into an aggregate)
+    ordered = (
+        select(reason.label("reason"), matched.c.weight)
+        .select_from(matched.join(keywords, keywords.c.id == matched.c.keyword_id))
+        .where(matched.c.contract_award_id == ContractAward.id)
+        .order_by(matched.c.keyword_id)
+        .correlate(ContractAward)
+        .subquery()
+    )
+    bonus = ContractAward.score - func.sum(ordered.c.weight)
+    bonus_reason = case(
+        (bonus > 0, ", " + func.json_quote("Multiple relevant keywords bonus (+" + cast(bonus, Text) + " points)")),
+        else_="",
+    )
+    return (
+        select(literal("[") + func.group_concat(ordered.c.reason, ", ") + bonus_reason + "]")
+        .select_from(ordered)
+        .scalar_subquery()
+    )
+
+
+# Deferred: only computed for queries that select it, and loaded on first
+# access for ORM objects
+ContractAward.score_reasons = column_property(_score_reasons().label("score_reasons"), deferred=True)
+
+
+class ScoringVersion(Base):
+    """Scoring rules a `score_version` fingerprint stands for, kept to diff against later rules."""
+    __tablename__ = "scoring_versions"
+
+    fingerprint = Column(String(16), primary_key=True)
+    weights = Column(Text, nullable=False)  # JSON object of keyword -> weight
+    bonus_threshold = Column(Integer, nullable=False)
+    bonus_per_keyword = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class DataVersion(Base):
+    """Single-row counter bumped by every write that changes what GET /leads returns."""
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class IngestRun(Base):
+    """Outcome, counts and instrumentation summary of one run_ingestion call."""
+    __tablename__ = "ingest_runs"
+
+    id = Column(Integer, primary_key=True)
+    status = Column(String(16), nullable=False)  # "succeeded", "partial" or "failed"
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    counts = Column(Text, nullable=False)  # JSON object of the run's result counts
+    summary = Column(Text, nullable=False)  # JSON of IngestStats.summary()
+    error = Column(Text, nullable=True)
+
+
+class SourceWatermark(Base):
+    """How far a source's regular ingests have got: the latest letting fully ingested."""
+    __tablename__ = "source_watermarks"
+
+    source = Column(String(32), primary_key=True)
+    latest_letting = Column(Date, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class Lease(Base):
+    """A named lease one process holds until expires_at (see app.ingest.lease)."""
+    __tablename__ = "leases"
+
+    name = Column(String(32), primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(Float, nullable=False)  # Epoch seconds
+
+
+class SourceSchedule(Base):
+    """When the scheduler next ingests a source, and how its recent runs went (see app.ingest.scheduler)."""
+    __tablename__ = "ingest_schedule"
+
+    source = Column(String(32), primary_key=True)
+    next_run_at = Column(Float, nullable=False)  # Epoch seconds
+    failures = Column(Integer, nullable=False, default=0)  # Consecutive runs it did not succeed in
+    last_status = Column(String(16), nullable=True)
+    last_run_at = Column(Float, nullable=True)  # Epoch seconds
+
+
+class IngestedLetting(Base):
+    """A letting whose every page a source has ingested (see app.ingest.watermark)."""
+    __tablename__ = "ingested_lettings"
+
+    source = Column(String(32), primary_key=True)
+    letting_date = Column(Date, primary_key=True)
+    records = Column(Integer, nullable=True)  # None if its pages were unchanged when first recorded
+    ingested_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class LeadStatusCount(Base):
+    """Leads per state and status (summary for GET /stats, see app.lead_stats)."""
+    __tablename__ = "lead_stats_status"
+
+    state = Column(String(2), primary_key=True)
+    status = Column(Enum(ContractStatus), primary_key=True)
+    leads = Column(Integer, nullable=False)
+
+
+class LeadScoreBucket(Base):
+    """Leads per score range of SCORE_BUCKET_WIDTH, keyed by its lowest score."""
+    __tablename__ = "lead_stats_score"
+
+    bucket = Column(Integer, primary_key=True)
+    leads = Column(Integer, nullable=False)
+
+
+class LeadWeek(Base):
+    """Leads per letting week, keyed by the week's Monday."""
+    __tablename__ = "lead_stats_weekly"
+
+    week = Column(Date, primary_key=True)
+    leads = Column(Integer, nullable=False)
+
+
+class ContractorLeadCount(Base):
+    """Leads per contractor (leads not linked to one are not counted)."""
+    __tablename__ = "lead_stats_contractors"
+
+    contractor_id = Column(Integer, ForeignKey("contractors.id"), primary_key=True, autoincrement=False)
+    leads = Column(Integer, nullable=False)
+
+
+# Top contractors (GET /stats, GET /contractors) are read in this order, without a sort
+Index("ix_lead_stats_contractors_leads", ContractorLeadCount.leads.desc(), ContractorLeadCount.contractor_id)
+
+
+# Indexes for GET /leads: every supported filter combination (state, status,
+# both or neither) is an equality prefix followed by score DESC, so SQLite
+# can walk the index in ORDER BY score DESC, id order (the rowid is the
+# implicit last key column) without a temp sort. min_score and the keyset
+# cursor become a range on score within the same index.
+Index("ix_contract_awards_score", ContractAward.score.desc())
+Index("ix_contract_awards_state_score", ContractAward.state, ContractAward.score.desc())
+Index("ix_contract_awards_status_score", ContractAward.status, ContractAward.score.desc())
+Index("ix_contract_awards_state_status_score", ContractAward.state, ContractAward.status, ContractAward.score.desc())
+
+# The same prefixes followed by amount_cents DESC, for sort=amount and for
+# min_amount/max_amount, which become a range on amount_cents.
+Index("ix_contract_awards_amount", ContractAward.amount_cents.desc())
+Index("ix_contract_awards_state_amount", ContractAward.state, ContractAward.amount_cents.desc())
+Index("ix_contract_awards_status_amount", ContractAward.status, ContractAward.amount_cents.desc())
+Index("ix_contract_awards_state_status_amount", ContractAward.state, ContractAward.status, ContractAward.amount_cents.desc())
+
+
+# FTS5 index over the searchable contract text (see migrations._contract_search_index).
+# Declared on its own MetaData so create_all() never builds it as a plain table;
+# rowid is contract_awards.id.
+contract_awards_fts = Table(
+    "contract_awards_fts",
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("description", Text),
+    Column("awarded_to", String),
+    Column("contract_id", String),
+)
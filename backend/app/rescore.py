@@ -0,0 +1,216 @@
+"""
+Incremental rescoring of stored contracts after the scoring rules change.
+
+Every scored row carries the fingerprint of the rules that produced it
+(`score_version`), and the rules behind each fingerprint are kept in
+`scoring_versions`. A row scored under old rules can only score
+differently under the current ones if its text contains a keyword whose
+weight differs between the two (added and removed keywords included), so
+only those rows are rescored. Rows that contain none of them are already
+correct and keep their old fingerprint; diffing against that fingerprint
+again later stays exact.
+
+Run from backend/:
+    python -m app.rescore [--batch-size 1000] [--dry-run]
+"""
+from typing import Callable, Dict, List, Optional, Set
+import argparse
+import json
+
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .data_version import bump_data_version
+from .database import SessionLocal, init_db
+from .keyword_matches import keyword_ids, replace_matches, stored_matches
+from .lead_stats import LeadStatsDelta
+from .models import ContractAward, ScoringVersion
+from .row_hash import HASHED_COLUMNS, row_hash
+from .scoring import KeywordScorer, get_scorer
+
+# Rows rescored per UPDATE and commit
+RESCORE_BATCH_SIZE = 1000
+
+
+def record_scoring_version(db: Session, scorer: KeywordScorer):
+    """
+    Store the rules behind scorer.fingerprint if they are not stored yet (the caller commits).
+
+    Also numbers any of its keywords not seen before, in KEYWORD_WEIGHTS
+    order. Rendered score_reasons list keywords in id order, so a keyword
+    added to the table later is listed after the ones numbered before it.
+    """
+    keyword_ids(db, scorer.weights)
+    db.execute(
+        sqlite_insert(ScoringVersion)
+        .values(
+            fingerprint=scorer.fingerprint,
+            weights=json.dumps(scorer.weights, sort_keys=True),
+            bonus_threshold=scorer.bonus_threshold,
+            bonus_per_keyword=scorer.bonus_per_keyword,
+        )
+        .on_conflict_do_nothing(index_elements=["fingerprint"])
+    )
+
+
+def changed_keywords(old: Optional[ScoringVersion], scorer: KeywordScorer) -> Optional[Set[str]]:
+    """
+    Keywords whose weight differs between old and the scorer's rules.
+
+    Returns:
+        Set of keywords, or None when every row must be rescored (unknown
+        old rules, or a changed multiple-keyword bonus)
+    """
+    if old is None:
+        return None
+    if (old.bonus_threshold, old.bonus_per_keyword) != (scorer.bonus_threshold, scorer.bonus_per_keyword):
+        return None
+    old_weights = json.loads(old.weights)
+    return {
+        keyword
+        for keyword in old_weights.keys() | scorer.weights.keys()
+        if old_weights.get(keyword) != scorer.weights.get(keyword)
+    }
+
+
+def _searched_text():
+    """SQL version of the text KeywordScorer.score searches (lowered as Python lowers it)."""
+    return func.py_lower(ContractAward.description + " " + ContractAward.contract_id + " " + ContractAward.awarded_to)
+
+
+def stale_filters(db: Session, scorer: KeywordScorer) -> List:
+    """WHERE clauses selecting the rows whose score may differ under scorer, one per old version."""
+    clauses = []
+    versions = db.execute(
+        select(ContractAward.score_version)
+        .where(or_(ContractAward.score_version.is_(None), ContractAward.score_version != scorer.fingerprint))
+        .distinct()
+    ).scalars().all()
+    searched = _searched_text()
+    for version in versions:
+        in_version = ContractAward.score_version.is_(None) if version is None else ContractAward.score_version == version
+        old = db.get(ScoringVersion, version) if version is not None else None
+        keywords = changed_keywords(old, scorer)
+        if keywords is None:
+            clauses.append(in_version)
+        elif keywords:
+            matches = [func.instr(searched, keyword.lower()) > 0 for keyword in sorted(keywords)]
+            clauses.append(in_version & or_(*matches))
+    return clauses
+
+
+def _no_progress(stage: str, **counts: int):
+    pass
+
+
+def rescore(
+    db: Session,
+    scorer: Optional[KeywordScorer] = None,
+    batch_size: int = RESCORE_BATCH_SIZE,
+    dry_run: bool = False,
+    progress: Callable[..., None] = _no_progress,
+) -> Dict:
+    """
+    Rescore the rows whose score may be stale under the current scoring rules.
+
+    Candidates are streamed in id order, batch_size at a time; each batch is
+    rescored, written with one executemany (plus one to replace its keyword
+    matches, and one for the GET /stats score histogram) and committed, so
+    the write lock is never held for long and an interrupted run resumes
+    where it stopped.
+
+    Args:
+        db: Database session (committed after every batch)
+        scorer: Rules to score with (defaults to get_scorer())
+        batch_size: Rows per UPDATE and commit
+        dry_run: Only count the candidate rows
+        progress: Called as progress(stage, **counts) (see IngestJob.report)
+
+    Returns:
+        Dictionary with 'score_version', 'candidates', 'rescored' and
+        'changed' (rows whose score or keyword matches actually changed)
+    """
+    scorer = scorer or get_scorer()
+    counts = {"candidates": 0, "rescored": 0, "changed": 0}
+
+    progress("plan")
+    record_scoring_version(db, scorer)
+    db.commit()
+    clauses = stale_filters(db, scorer)
+    if clauses:
+        counts["candidates"] = db.execute(select(func.count()).where(or_(*clauses))).scalar()
+    progress("rescore", candidates=counts["candidates"])
+    if dry_run or not clauses:
+        return {"score_version": scorer.fingerprint, **counts}
+
+    # SET columns come from the parameter keys; run as one executemany per batch
+    table = ContractAward.__table__
+    stmt = update(table).where(table.c.id == bindparam("row_id"))
+    hashed = [getattr(ContractAward, column) for column in HASHED_COLUMNS]
+    ids = {}
+    last_id = 0
+    while True:
+        batch = db.execute(
+            select(
+                ContractAward.id, ContractAward.contract_id, ContractAward.state, ContractAward.status,
+                ContractAward.contractor_id, *hashed,
+            )
+            .where(ContractAward.id > last_id, or_(*clauses))
+            .order_by(ContractAward.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        rows = []
+        matches = {}
+        stored = stored_matches(db, [row.id for row in batch])
+        stats = LeadStatsDelta()
+        changed_before = counts["changed"]
+        for row in batch:
+            result = scorer.score(row.description, row.contract_id, row.awarded_to)
+            matches_changed = sorted(result["matches"]) != sorted(stored.get(row.id, ()))
+            if matches_changed:
+                matches[row.id] = result["matches"]
+            if matches_changed or result["score"] != row.score:
+                counts["changed"] += 1
+            if result["score"] != row.score:
+                stats.remove(row.state, row.status, row.score, row.letting_date, row.contractor_id)
+                stats.add(row.state, row.status, result["score"], row.letting_date, row.contractor_id)
+            # Keep the content hash in step so the next ingest still sees the row as unchanged
+            values = {**row._mapping, **result}
+            digest = row_hash([values[column] for column in HASHED_COLUMNS])
+            rows.append({"row_id": row.id, "score_version": scorer.fingerprint, "content_hash": digest,
+                         "score": result["score"]})
+        db.execute(stmt, rows)
+        replace_matches(db, matches, stored_ids=[row_id for row_id in matches if row_id in stored], ids=ids)
+        stats.apply(db)
+        if counts["changed"] > changed_before:
+            bump_data_version(db)
+        db.commit()
+
+        counts["rescored"] += len(rows)
+        progress("rescore", rescored=counts["rescored"], changed=counts["changed"])
+
+    return {"score_version": scorer.fingerprint, **counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rescore contracts whose score is stale under the current KEYWORD_WEIGHTS.")
+    parser.add_argument("--batch-size", type=int, default=RESCORE_BATCH_SIZE, help="Rows per UPDATE and commit")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would be rescored")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        result = rescore(db, batch_size=args.batch_size, dry_run=args.dry_run)
+    finally:
+        db.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
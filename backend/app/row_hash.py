@@ -0,0 +1,51 @@
+"""Stable content hash of a contract row, used to skip writes that would change nothing."""
+from datetime import date
+from typing import Any, Sequence
+import hashlib
+
+# Columns whose stored values the hash covers, in hashing order. These are
+# the columns an ingest writes (runner.UPSERT_COLUMNS); `status` is absent
+# because ingests never change it. Keyword matches are not hashed: they
+# follow from the hashed text under the row's score_version, and rows
+# scored under older rules are brought up to date by app.rescore.
+HASHED_COLUMNS = (
+    "letting_date",
+    "awarded_to",
+    "description",
+    "amount",
+    "source_url",
+    "score",
+)
+
+# Joins the encoded values; None gets its own marker so it differs from ""
+_SEPARATOR = "\x1f"
+_NONE = "\x00"
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return _NONE
+    # Dates hash the same whether they come from a parser (date) or from a
+    # raw SQLite row (ISO string)
+    if isinstance(value, date):
+        return value.isoformat()
+    return repr(value)
+
+
+def row_hash(values: Sequence[Any]) -> str:
+    """
+    Hash one row's values for HASHED_COLUMNS.
+
+    Runs for every incoming row on every ingest, so the values are joined
+    as text rather than serialized as JSON, which costs about three times
+    as much for rows with long descriptions.
+
+    Args:
+        values: Values in HASHED_COLUMNS order
+
+    Returns:
+        32 hex characters (a 128-bit BLAKE2b digest)
+    """
+    # Strings (most values) are joined as they are without a call per value
+    encoded = _SEPARATOR.join([v if type(v) is str else _text(v) for v in values])
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
@@ -1,6 +1,6 @@
 """Pydantic schemas for request/response validation."""
 from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import date, datetime
 from enum import Enum
 
@@ -20,7 +20,9 @@ class ContractAwardBase(BaseModel):
     contract_id: str = Field(..., description="Contract identifier")
     awarded_to: str = Field(..., description="Awarded to company name")
     description: str = Field(..., description="Contract description")
-    amount: Optional[str] = Field(None, description="Contract amount")
+    amount: Optional[str] = Field(None, description="Contract amount as the source published it")
+    amount_cents: Optional[int] = Field(None, description="Contract amount in cents (null if it could not be parsed)")
+    contractor_id: Optional[int] = Field(None, description="Contractor awarded_to resolved to (see GET /contractors)")
     source_url: str = Field(..., description="Source URL")
     score: int = Field(0, description="Score")
     score_reasons: Optional[str] = Field(None, description="JSON string of score reasons")
@@ -42,12 +44,79 @@ class ContractAwardResponse(ContractAwardBase):
         from_attributes = True
 
 
+class LeadPage(BaseModel):
+    """One page of leads, ordered by score descending then id."""
+    items: List[Dict[str, Any]] = Field(..., description="Leads (only the requested fields when `fields` is given)")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class LeadSearchResults(BaseModel):
+    """Leads matching a full-text query, best match first."""
+    items: List[Dict[str, Any]] = Field(
+        ..., description="Leads with the requested fields plus `snippet` and `rank` (lower is better)"
+    )
+
+
+class SourceResult(BaseModel):
+    """How one ingest source fared in a run."""
+    status: Optional[str] = Field(None, description="succeeded, failed or timed_out")
+    records: int = Field(0, description="Contracts the source delivered")
+    seconds: float = Field(0.0, description="Time the source spent producing them")
+    error: Optional[str] = Field(None, description="Failure reason if it did not succeed")
+
+
 class IngestResponse(BaseModel):
     """Response schema for ingest operation."""
-    kytc_count: int = Field(..., description="Number of contracts from KYTC")
-    indot_count: int = Field(..., description="Number of contracts from INDOT")
+    status: str = Field("succeeded", description="succeeded, partial (some sources failed), failed (all did) or skipped (scheduled, but none was due any more)")
+    sources: Dict[str, SourceResult] = Field(default_factory=dict, description="Result per source, by name")
     total_processed: int = Field(..., description="Total contracts processed")
     total_upserted: int = Field(..., description="Total contracts upserted")
+    inserted: int = Field(0, description="Contracts inserted as new rows")
+    updated: int = Field(0, description="Existing contracts whose fields changed")
+    unchanged: int = Field(0, description="Existing contracts left untouched")
+    chunks: int = Field(0, description="Chunks scored, upserted and committed")
+    cache_hits: int = Field(0, description="Source pages skipped because they were unchanged")
+    cache_misses: int = Field(0, description="Source pages downloaded and parsed")
+    run_id: Optional[int] = Field(None, description="ingest_runs row holding this run's summary")
+    summary: Dict[str, Any] = Field(default_factory=dict, description="Pages, bytes, rows, skips and seconds per source and stage")
+
+
+class IngestRunResponse(BaseModel):
+    """A stored ingest run with its instrumentation summary."""
+    id: int
+    status: str = Field(..., description="succeeded, partial or failed")
+    started_at: datetime
+    finished_at: datetime
+    duration_seconds: float
+    counts: Dict[str, int] = Field(default_factory=dict, description="Result counts (empty for runs that failed before finishing)")
+    summary: Dict[str, Any] = Field(default_factory=dict, description="Pages, bytes, rows, skips and seconds per source and stage")
+    error: Optional[str] = Field(None, description="Failure reason, or the sources that failed for partial runs")
+
+
+class IngestJobResponse(BaseModel):
+    """Status of a background ingestion job."""
+    id: str = Field(..., description="Job identifier")
+    status: str = Field(..., description="running, succeeded or failed")
+    stage: Optional[str] = Field(None, description="Current stage while running")
+    progress: Dict[str, int] = Field(default_factory=dict, description="Counts reported so far")
+    timings: Dict[str, float] = Field(default_factory=dict, description="Seconds spent in each finished stage")
+    result: Optional[IngestResponse] = Field(None, description="Final counts once succeeded")
+    error: Optional[str] = Field(None, description="Failure reason once failed")
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class RescoreResponse(BaseModel):
+    """Result of a rescoring run."""
+    score_version: str = Field(..., description="Fingerprint of the scoring rules rows were rescored with")
+    candidates: int = Field(..., description="Rows whose score could differ under the current rules")
+    rescored: int = Field(..., description="Rows rescored and stamped with score_version")
+    changed: int = Field(..., description="Rescored rows whose score or reasons changed")
+
+
+class RescoreJobResponse(IngestJobResponse):
+    """Status of a background rescoring job."""
+    result: Optional[RescoreResponse] = Field(None, description="Final counts once succeeded")
 
 
 class LeadFilterParams(BaseModel):
@@ -55,6 +124,58 @@ class LeadFilterParams(BaseModel):
     state: Optional[str] = Field(None, description="Filter by state (KY or IN)")
     status: Optional[ContractStatusEnum] = Field(None, description="Filter by status")
     min_score: Optional[int] = Field(None, description="Minimum score threshold")
+    min_amount: Optional[float] = Field(None, description="Minimum contract amount in dollars")
+    max_amount: Optional[float] = Field(None, description="Maximum contract amount in dollars")
+
+
+class StateStatusCount(BaseModel):
+    """Leads in one state with one status."""
+    state: str
+    status: ContractStatusEnum
+    leads: int
+
+
+class ScoreBucket(BaseModel):
+    """Leads whose score falls in [min_score, max_score]."""
+    min_score: int
+    max_score: int
+    leads: int
+
+
+class WeeklyVolume(BaseModel):
+    """Leads let in the week starting on Monday `week`."""
+    week: date
+    leads: int
+
+
+class ContractorCount(BaseModel):
+    """Leads awarded to one contractor, under any of its names."""
+    contractor_id: int
+    name: str
+    leads: int
+
+
+class ContractorSummary(BaseModel):
+    """A contractor, its lead count and the raw names it was published under."""
+    id: int
+    name: str = Field(..., description="First awarded_to name the contractor was seen under")
+    leads: int
+    aliases: List[str] = Field(default_factory=list, description="Every awarded_to name resolved to it")
+
+
+class ContractorPage(BaseModel):
+    """One page of contractors, most leads first."""
+    items: List[ContractorSummary]
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class LeadStats(BaseModel):
+    """Dashboard statistics over all leads."""
+    total: int = Field(..., description="Number of leads")
+    by_state_status: List[StateStatusCount] = Field(default_factory=list, description="Leads per state and status")
+    score_buckets: List[ScoreBucket] = Field(default_factory=list, description="Score histogram, lowest scores first")
+    weekly: List[WeeklyVolume] = Field(default_factory=list, description="Leads per letting week, oldest first")
+    top_contractors: List[ContractorCount] = Field(default_factory=list, description="Companies with the most leads")
 
 
 class StatusUpdate(BaseModel):
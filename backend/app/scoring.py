@@ -1,5 +1,6 @@
 """Rule-based scoring system for contract awards."""
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import hashlib
 import json
 
 
@@ -23,40 +24,139 @@ KEYWORD_WEIGHTS = {
     "transport": 6,
 }
 
+# Keywords matched before the multiple-keyword bonus applies
+BONUS_THRESHOLD = 3
+BONUS_PER_KEYWORD = 2
+
+
+def scoring_fingerprint(weights: Dict[str, int], bonus_threshold: int, bonus_per_keyword: int) -> str:
+    """Short stable hash of a set of scoring rules."""
+    rules = json.dumps(
+        {"weights": weights, "bonus_threshold": bonus_threshold, "bonus_per_keyword": bonus_per_keyword},
+        sort_keys=True,
+    )
+    return hashlib.sha256(rules.encode("utf-8")).hexdigest()[:16]
+
+
+def render_score_reasons(matches: Sequence[Tuple[str, int]], score: int) -> Optional[str]:
+    """
+    The JSON list of reason sentences shown for a score.
+
+    Args:
+        matches: (keyword, weight) pairs the contract matched, in order
+        score: The contract's score; whatever it holds beyond the matched
+            weights is the multiple-keyword bonus
+
+    Returns:
+        JSON text, or None when nothing matched
+    """
+    if not matches:
+        return None
+    reasons = [json.dumps(f"Matched keyword '{keyword}' (+{weight} points)") for keyword, weight in matches]
+    bonus = score - sum(weight for _, weight in matches)
+    if bonus > 0:
+        reasons.append(json.dumps(f"Multiple relevant keywords bonus (+{bonus} points)"))
+    # Same text json.dumps(list) produces with its default separators
+    return "[" + ", ".join(reasons) + "]"
+
+
+class KeywordScorer:
+    """
+    Keyword weight table compiled once for repeated scoring.
+
+    Keywords are lowered up front, so scoring a contract is a single pass
+    over the table that yields the score and the matched keywords together.
+    Every keyword is tested independently, so overlapping keywords ("haul"
+    inside "hauling") each count exactly as they always have. Reasons are
+    not built here: matches are stored as keyword rows and only rendered
+    into text when read (see render_score_reasons).
+
+    `fingerprint` identifies the scoring rules; it is stored on every scored
+    row as `score_version` so stale rows can be found after a tuning change.
+    """
+
+    def __init__(
+        self,
+        weights: Dict[str, int],
+        bonus_threshold: int = BONUS_THRESHOLD,
+        bonus_per_keyword: int = BONUS_PER_KEYWORD,
+    ):
+        self.weights = dict(weights)
+        self.bonus_threshold = bonus_threshold
+        self.bonus_per_keyword = bonus_per_keyword
+        self.fingerprint = scoring_fingerprint(self.weights, bonus_threshold, bonus_per_keyword)
+        self._table = [(keyword.lower(), (keyword, weight)) for keyword, weight in self.weights.items()]
+
+    def score(self, description: str, contract_id: str = "", awarded_to: str = "") -> Dict:
+        """
+        Score one contract.
+
+        Returns:
+            Dictionary with 'score' (int) and 'matches' (tuple of the
+            (keyword, weight) pairs matched, in KEYWORD_WEIGHTS order)
+        """
+        text_to_search = f"{description} {contract_id} {awarded_to}".lower()
+
+        matches = tuple(match for keyword, match in self._table if keyword in text_to_search)
+        if not matches:
+            return {"score": 0, "matches": ()}
+
+        score = sum(weight for _, weight in matches)
+        if len(matches) > self.bonus_threshold:
+            score += (len(matches) - self.bonus_threshold) * self.bonus_per_keyword
+        return {"score": score, "matches": matches}
+
+
+_scorer: Optional[KeywordScorer] = None
+
+
+def get_scorer() -> KeywordScorer:
+    """Return the scorer compiled from KEYWORD_WEIGHTS, recompiling if the rules changed."""
+    global _scorer
+    if (
+        _scorer is None
+        or _scorer.weights != KEYWORD_WEIGHTS
+        or _scorer.bonus_threshold != BONUS_THRESHOLD
+        or _scorer.bonus_per_keyword != BONUS_PER_KEYWORD
+    ):
+        _scorer = KeywordScorer(KEYWORD_WEIGHTS, BONUS_THRESHOLD, BONUS_PER_KEYWORD)
+    return _scorer
+
 
 def score_contract(description: str, contract_id: str = "", awarded_to: str = "") -> Dict:
     """
     Score a contract based on keyword matching in description and other fields.
-    
+
     Args:
         description: Contract description text
         contract_id: Contract identifier (optional)
         awarded_to: Awarded company name (optional)
-        
+
     Returns:
-        Dictionary with 'score' (int) and 'score_reasons' (list of strings)
-    """
-    score = 0
-    reasons = []
-    
-    # Normalize text for case-insensitive matching
-    text_to_search = f"{description} {contract_id} {awarded_to}".lower()
-    
-    # Check each keyword
-    for keyword, weight in KEYWORD_WEIGHTS.items():
-        if keyword.lower() in text_to_search:
-            score += weight
-            reasons.append(f"Matched keyword '{keyword}' (+{weight} points)")
-    
-    # Bonus for multiple relevant keywords
-    matches = sum(1 for kw in KEYWORD_WEIGHTS.keys() if kw.lower() in text_to_search)
-    if matches > 3:
-        bonus = (matches - 3) * 2
-        score += bonus
-        reasons.append(f"Multiple relevant keywords bonus (+{bonus} points)")
-    
-    return {
-        "score": score,
-        "score_reasons": json.dumps(reasons) if reasons else None
-    }
+        Dictionary with 'score' (int) and 'score_reasons' (JSON list of
+        strings, or None when nothing matched)
+    """
+    result = get_scorer().score(description, contract_id, awarded_to)
+    return {"score": result["score"], "score_reasons": render_score_reasons(result["matches"], result["score"])}
+
+
+def score_many(records: Iterable[Dict]) -> List[Dict]:
+    """
+    Score a batch of normalized contract records.
 
+    Args:
+        records: Contract dictionaries with 'description', 'contract_id'
+            and 'awarded_to' keys
+
+    Returns:
+        List of KeywordScorer.score results in the same order as the input records
+    """
+    score = get_scorer().score
+    return [
+        score(
+            record.get("description", ""),
+            record.get("contract_id", ""),
+            record.get("awarded_to", ""),
+        )
+        for record in records
+    ]
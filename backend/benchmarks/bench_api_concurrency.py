@@ -0,0 +1,137 @@
+"""
+Load-test the API with a local async HTTP driver.
+
+Starts uvicorn on a temporary SQLite database, then drives GET /leads and
+POST /leads/{id}/status with increasing numbers of concurrent clients and
+reports throughput and latency. GET /leads is driven three ways: repeated
+identical polls (served from the response cache), the same polls sending
+If-None-Match (304s), and polls with a different min_score each time so
+every request misses the cache. For comparison it also drives an `async def`
+copy of the /leads handler that calls the database directly on the event
+loop, which is how every route worked before the handlers were offloaded.
+
+Usage (from backend/):
+    python -m benchmarks.bench_api_concurrency [--rows 50000] [--requests 400]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp.name}/bench.db"
+os.environ.setdefault("INGEST_CACHE_DIR", os.path.join(_tmp.name, "http_cache"))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import Request  # noqa: E402
+
+from app.api.routes import get_leads  # noqa: E402
+from app.database import SessionLocal, init_db  # noqa: E402
+from app.ingest.runner import upsert_contracts  # noqa: E402
+from app.main import app  # noqa: E402
+from benchmarks.datagen import synthetic_contracts  # noqa: E402
+
+
+async def blocking_leads(request: Request, state: str = None, min_score: int = None, limit: int = 50):
+    """The /leads handler run on the event loop, as before the handlers were offloaded."""
+    db = SessionLocal()
+    try:
+        return get_leads(
+            request=request, state=state, status=None, min_score=min_score, limit=limit, cursor=None, fields=None, db=db
+        )
+    finally:
+        db.close()
+
+
+app.add_api_route("/bench/blocking-leads", blocking_leads, methods=["GET"])
+
+
+def seed(rows: int):
+    init_db()
+    db = SessionLocal()
+    try:
+        upsert_contracts(db, synthetic_contracts(rows))
+        db.commit()
+    finally:
+        db.close()
+
+
+def start_server():
+    config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="off")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}"
+
+
+async def drive(base_url: str, make_request, concurrency: int, total: int):
+    """Issue `total` requests from `concurrency` clients; return (req/s, p50 ms, p95 ms)."""
+    latencies = []
+    remaining = iter(range(total))
+
+    async def client_loop(client):
+        for i in remaining:
+            start = time.perf_counter()
+            response = await make_request(client, i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                response.raise_for_status()
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return total / elapsed, statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=400, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    args = parser.parse_args()
+
+    seed(args.rows)
+    server, base_url = start_server()
+    rng = random.Random(42)
+    statuses = ["new", "contacted", "ignored", "converted"]
+
+    etag = httpx.get(f"{base_url}/leads", params={"state": "KY", "limit": 50}).headers["ETag"]
+    scenarios = {
+        "GET /leads (cached)": lambda c, i: c.get("/leads", params={"state": "KY", "limit": 50}),
+        "GET /leads (If-None-Match)": lambda c, i: c.get(
+            "/leads", params={"state": "KY", "limit": 50}, headers={"If-None-Match": etag}
+        ),
+        "GET /leads (uncached)": lambda c, i: c.get("/leads", params={"state": "KY", "limit": 50, "min_score": -i}),
+        "GET /leads (uncached, on event loop)": lambda c, i: c.get(
+            "/bench/blocking-leads", params={"state": "KY", "limit": 50, "min_score": -i}
+        ),
+        "POST /leads/{id}/status": lambda c, i: c.post(
+            f"/leads/{rng.randint(1, args.rows)}/status", json={"status": rng.choice(statuses)}
+        ),
+    }
+
+    try:
+        print(f"rows={args.rows} requests/scenario={args.requests}")
+        for name, make_request in scenarios.items():
+            print(f"  {name}")
+            for concurrency in args.concurrency:
+                rps, p50, p95 = asyncio.run(drive(base_url, make_request, concurrency, args.requests))
+                print(f"    clients={concurrency:<3} {rps:8.1f} req/s   p50 {p50:7.1f} ms   p95 {p95:7.1f} ms")
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
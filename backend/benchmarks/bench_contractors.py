@@ -0,0 +1,101 @@
+"""
+Benchmark contractor name deduplication: trigram-blocked candidates vs all pairs.
+
+Resolves noisy synthetic awarded_to names (benchmarks.datagen) one by one,
+as ingest does, with the blocked ContractorIndex, and reports time, pairs
+scored and pairwise precision/recall against the companies the names were
+generated from. The all-pairs comparison every new name would otherwise
+need is timed on a sample (where both must agree exactly) and extrapolated.
+
+Usage (from backend/):
+    python -m benchmarks.bench_contractors [--names 100000] [--sample 3000]
+"""
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+import argparse
+import time
+
+from app.contractors import ContractorIndex, canonical_name, dice, trigrams
+from benchmarks.datagen import synthetic_contractor_names
+
+
+class AllPairsIndex(ContractorIndex):
+    """ContractorIndex that scores a new name against every indexed name."""
+
+    def match(self, canonical: str) -> Optional[int]:
+        if canonical in self.contractors:
+            return self.contractors[canonical]
+        grams = trigrams(canonical)
+        best, best_score = None, self.threshold
+        for position, other in enumerate(self._grams):
+            self.scored += 1
+            score = dice(grams, other)
+            if score > best_score or (score == best_score and best is None):
+                best, best_score = position, score
+        return None if best is None else self.contractors[self._names[best]]
+
+
+def dedupe(index: ContractorIndex, names: Sequence[str]) -> Tuple[List[int], float]:
+    """Contractor number of each name, resolved in order, and the seconds it took."""
+    next_id = iter(range(1, len(names) + 1))
+    canonical_ids: Dict[str, int] = {}
+    start = time.perf_counter()
+    assigned = []
+    for name in names:
+        canonical = canonical_name(name)
+        if canonical not in canonical_ids:
+            canonical_ids[canonical] = index.assign(canonical, lambda: next(next_id))
+        assigned.append(canonical_ids[canonical])
+    return assigned, time.perf_counter() - start
+
+
+def _pairs(counts) -> int:
+    return sum(n * (n - 1) // 2 for n in counts)
+
+
+def pairwise_quality(predicted: Sequence[int], truth: Sequence[int]) -> Tuple[float, float]:
+    """Precision and recall of "these two names are the same company" over all name pairs."""
+    together = _pairs(Counter(zip(predicted, truth)).values())
+    predicted_pairs = _pairs(Counter(predicted).values())
+    true_pairs = _pairs(Counter(truth).values())
+    return together / predicted_pairs if predicted_pairs else 1.0, together / true_pairs if true_pairs else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=3_000, help="Distinct names the all-pairs scan is timed on")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    generated = synthetic_contractor_names(args.names, seed=args.seed)
+    # Ingest resolves each distinct raw name once (contractor_aliases remembers it)
+    company_of = dict(reversed(generated))
+    names = list(dict.fromkeys(name for name, _ in generated))
+    truth = [company_of[name] for name in names]
+
+    blocked = ContractorIndex()
+    assigned, blocked_time = dedupe(blocked, names)
+    precision, recall = pairwise_quality(assigned, truth)
+    all_pairs = len(blocked) * (len(blocked) - 1) // 2
+    print(f"names:               {args.names} ({len(names)} distinct, {len(set(truth))} companies)")
+    print(f"contractors found:   {len(set(assigned))}")
+    print(f"blocked:             {blocked_time:.2f}s, {blocked.scored} pairs scored "
+          f"({blocked.scored / len(names):.1f} per name, all pairs would be {all_pairs})")
+    print(f"pairwise precision:  {precision:.4f}")
+    print(f"pairwise recall:     {recall:.4f}")
+
+    sample = names[:args.sample]
+    sample_blocked, sample_blocked_time = dedupe(ContractorIndex(), sample)
+    brute = AllPairsIndex()
+    sample_brute, sample_brute_time = dedupe(brute, sample)
+    assert sample_blocked == sample_brute, "blocked candidates missed a match the all-pairs scan found"
+    scale = (len(names) / len(sample)) ** 2
+    print(f"sample of {len(sample)}:      blocked {sample_blocked_time:.2f}s, all pairs {sample_brute_time:.2f}s "
+          f"({brute.scored} pairs scored, same result)")
+    print(f"all pairs, full set: ~{sample_brute_time * scale:.0f}s extrapolated "
+          f"({sample_brute_time * scale / blocked_time:.0f}x the blocked run)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Peak RSS of exporting every lead: streamed export vs loading the whole result.
+
+Each measurement runs in a fresh subprocess so ru_maxrss reflects only that
+export. "stream" is GET /leads/export's generator; "load_all" is the old
+approach of loading every ORM row and serializing one JSON array.
+
+Usage (from backend/):
+    python -m benchmarks.bench_export [--sizes 10000 1000000]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.api.export import stream_export
+from app.api.routes import LEAD_FIELDS, lead_filters, leads_export_query
+from app.database import Base, SQLiteProfile, create_sqlite_engine
+from app.models import ContractAward
+from app.schemas import ContractAwardResponse
+
+# Small page cache so SQLite's own cache does not dominate RSS
+PROFILE = SQLiteProfile(cache_size_kb=2000, mmap_size=0)
+
+
+def seed(path, count):
+    engine = create_sqlite_engine(f"sqlite:///{path}", profile=PROFILE)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :count) "
+            "INSERT INTO contract_awards (state, letting_date, contract_id, awarded_to, description, "
+            "source_url, score, status) "
+            "SELECT CASE i % 2 WHEN 0 THEN 'KY' ELSE 'IN' END, '2025-11-20', 'C' || i, 'Bluegrass Paving, Inc.', "
+            "'Dump truck hauling and aggregate delivery for resurfacing on route ' || i, "
+            "'https://transportation.ky.gov/Construction-Procurement/Pages/Letting-Contracts.aspx', i % 50, "
+            "'NEW' FROM n"
+        ), {"count": count})
+        # Every lead matched 'dump truck', so exported score_reasons has a reason to render
+        conn.execute(text("INSERT INTO keywords (id, keyword) VALUES (1, 'dump truck')"))
+        conn.execute(text(
+            "INSERT INTO contract_keywords (contract_award_id, keyword_id, weight) SELECT id, 1, 10 FROM contract_awards"
+        ))
+    engine.dispose()
+
+
+def child(path, mode):
+    engine = create_sqlite_engine(f"sqlite:///{path}", profile=PROFILE)
+    Session = sessionmaker(bind=engine)
+    start = time.perf_counter()
+    size = 0
+    with open(os.devnull, "w") as sink:
+        if mode == "stream":
+            stmt = leads_export_query(lead_filters(None, None, None), LEAD_FIELDS)
+            for chunk in stream_export(Session, stmt, LEAD_FIELDS, "ndjson"):
+                size += len(chunk)
+                sink.write(chunk)
+        else:
+            db = Session()
+            leads = db.query(ContractAward).order_by(ContractAward.score.desc(), ContractAward.id).all()
+            body = json.dumps([ContractAwardResponse.model_validate(lead).model_dump(mode="json") for lead in leads])
+            size = len(body)
+            sink.write(body)
+            db.close()
+    elapsed = time.perf_counter() - start
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    print(json.dumps({"seconds": elapsed, "rss_mb": rss_mb, "bytes": size}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--modes", nargs="+", default=["stream", "load_all"])
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"{size}.db")
+            seed(path, size)
+            for mode in args.modes:
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_export", "--child", path, mode],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                result = json.loads(out)
+                print(
+                    f"  rows={size:<8} {mode:<9} peak RSS {result['rss_mb']:7.1f} MB   "
+                    f"{result['seconds']:6.2f}s   {result['bytes'] / 1e6:7.1f} MB out"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Peak RSS of an ingest run: streamed chunked commits vs the materialized pipeline.
+
+Each measurement runs in a fresh subprocess against a fresh database, with
+the KYTC source replaced by a lazy synthetic generator. "stream" is
+run_ingestion; "materialize" is the old pipeline that built the full
+normalized list, scored it all, upserted it and committed once.
+
+Usage (from backend/):
+    python -m benchmarks.bench_ingest_memory [--sizes 10000 500000] [--commit-every 5000]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.data_version import bump_data_version
+from app.database import Base, SQLiteProfile, create_sqlite_engine
+from app.ingest import runner
+from app.ingest.cache import PageCache
+from app.ingest.kytc import normalize_kytc
+from app.ingest.sources import Source
+from app.rescore import record_scoring_version
+from app.scoring import get_scorer, score_many
+from benchmarks.datagen import iter_raw_contracts
+
+# Small page cache so SQLite's own cache does not dominate RSS
+PROFILE = SQLiteProfile(cache_size_kb=2000, mmap_size=0)
+
+
+def materialized_ingest(db, records):
+    """run_ingestion before the streaming pipeline: every stage holds the whole run."""
+    normalized = list(normalize_kytc(records))
+    scorer = get_scorer()
+    scored = [
+        {**contract, **result, "score_version": scorer.fingerprint}
+        for contract, result in zip(normalized, score_many(normalized))
+    ]
+    record_scoring_version(db, scorer)
+    counts = runner.upsert_contracts(db, scored)
+    bump_data_version(db)
+    db.commit()
+    return counts
+
+
+def child(path, mode, size, commit_every):
+    engine = create_sqlite_engine(f"sqlite:///{path}", profile=PROFILE)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    start = time.perf_counter()
+    if mode == "stream":
+        cache = PageCache(os.path.dirname(path))
+        source = Source("kytc", fetch=lambda **kwargs: iter_raw_contracts(size), normalize=normalize_kytc)
+        counts = runner.run_ingestion(db, cache=cache, commit_every=commit_every, sources=[source])
+    else:
+        counts = materialized_ingest(db, iter_raw_contracts(size))
+    elapsed = time.perf_counter() - start
+    db.close()
+
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+    print(json.dumps({"seconds": elapsed, "rss_mb": rss_mb, "inserted": counts["inserted"]}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 500_000])
+    parser.add_argument("--modes", nargs="+", default=["stream", "materialize"])
+    parser.add_argument("--commit-every", type=int, default=runner.INGEST_COMMIT_EVERY)
+    parser.add_argument("--child", nargs=3, metavar=("PATH", "MODE", "SIZE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        path, mode, size = args.child
+        child(path, mode, int(size), args.commit_every)
+        return
+
+    print(f"commit_every={args.commit_every}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            for mode in args.modes:
+                workdir = os.path.join(tmp, f"{mode}-{size}")
+                os.makedirs(workdir)
+                out = subprocess.run(
+                    [
+                        sys.executable, "-m", "benchmarks.bench_ingest_memory",
+                        "--commit-every", str(args.commit_every),
+                        "--child", os.path.join(workdir, "app.db"), mode, str(size),
+                    ],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                result = json.loads(out)
+                assert result["inserted"] == size
+                print(
+                    f"  records={size:<8} {mode:<12} peak RSS {result['rss_mb']:7.1f} MB   "
+                    f"{result['seconds']:6.2f}s   {size / result['seconds']:9.0f} records/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark sequential vs concurrent KYTC letting-page fetching.
+
+A local stand-in HTTP server serves generated letting pages with an
+artificial per-request latency, so the numbers reflect round-trip time
+rather than KYTC's servers.
+
+Usage (from backend/):
+    python -m benchmarks.bench_kytc_fetch [--lettings 24] [--latency 0.25] [--concurrency 8]
+"""
+import argparse
+import asyncio
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+from app.ingest.fetch import DEFAULT_HEADERS, FetchConfig
+from app.ingest.kytc import ingest_kytc_async, letting_url, parse_letting_page
+from benchmarks.datagen import kytc_letting_html
+
+
+def start_server(latency: float, rows: int):
+    """Start a threaded HTTP server that serves a letting page per ?letting= date."""
+    pages = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            letting = parse_qs(urlsplit(self.path).query).get("letting", [""])[0]
+            with lock:
+                if letting not in pages:
+                    pages[letting] = kytc_letting_html(rows, seed=len(pages)).encode()
+                body = pages[letting]
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def sequential_ingest(letting_dates, base_url):
+    """One blocking request per letting, as ingest_kytc did before the async fetch stage."""
+    contracts = []
+    with httpx.Client(headers=DEFAULT_HEADERS, timeout=30.0) as client:
+        for date_str in letting_dates:
+            url = letting_url(date_str, base_url)
+            response = client.get(url)
+            response.raise_for_status()
+            contracts.extend(parse_letting_page(response.text, date_str, url))
+    return contracts
+
+
+async def concurrent_ingest(letting_dates, config, base_url):
+    """Drain ingest_kytc_async into a list."""
+    return [c async for c in ingest_kytc_async(letting_dates, config=config, base_url=base_url)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lettings", type=int, default=24, help="Letting pages to fetch")
+    parser.add_argument("--rows", type=int, default=150, help="Calls per letting page")
+    parser.add_argument("--latency", type=float, default=0.25, help="Server latency per request (s)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server = start_server(args.latency, args.rows)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/Letting-Contracts.aspx"
+    first = date(2025, 1, 9)
+    letting_dates = [(first + timedelta(weeks=2 * i)).strftime("%m/%d/%Y") for i in range(args.lettings)]
+
+    try:
+        start = time.perf_counter()
+        sequential = sequential_ingest(letting_dates, base_url)
+        sequential_time = time.perf_counter() - start
+
+        config = FetchConfig(concurrency=args.concurrency, per_host_delay=0.0, retries=0)
+        start = time.perf_counter()
+        concurrent = asyncio.run(concurrent_ingest(letting_dates, config, base_url))
+        concurrent_time = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    key = lambda c: (c["source_url"], c["contract_id"])
+    assert sorted(sequential, key=key) == sorted(concurrent, key=key)
+
+    print(f"lettings={args.lettings} rows/page={args.rows} latency={args.latency}s contracts={len(concurrent)}")
+    print(f"  sequential               {sequential_time:7.2f}s")
+    print(f"  async, concurrency={args.concurrency:<3}  {concurrent_time:7.2f}s ({sequential_time / concurrent_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Benchmark the KYTC letting-page parser.
+
+Reports parse time per 1,000 table rows for the previous flat-token parser
+(BeautifulSoup) and the row-structured parser on each of its backends: the
+standard library HTMLParser and, if installed, lxml. The legacy parser is
+also what tests/test_kytc.py checks the row parser against.
+
+Usage (from backend/):
+    python -m benchmarks.bench_kytc_parse [--rows 1000] [--repeat 5]
+"""
+import argparse
+import re
+import time
+from datetime import date, datetime
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from app.ingest.kytc import HTML_PARSER, iter_letting_rows
+from benchmarks.datagen import kytc_letting_html
+
+
+def legacy_parse_letting_page(html: str, date_str: str, page_url: str) -> List[Dict]:
+    """
+    The flat-token parser ingest_kytc used before the row-structured parser.
+    
+    Args:
+        html: Page HTML
+        date_str: Letting date the page belongs to (MM/DD/YYYY)
+        page_url: URL the page was fetched from
+    
+    Returns:
+        List of raw contract dictionaries (see ingest_kytc)
+    """
+    contracts = []
+    
+    contracts_soup = BeautifulSoup(html, 'html.parser')
+    
+    # Parse contract data from table/div
+    table = contracts_soup.find('table')
+    if not table:
+        # Try alternative selectors
+        table = contracts_soup.find('div', class_=re.compile(r'table|contract', re.I))
+    
+    if table:
+        # Extract all text cells into a flat list
+        flat_text = table.get_text(" | ", strip=True)
+        items = flat_text.split(" | ")
+        
+        # Expected header: ["Call","Status","Awarded To","Contract ID","District","County","Project Description"]
+        expected_header = ["Call", "Status", "Awarded To", "Contract ID", "District", "County", "Project Description"]
+        
+        # Find the index where the header starts
+        header_start_idx = None
+        for i in range(len(items) - len(expected_header) + 1):
+            # Check if the next N items match the header (case-insensitive, allowing for variations)
+            potential_header = [item.strip() for item in items[i:i+len(expected_header)]]
+            # Check if all expected header terms are present in order
+            matches = 0
+            for j, expected in enumerate(expected_header):
+                if expected.lower() in potential_header[j].lower():
+                    matches += 1
+            if matches >= len(expected_header) - 1:  # Allow one mismatch
+                header_start_idx = i
+                break
+        
+        if header_start_idx is None:
+            print("rows found: 0 (header not found)")
+        else:
+            # Remove the header tokens
+            data_items = items[header_start_idx + len(expected_header):]
+            
+            # Known status values
+            known_statuses = ["Awarded", "Withdrawn", "Rejected"]
+            
+            # Streaming parser: iterate through tokens
+            i = 0
+            while i < len(data_items):
+                token = data_items[i].strip()
+                
+                # Check if token looks like a call number (numeric string)
+                if token and token.isdigit() and i + 1 < len(data_items):
+                    next_token = data_items[i + 1].strip()
+                    
+                    # Check if next token is a known status
+                    if next_token in known_statuses:
+                        call = token
+                        status = next_token
+                        i += 2  # Move past call and status
+                        
+                        # If status is "Awarded", collect fields until next call/status pair
+                        if status == "Awarded":
+                            awarded_to = ""
+                            contract_id = ""
+                            description_parts = []
+                            field_state = "awarded_to"
+                            
+                            # Collect fields until we hit the next call/status pair
+                            while i < len(data_items):
+                                current_token = data_items[i].strip()
+                                
+                                # Check if we've hit the next call/status pair
+                                if current_token.isdigit() and i + 1 < len(data_items):
+                                    next_check = data_items[i + 1].strip()
+                                    if next_check in known_statuses:
+                                        break  # Found next record, stop collecting
+                                
+                                if not current_token:
+                                    i += 1
+                                    continue
+                                
+                                # Collect fields in order: awarded_to, contract_id, county (skip), description
+                                if field_state == "awarded_to":
+                                    # First token is awarded_to
+                                    awarded_to = current_token
+                                    field_state = "contract_id"
+                                elif field_state == "contract_id":
+                                    # Next token that is all digits is contract_id
+                                    if current_token.isdigit():
+                                        contract_id = current_token
+                                        field_state = "county"
+                                    # If not digits, might be continuation, but per pattern should be digits
+                                elif field_state == "county":
+                                    # Skip county token (ignore it)
+                                    field_state = "description"
+                                    # Don't increment i here, let description handle it
+                                    i += 1
+                                    continue
+                                else:  # field_state == "description"
+                                    # All remaining tokens go to description
+                                    description_parts.append(current_token)
+                                
+                                i += 1
+                            
+                            # Only emit if we have required fields
+                            if awarded_to and contract_id:
+                                # Parse the letting date
+                                try:
+                                    # Date format is typically MM/DD/YYYY
+                                    date_parts = date_str.split('/')
+                                    if len(date_parts) == 3:
+                                        letting_date = date(
+                                            int(date_parts[2]),
+                                            int(date_parts[0]),
+                                            int(date_parts[1])
+                                        )
+                                    else:
+                                        # Try ISO format or other formats
+                                        letting_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+                                except (ValueError, IndexError):
+                                    # If parsing fails, use the string as-is
+                                    letting_date = date_str
+                                
+                                contract_data = {
+                                    "letting_date": letting_date,
+                                    "contract_id": contract_id,
+                                    "awarded_to": awarded_to,
+                                    "description": " ".join(description_parts) if description_parts else "",
+                                    "amount": None,
+                                    "source_url": page_url
+                                }
+                                
+                                contracts.append(contract_data)
+                        else:
+                            # For non-Awarded status, skip until next call/status pair
+                            while i < len(data_items):
+                                current_token = data_items[i].strip()
+                                if current_token.isdigit() and i + 1 < len(data_items):
+                                    next_check = data_items[i + 1].strip()
+                                    if next_check in known_statuses:
+                                        break  # Found next record
+                                i += 1
+                    else:
+                        i += 1
+                else:
+                    i += 1
+    
+    return contracts
+
+
+def _same_contracts(legacy: List[Dict], rows: List[Dict]) -> bool:
+    """
+    Whether rows match the legacy parser's output apart from its one known
+    difference: it skipped the District cell as if it were the county, so
+    the County cell leaked into the start of the description.
+    """
+    return len(legacy) == len(rows) and all(
+        {**old, "description": new["description"]} == new and old["description"].endswith(" " + new["description"])
+        for old, new in zip(legacy, rows)
+    )
+
+
+def _best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="Table rows per page")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per parser (best is reported)")
+    args = parser.parse_args()
+
+    html = kytc_letting_html(args.rows)
+    per_k = 1000 / args.rows
+    expected = legacy_parse_letting_page(html, "11/20/2025", "u")
+
+    candidates = [("legacy flat-token", lambda: legacy_parse_letting_page(html, "11/20/2025", "u"))]
+    for features in sorted({"html.parser", HTML_PARSER}):
+        rows = list(iter_letting_rows(html, "11/20/2025", "u", features=features))
+        assert _same_contracts(expected, rows), f"row parser ({features}) diverged from the legacy parser"
+        candidates.append((
+            f"row parser ({features})",
+            lambda features=features: list(iter_letting_rows(html, "11/20/2025", "u", features=features)),
+        ))
+
+    print(f"rows/page={args.rows} awarded={len(expected)}")
+    baseline = None
+    for name, fn in candidates:
+        elapsed = _best_of(args.repeat, fn) * per_k
+        baseline = baseline or elapsed
+        print(f"  {name:<26} {elapsed * 1000:8.1f} ms / 1k rows ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark incremental rescoring against rescoring every row.
+
+Seeds a SQLite file with scored contracts, changes one keyword weight and
+runs app.rescore twice from the same starting point: incrementally (only
+rows containing the changed keyword) and with every row treated as stale.
+
+Usage (from backend/):
+    python -m benchmarks.bench_rescore [--rows 1000000] [--keyword gravel]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, create_sqlite_engine
+from app.ingest.runner import upsert_contracts
+from app.models import ContractAward
+from app.rescore import record_scoring_version, rescore
+from app.scoring import KEYWORD_WEIGHTS, KeywordScorer
+from benchmarks.datagen import synthetic_contracts
+
+SEED_CHUNK = 100_000
+
+
+def seed(path, rows, scorer):
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    for start in range(0, rows, SEED_CHUNK):
+        chunk = synthetic_contracts(min(SEED_CHUNK, rows - start), seed=start)
+        for i, row in enumerate(chunk):
+            row["contract_id"] = str(start + i)
+            row["score_version"] = scorer.fingerprint
+        upsert_contracts(db, chunk)
+        db.commit()
+    record_scoring_version(db, scorer)
+    db.commit()
+    db.close()
+    engine.dispose()
+
+
+def timed_rescore(path, scorer, everything=False):
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    db = sessionmaker(bind=engine)()
+    if everything:
+        db.execute(update(ContractAward).values(score_version=None))
+        db.commit()
+    start = time.perf_counter()
+    result = rescore(db, scorer)
+    elapsed = time.perf_counter() - start
+    db.close()
+    engine.dispose()
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keyword", default="gravel", help="Keyword whose weight is changed")
+    args = parser.parse_args()
+
+    old = KeywordScorer(KEYWORD_WEIGHTS)
+    new = KeywordScorer({**KEYWORD_WEIGHTS, args.keyword: KEYWORD_WEIGHTS.get(args.keyword, 0) + 1})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, "base.db")
+        seed(base, args.rows, old)
+        print(f"rows={args.rows} changed weight: {args.keyword!r}")
+        for name, everything in (("incremental", False), ("full", True)):
+            path = os.path.join(tmp, f"{name}.db")
+            shutil.copy(base, path)
+            elapsed, result = timed_rescore(path, new, everything)
+            print(
+                f"  {name:<12} {elapsed:7.2f}s   rescored {result['rescored']:8d}   "
+                f"changed {result['changed']:8d}"
+            )
+
+
+if __name__ == "__main__":
+    main()
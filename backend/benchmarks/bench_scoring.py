@@ -0,0 +1,64 @@
+"""
+Benchmark the compiled keyword scorer against the original per-keyword loop.
+
+Usage (from backend/):
+    python -m benchmarks.bench_scoring [--count 100000]
+"""
+import argparse
+import json
+import time
+
+from app.scoring import KEYWORD_WEIGHTS, render_score_reasons, score_contract, score_many
+from benchmarks.datagen import synthetic_descriptions
+
+
+def legacy_score_contract(description: str, contract_id: str = "", awarded_to: str = "") -> dict:
+    """The scoring loop as it was before the table was compiled (two passes)."""
+    score = 0
+    reasons = []
+    text_to_search = f"{description} {contract_id} {awarded_to}".lower()
+    for keyword, weight in KEYWORD_WEIGHTS.items():
+        if keyword.lower() in text_to_search:
+            score += weight
+            reasons.append(f"Matched keyword '{keyword}' (+{weight} points)")
+    matches = sum(1 for kw in KEYWORD_WEIGHTS.keys() if kw.lower() in text_to_search)
+    if matches > 3:
+        bonus = (matches - 3) * 2
+        score += bonus
+        reasons.append(f"Multiple relevant keywords bonus (+{bonus} points)")
+    return {"score": score, "score_reasons": json.dumps(reasons) if reasons else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100_000, help="Number of synthetic descriptions")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    descriptions = synthetic_descriptions(args.count, seed=args.seed)
+    records = [{"description": d, "contract_id": "", "awarded_to": ""} for d in descriptions]
+
+    start = time.perf_counter()
+    legacy = [legacy_score_contract(d) for d in descriptions]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = [score_contract(d) for d in descriptions]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = score_many(records)
+    batch_time = time.perf_counter() - start
+
+    # Ingest stores batch matches and renders their reasons only when read
+    rendered = [{"score": r["score"], "score_reasons": render_score_reasons(r["matches"], r["score"])} for r in batch]
+    assert legacy == single == rendered, "compiled scorer diverged from the legacy loop"
+
+    print(f"descriptions:        {args.count}")
+    print(f"legacy loop:         {legacy_time:.3f}s")
+    print(f"score_contract:      {single_time:.3f}s ({legacy_time / single_time:.1f}x)")
+    print(f"score_many:          {batch_time:.3f}s ({legacy_time / batch_time:.1f}x, matches only)")
+
+
+if __name__ == "__main__":
+    main()
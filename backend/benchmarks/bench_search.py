@@ -0,0 +1,110 @@
+"""
+Benchmark GET /leads/search (FTS5) against a LIKE '%...%' scan.
+
+Seeds a SQLite file with synthetic contracts whose descriptions also name
+a county and a route number, builds the search index the way migration 4
+does for an existing database, then times each query both ways. The LIKE
+version returns the same shape of result (top matches by score), so both
+must find every match before the LIMIT applies.
+
+Usage (from backend/):
+    python -m benchmarks.bench_search [--rows 1000000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import and_, func, literal_column, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api.routes import LEAD_FIELDS, lead_filters, leads_search_query
+from app.api.search import match_expression
+from app.database import Base, create_sqlite_engine
+from app.ingest.runner import upsert_contracts
+from app.migrations import migrate
+from app.models import ContractAward, contract_awards_fts
+from benchmarks.datagen import KY_COUNTIES, synthetic_contracts
+
+SEED_CHUNK = 100_000
+LIMIT = 20
+
+
+def seed(path, rows):
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    rng = random.Random(7)
+    for start in range(0, rows, SEED_CHUNK):
+        chunk = synthetic_contracts(min(SEED_CHUNK, rows - start), seed=start)
+        for i, row in enumerate(chunk):
+            row["contract_id"] = str(start + i)
+            row["description"] += f", {rng.choice(KY_COUNTIES)} County, route {rng.randint(1, 9999)}"
+        upsert_contracts(db, chunk)
+        db.commit()
+    db.close()
+    start = time.perf_counter()
+    migrate(engine)  # Creates and backfills the FTS index
+    print(f"  index build {time.perf_counter() - start:.1f}s")
+    return engine
+
+
+def like_query(q, clauses):
+    searched = func.lower(ContractAward.description + " " + ContractAward.awarded_to + " " + ContractAward.contract_id)
+    terms = [searched.like(f"%{term.lower()}%") for term in q.split()]
+    return (
+        select(*[getattr(ContractAward, f) for f in LEAD_FIELDS])
+        .where(and_(*terms), *clauses)
+        .order_by(ContractAward.score.desc(), ContractAward.id)
+        .limit(LIMIT)
+    )
+
+
+def timed(db, stmt, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        db.execute(stmt).all()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def match_count(db, q):
+    fts = contract_awards_fts
+    return db.execute(
+        select(func.count()).select_from(fts).where(literal_column(fts.name).match(match_expression(q)))
+    ).scalar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    queries = [
+        (str(args.rows // 2), None),           # Contract id
+        ("route 4821", None),                  # Rare phrase
+        ("Pike county", None),                 # One county in fifteen
+        ("Pike county", "KY"),
+        ("gravel hauling", None),              # Common keywords
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"rows={args.rows}")
+        engine = seed(os.path.join(tmp, "search.db"), args.rows)
+        db = sessionmaker(bind=engine)()
+        for q, state in queries:
+            clauses = lead_filters(state, None, None)
+            fts_ms = timed(db, leads_search_query(match_expression(q), clauses, LEAD_FIELDS, LIMIT), args.repeat)
+            like_ms = timed(db, like_query(q, clauses), max(1, args.repeat // 10))
+            label = f"{q!r}" + (f" state={state}" if state else "")
+            print(f"  {label:<28} fts {fts_ms:9.2f} ms   like {like_ms:9.2f} ms   ({match_count(db, q)} matches)")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
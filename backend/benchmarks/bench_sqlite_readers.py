@@ -0,0 +1,99 @@
+"""
+Measure GET /leads query latency while a large ingest is writing.
+
+For each SQLite profile a fresh database is seeded, then one thread upserts
+a full re-ingest in a single transaction and commits it while another
+thread repeatedly runs the /leads page query on the read engine. The
+"legacy" profile is SQLite's defaults (rollback journal, synchronous=FULL,
+2 MB cache), where the writer's exclusive lock stalls readers; "wal" is
+the profile the app applies by default.
+
+Usage (from backend/):
+    python -m benchmarks.bench_sqlite_readers [--rows 100000]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.api.routes import LEAD_FIELDS, lead_filters, leads_page_query
+from app.database import Base, SQLiteProfile, create_sqlite_engine
+from app.ingest.runner import upsert_contracts
+from benchmarks.datagen import synthetic_contracts
+
+PROFILES = {
+    "legacy": SQLiteProfile(journal_mode="DELETE", synchronous="FULL", cache_size_kb=2000, mmap_size=0,
+                            busy_timeout_ms=60000),
+    "wal": SQLiteProfile(),
+}
+
+
+def run(profile: SQLiteProfile, seed_rows, ingest_rows, path):
+    url = f"sqlite:///{path}"
+    writer = create_sqlite_engine(url, profile=profile, pool_size=1, max_overflow=0)
+    reader = create_sqlite_engine(url, profile=profile, readonly=True)
+    Base.metadata.create_all(bind=writer)
+    Writer = sessionmaker(autocommit=False, autoflush=False, bind=writer)
+    Reader = sessionmaker(autocommit=False, autoflush=False, bind=reader)
+
+    db = Writer()
+    upsert_contracts(db, seed_rows)
+    db.commit()
+    db.close()
+
+    query = leads_page_query(lead_filters("KY", None, None), LEAD_FIELDS, None, 50)
+    done = threading.Event()
+    latencies = []
+
+    def read_loop():
+        session = Reader()
+        while not done.is_set():
+            start = time.perf_counter()
+            session.execute(query).all()
+            session.rollback()  # End the read transaction so the next query sees new commits
+            latencies.append(time.perf_counter() - start)
+        session.close()
+
+    thread = threading.Thread(target=read_loop)
+    thread.start()
+    start = time.perf_counter()
+    db = Writer()
+    upsert_contracts(db, ingest_rows)
+    db.commit()
+    db.close()
+    ingest_time = time.perf_counter() - start
+    done.set()
+    thread.join()
+
+    writer.dispose()
+    reader.dispose()
+    latencies.sort()
+    return ingest_time, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    seed_rows = synthetic_contracts(args.rows, seed=1)
+    ingest_rows = synthetic_contracts(args.rows, seed=2)  # Same keys, new descriptions: all updates
+
+    print(f"rows={args.rows}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, profile in PROFILES.items():
+            ingest_time, latencies = run(profile, seed_rows, ingest_rows, os.path.join(tmp, f"{name}.db"))
+            p50 = statistics.median(latencies) * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            print(
+                f"  {name:<7} ingest {ingest_time:6.2f}s   reads {len(latencies):6d}   "
+                f"p50 {p50:8.2f} ms   p99 {p99:8.2f} ms   max {latencies[-1] * 1000:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark the bulk upsert against the original per-row SELECT/ORM loop.
+
+Each size is run twice against a fresh SQLite file: a cold load (all rows
+new) and a re-ingest where 10% of rows changed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_upsert [--sizes 10000 100000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import and_, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.ingest.runner import upsert_contracts
+from app.models import ContractAward
+from benchmarks.datagen import synthetic_contracts
+
+
+def legacy_upsert(db, rows):
+    """The per-contract loop run_ingestion used before the bulk upsert."""
+    for contract_data in rows:
+        existing = db.query(ContractAward).filter(
+            and_(
+                ContractAward.state == contract_data["state"],
+                ContractAward.contract_id == contract_data["contract_id"]
+            )
+        ).first()
+        if existing:
+            existing.letting_date = contract_data["letting_date"]
+            existing.awarded_to = contract_data["awarded_to"]
+            existing.description = contract_data["description"]
+            existing.amount = contract_data.get("amount")
+            existing.source_url = contract_data["source_url"]
+            existing.score = contract_data["score"]
+        else:
+            db.add(ContractAward(**{k: v for k, v in contract_data.items() if k != "matches"}))
+
+
+def _time_run(upsert, rows, path):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    timings = []
+    for batch in rows:
+        db = Session()
+        start = time.perf_counter()
+        upsert(db, batch)
+        db.commit()
+        timings.append(time.perf_counter() - start)
+        db.close()
+    engine.dispose()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        initial = synthetic_contracts(size, seed=args.seed)
+        changed = [
+            {**row, "description": row["description"] + " (revised)"} if i % 10 == 0 else row
+            for i, row in enumerate(initial)
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy = _time_run(legacy_upsert, [initial, changed], os.path.join(tmp, "legacy.db"))
+            bulk = _time_run(upsert_contracts, [initial, changed], os.path.join(tmp, "bulk.db"))
+        print(f"rows={size}")
+        print(f"  cold load   legacy {legacy[0]:8.3f}s   bulk {bulk[0]:8.3f}s   ({legacy[0] / bulk[0]:.1f}x)")
+        print(f"  re-ingest   legacy {legacy[1]:8.3f}s   bulk {bulk[1]:8.3f}s   ({legacy[1] / bulk[1]:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
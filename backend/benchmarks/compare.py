@@ -0,0 +1,80 @@
+"""
+Compare two benchmark suite result files and flag regressions.
+
+A case regresses when its median time per item in the current results is
+more than `threshold` (a fraction) above the baseline's. Cases missing
+from either file, or run at a different size, are reported but never fail
+the check.
+
+Usage (from backend/):
+    python -m benchmarks.compare BASELINE.json CURRENT.json [--threshold 0.2]
+
+Exits with status 1 if any case regressed.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+# Default allowed slowdown before a case counts as a regression
+DEFAULT_THRESHOLD = 0.2
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) -> Tuple[List[str], List[str]]:
+    """
+    Compare suite results case by case.
+
+    Args:
+        baseline: Results loaded from the reference run
+        current: Results loaded from the run under test
+        threshold: Allowed fractional slowdown in median time per item
+
+    Returns:
+        (report lines, names of the cases that regressed)
+    """
+    lines = []
+    regressions = []
+    before = baseline.get("results", {})
+    after = current.get("results", {})
+    for name in sorted(before.keys() | after.keys()):
+        if name not in before or name not in after:
+            lines.append(f"{name:<14} only in {'current' if name in after else 'baseline'} results, skipped")
+            continue
+        if before[name]["items"] != after[name]["items"]:
+            lines.append(f"{name:<14} sizes differ ({before[name]['items']} vs {after[name]['items']}), skipped")
+            continue
+        old = before[name]["per_item_us"]
+        new = after[name]["per_item_us"]
+        change = new / old - 1 if old else 0.0
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        lines.append(
+            f"{name:<14} {old:10.2f} -> {new:10.2f} us/item  {change:+7.1%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return lines, regressions
+
+
+def load(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", help="Results JSON of the reference run")
+    parser.add_argument("current", help="Results JSON of the run under test")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed fractional slowdown (default 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    lines, regressions = compare(load(args.baseline), load(args.current), args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
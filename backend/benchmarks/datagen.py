@@ -0,0 +1,240 @@
+"""Seeded synthetic data generators for benchmarks."""
+import html
+import random
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+from app.scoring import KEYWORD_WEIGHTS, score_many
+
+# Filler vocabulary typical of highway letting descriptions
+FILLER_WORDS = [
+    "resurfacing", "asphalt", "paving", "bridge", "deck", "replacement", "culvert",
+    "drainage", "guardrail", "striping", "signage", "widening", "intersection",
+    "improvements", "route", "mile", "point", "county", "road", "shoulder",
+    "milling", "overlay", "pipe", "rehabilitation", "lighting", "sidewalk",
+]
+
+COMPANY_WORDS = [
+    "Bluegrass", "Hoosier", "Allen", "Hinkle", "Walker", "Ohio Valley", "Mountain",
+    "Central", "River", "Summit", "Jackson", "Stone", "Eagle", "Tri-State",
+]
+COMPANY_SUFFIXES = ["Paving, Inc.", "Construction Co.", "Contracting LLC", "Excavating", "& Sons"]
+
+
+def synthetic_descriptions(count: int, seed: int = 42, keyword_rate: float = 0.15) -> List[str]:
+    """
+    Generate contract descriptions mixing filler words and scoring keywords.
+
+    Args:
+        count: Number of descriptions to generate
+        seed: Random seed so runs are repeatable
+        keyword_rate: Probability that any given word is a scoring keyword
+
+    Returns:
+        List of description strings
+    """
+    rng = random.Random(seed)
+    keywords = list(KEYWORD_WEIGHTS)
+    descriptions = []
+    for _ in range(count):
+        words = [
+            rng.choice(keywords) if rng.random() < keyword_rate else rng.choice(FILLER_WORDS)
+            for _ in range(rng.randint(6, 30))
+        ]
+        descriptions.append(" ".join(words).capitalize())
+    return descriptions
+
+
+def synthetic_contracts(count: int, seed: int = 42, states=("KY", "IN")) -> List[Dict]:
+    """
+    Generate normalized, scored contract rows as run_ingestion upserts them.
+
+    Args:
+        count: Number of contracts to generate
+        seed: Random seed so runs are repeatable
+        states: State codes to spread contracts across
+
+    Returns:
+        List of contract dictionaries including 'score' and 'matches'
+    """
+    rng = random.Random(seed)
+    descriptions = synthetic_descriptions(count, seed=seed)
+    rows = []
+    for i, description in enumerate(descriptions):
+        row = {
+            "state": states[i % len(states)],
+            "letting_date": date(2025, 1, 1) + timedelta(days=rng.randrange(365)),
+            "contract_id": f"{250000 + i}",
+            "awarded_to": f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}",
+            "description": description,
+            "amount": None,
+            "source_url": "https://transportation.ky.gov/Construction-Procurement/Pages/Letting-Contracts.aspx",
+        }
+        rows.append(row)
+    for row, result in zip(rows, score_many(rows)):
+        row.update(result)
+    return rows
+
+
+def iter_raw_contracts(count: int, seed: int = 42) -> Iterator[Dict]:
+    """
+    Lazily generate raw KYTC source records, as ingest_kytc yields them.
+
+    Nothing is held between records, so a benchmark can stream millions of
+    them without the source itself dominating memory.
+
+    Args:
+        count: Number of records to generate
+        seed: Random seed so runs are repeatable
+
+    Yields:
+        Raw contract dictionaries (see ingest_kytc)
+    """
+    rng = random.Random(seed)
+    keywords = list(KEYWORD_WEIGHTS)
+    for i in range(count):
+        words = [
+            rng.choice(keywords) if rng.random() < 0.15 else rng.choice(FILLER_WORDS)
+            for _ in range(rng.randint(6, 30))
+        ]
+        yield {
+            "letting_date": date(2025, 1, 1) + timedelta(days=rng.randrange(365)),
+            "contract_id": f"{250000 + i}",
+            "awarded_to": f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}",
+            "description": " ".join(words).capitalize(),
+            "amount": None,
+            "source_url": "https://transportation.ky.gov/Construction-Procurement/Pages/Letting-Contracts.aspx",
+        }
+
+
+# Pieces of made-up surnames, so a large benchmark has enough distinct companies
+SURNAME_SYLLABLES = [
+    "bar", "ton", "wil", "son", "ham", "mer", "kin", "lo", "ver", "dan", "ford", "ley",
+    "ash", "by", "cal", "den", "gar", "hol", "ling", "mor", "ris", "ster", "wood", "bell",
+    "craw", "ell", "fitz", "gib", "har", "kel", "lan", "mac", "nor", "pen", "ran", "stan",
+    "quin", "thorn", "vick", "yar", "zel", "brook", "chad", "drum", "fen", "grif", "jes", "kirk",
+    "lund", "murph", "nash", "ost", "pruit", "rut", "shaw", "tuck", "ulm", "whit", "beck", "cobb",
+]
+TRADES = [
+    "Paving", "Construction", "Contracting", "Excavating", "Trucking", "Hauling",
+    "Asphalt", "Materials", "Bridge", "Grading", "Stone", "Concrete", "& Sons",
+]
+LEGAL_FORMS = ["", "", " Inc", " Inc.", ", Inc.", " INC", " LLC", ", LLC", " L.L.C.", " Co.", " Company", " Corp."]
+
+
+def _surname(rng: random.Random) -> str:
+    return "".join(rng.choice(SURNAME_SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def _typo(rng: random.Random, word: str) -> str:
+    """word with one inner letter dropped, replaced or swapped with the next."""
+    i = rng.randrange(1, len(word) - 2)
+    edit = rng.randrange(3)
+    if edit == 0:
+        return word[:i] + word[i + 1:]
+    if edit == 1:
+        return word[:i] + rng.choice("aeioulnrst") + word[i + 1:]
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def synthetic_contractor_names(count: int, seed: int = 42, variants: int = 5) -> List[Tuple[str, int]]:
+    """
+    Generate noisy awarded_to names of about count / variants companies.
+
+    Each name is a company's base name ("Bartonley Wilson Paving") with a
+    random legal form, case, "&"/"and" spelling, stray punctuation or
+    spacing, and for one name in five a typo in one of its words. No two
+    companies share a base name, but by chance some may be close.
+
+    Args:
+        count: Number of names to generate
+        seed: Random seed so runs are repeatable
+        variants: Average number of names per company
+
+    Returns:
+        List of (name, company number)
+    """
+    rng = random.Random(seed)
+    companies = []
+    seen = set()
+    while len(companies) < max(1, count // variants):
+        words = [_surname(rng)] + ([_surname(rng)] if rng.random() < 0.5 else []) + [rng.choice(TRADES)]
+        base = " ".join(words)
+        if base.lower() not in seen:
+            seen.add(base.lower())
+            companies.append(words)
+
+    names = []
+    for _ in range(count):
+        company = rng.randrange(len(companies))
+        words = list(companies[company])
+        if rng.random() < 0.2:
+            i = rng.choice([i for i, word in enumerate(words) if len(word) >= 6] or [0])
+            if len(words[i]) >= 6:
+                words[i] = _typo(rng, words[i])
+        name = " ".join(words) + rng.choice(LEGAL_FORMS)
+        if rng.random() < 0.2:
+            name = name.replace("&", "and")
+        case = rng.random()
+        if case < 0.3:
+            name = name.upper()
+        elif case < 0.35:
+            name = name.lower()
+        if rng.random() < 0.1:
+            name = name.replace(" ", "  ", 1) + rng.choice([".", ",", " "])
+        names.append((name, company))
+    return names
+
+
+KY_COUNTIES = [
+    "Fayette", "Jefferson", "Boone", "Kenton", "Pike", "Floyd", "Clark", "Madison",
+    "Warren", "Hardin", "Daviess", "Laurel", "Pulaski", "Scott", "Franklin",
+]
+KYTC_STATUSES = ["Awarded"] * 8 + ["Rejected", "Withdrawn"]
+
+
+def kytc_letting_html(rows: int, seed: int = 42, first_call: int = 100) -> str:
+    """
+    Generate a KYTC-style letting contracts page.
+
+    The layout mirrors the SharePoint letting page: a single table with the
+    Call / Status / Awarded To / Contract ID / District / County / Project
+    Description header and one row per call. Non-awarded calls have an empty
+    Awarded To cell.
+
+    Args:
+        rows: Number of calls on the page
+        seed: Random seed so runs are repeatable
+        first_call: Call number of the first row
+
+    Returns:
+        Page HTML
+    """
+    rng = random.Random(seed)
+    descriptions = synthetic_descriptions(rows, seed=seed)
+    body = []
+    for i, description in enumerate(descriptions):
+        status = rng.choice(KYTC_STATUSES)
+        awarded_to = ""
+        if status == "Awarded":
+            awarded_to = f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}"
+        cells = [
+            str(first_call + i),
+            status,
+            awarded_to,
+            str(250000 + seed * 10000 + i),
+            f"{rng.randint(1, 12):02d}",
+            rng.choice(KY_COUNTIES),
+            description,
+        ]
+        body.append("<tr>" + "".join(f"<td>{html.escape(c)}</td>" for c in cells) + "</tr>")
+    header = "".join(
+        f"<th>{h}</th>"
+        for h in ["Call", "Status", "Awarded To", "Contract ID", "District", "County", "Project Description"]
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>Letting Contracts</title></head><body>"
+        "<div class=\"ms-rtestate-field\"><h2>Letting Contracts</h2>"
+        f"<table class=\"ms-rteTable-default\"><thead><tr>{header}</tr></thead>"
+        f"<tbody>{''.join(body)}</tbody></table></div></body></html>"
+    )
@@ -0,0 +1,203 @@
+"""
+Repeatable benchmark suite for the whole pipeline, with JSON results.
+
+Cases, all on seeded synthetic data (benchmarks.datagen):
+    scoring       score_contract over synthetic descriptions
+    kytc_parse    parse_letting_page on a generated KYTC letting page
+    ingest        run_ingestion from a synthetic source into a fresh SQLite file
+    leads         GET /leads through the FastAPI test client (response cache cleared)
+
+Each case runs --repeat times after one warm-up run; the JSON records the
+min/median/max wall time and the median time per item, so results from
+different commits can be compared with benchmarks.compare.
+
+Usage (from backend/):
+    python -m benchmarks.suite [--size small|medium|large] [--output results.json]
+                               [--baseline previous.json] [--threshold 0.2]
+
+With --baseline, exits with status 1 if any case regressed.
+"""
+import argparse
+import os
+import tempfile
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp.name}/suite.db"
+os.environ.setdefault("INGEST_CACHE_DIR", os.path.join(_tmp.name, "http_cache"))
+
+import json  # noqa: E402
+import platform  # noqa: E402
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+from datetime import datetime, timezone  # noqa: E402
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.response_cache import leads_cache  # noqa: E402
+from app.database import Base, SessionLocal, create_sqlite_engine, init_db  # noqa: E402
+from app.ingest import runner  # noqa: E402
+from app.ingest.cache import PageCache  # noqa: E402
+from app.ingest.kytc import normalize_kytc, parse_letting_page  # noqa: E402
+from app.ingest.sources import Source  # noqa: E402
+from app.main import app  # noqa: E402
+from app.migrations import migrate  # noqa: E402
+from app.scoring import score_contract  # noqa: E402
+from benchmarks.compare import DEFAULT_THRESHOLD, compare, load  # noqa: E402
+from benchmarks.datagen import iter_raw_contracts, kytc_letting_html, synthetic_contracts, synthetic_descriptions  # noqa: E402
+
+# Items per case for each size preset
+SIZES = {
+    "small": {"scoring": 20_000, "kytc_parse": 500, "ingest": 5_000, "leads_rows": 10_000, "leads": 200},
+    "medium": {"scoring": 100_000, "kytc_parse": 2_000, "ingest": 50_000, "leads_rows": 100_000, "leads": 500},
+    "large": {"scoring": 500_000, "kytc_parse": 10_000, "ingest": 200_000, "leads_rows": 1_000_000, "leads": 1_000},
+}
+
+
+def bench_scoring(n, seed):
+    descriptions = synthetic_descriptions(n, seed=seed)
+
+    def run():
+        for description in descriptions:
+            score_contract(description)
+    return None, run
+
+
+def bench_kytc_parse(n, seed):
+    html = kytc_letting_html(n, seed=seed)
+    url = "https://transportation.ky.gov/Construction-Procurement/Pages/Letting-Contracts.aspx"
+
+    def run():
+        parse_letting_page(html, "11/20/2025", url)
+    return None, run
+
+
+def bench_ingest(n, seed):
+    """run_ingestion inserting n records into a fresh database each run."""
+    state = {}
+    source = Source("kytc", fetch=lambda **kwargs: iter_raw_contracts(n, seed=seed), normalize=normalize_kytc)
+
+    def setup():
+        workdir = tempfile.mkdtemp(dir=_tmp.name)
+        engine = create_sqlite_engine(f"sqlite:///{workdir}/ingest.db")
+        Base.metadata.create_all(bind=engine)
+        migrate(engine)
+        state.update(engine=engine, db=sessionmaker(bind=engine)(), cache=PageCache(workdir))
+
+    def run():
+        try:
+            result = runner.run_ingestion(state["db"], cache=state["cache"], sources=[source])
+            assert result["inserted"] == n
+        finally:
+            state["db"].close()
+            state["engine"].dispose()
+    return setup, run
+
+
+def bench_leads(n, seed, rows):
+    """n GET /leads requests with varied filters against rows stored leads."""
+    db = SessionLocal()
+    try:
+        runner.upsert_contracts(db, synthetic_contracts(rows, seed=seed))
+        db.commit()
+    finally:
+        db.close()
+    client = TestClient(app)
+    queries = [
+        {"state": ("KY", "IN", None)[i % 3], "min_score": i % 30, "limit": 50}
+        for i in range(n)
+    ]
+
+    def run():
+        for query in queries:
+            leads_cache.clear()
+            params = {k: v for k, v in query.items() if v is not None}
+            response = client.get("/leads", params=params)
+            assert response.status_code == 200
+    return None, run
+
+
+def measure(setup, run, repeat):
+    """Wall times of repeat runs after one warm-up, setup excluded."""
+    times = []
+    for i in range(repeat + 1):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        if i:
+            times.append(elapsed)
+    return times
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--cases", nargs="+", choices=["scoring", "kytc_parse", "ingest", "leads"])
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed fractional slowdown per case (default 0.2)")
+    args = parser.parse_args()
+
+    init_db()
+    sizes = SIZES[args.size]
+    cases = {
+        "scoring": lambda: bench_scoring(sizes["scoring"], args.seed),
+        "kytc_parse": lambda: bench_kytc_parse(sizes["kytc_parse"], args.seed),
+        "ingest": lambda: bench_ingest(sizes["ingest"], args.seed),
+        "leads": lambda: bench_leads(sizes["leads"], args.seed, sizes["leads_rows"]),
+    }
+
+    results = {}
+    for name in args.cases or cases:
+        setup, run = cases[name]()
+        times = measure(setup, run, args.repeat)
+        median = statistics.median(times)
+        results[name] = {
+            "items": sizes[name],
+            "seconds": {"min": min(times), "median": median, "max": max(times)},
+            "per_item_us": median / sizes[name] * 1e6,
+        }
+        print(f"{name:<14} {sizes[name]:>8} items  median {median:8.3f}s  {results[name]['per_item_us']:10.2f} us/item")
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "size": args.size,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        lines, regressions = compare(load(args.baseline), report, args.threshold)
+        print("\n".join(lines))
+        if regressions:
+            print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
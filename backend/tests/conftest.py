@@ -0,0 +1,124 @@
+"""Shared test fixtures."""
+import os
+import tempfile
+
+# Keep the app's default engine and page cache off /data while tests import them
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("INGEST_CACHE_DIR", tempfile.mkdtemp(prefix="page-cache-"))
+# Tests start ingests themselves; the app's startup must not schedule any
+os.environ.setdefault("INGEST_SCHEDULER_ENABLED", "false")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, create_sqlite_engine
+from app.migrations import migrate
+import app.models  # noqa: F401  (registers the tables on Base)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """SQLite engine with the app's connection profile on a fresh database built as init_db() does."""
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """Database session bound to the temporary engine."""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(engine):
+    """API test client whose requests use the temporary database."""
+    from fastapi.testclient import TestClient
+
+    from app.api.response_cache import leads_cache
+    from app.database import get_db, get_read_db, get_read_session_factory, get_session_factory
+    from app.main import app
+
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: Session
+    app.dependency_overrides[get_read_session_factory] = lambda: Session
+    # Every test database starts at data version 0, so cached pages must not carry over
+    leads_cache.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def fake_source(monkeypatch):
+    """
+    Replace the fetch callable of a registered ingest source for one test.
+
+    Call as fake_source("kytc", fetch, timeout=...); extra keywords change
+    other Source fields.
+    """
+    from dataclasses import replace
+    from app.ingest.sources import SOURCES, get_sources
+
+    get_sources()
+
+    def fake(name, fetch, **changes):
+        monkeypatch.setitem(SOURCES, name, replace(SOURCES[name], fetch=fetch, **changes))
+    return fake
+
+
+# contract_awards as create_all() built it before any migrations existed
+LEGACY_SCHEMA = [
+    """CREATE TABLE contract_awards (
+        id INTEGER NOT NULL,
+        state VARCHAR(2) NOT NULL,
+        letting_date DATE NOT NULL,
+        contract_id VARCHAR NOT NULL,
+        awarded_to VARCHAR NOT NULL,
+        description TEXT NOT NULL,
+        amount VARCHAR,
+        source_url VARCHAR NOT NULL,
+        score INTEGER,
+        score_reasons TEXT,
+        status VARCHAR(9),
+        created_at DATETIME DEFAULT (CURRENT_TIMESTAMP),
+        updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP),
+        PRIMARY KEY (id)
+    )""",
+    "CREATE INDEX ix_contract_awards_id ON contract_awards (id)",
+    "CREATE INDEX ix_contract_awards_state ON contract_awards (state)",
+    "CREATE INDEX ix_contract_awards_letting_date ON contract_awards (letting_date)",
+    "CREATE INDEX ix_contract_awards_contract_id ON contract_awards (contract_id)",
+    "CREATE INDEX ix_contract_awards_score ON contract_awards (score)",
+    "CREATE INDEX ix_contract_awards_status ON contract_awards (status)",
+]
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """SQLite engine on a database with the pre-migration schema and no user_version."""
+    from sqlalchemy import text
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for ddl in LEGACY_SCHEMA:
+            conn.execute(text(ddl))
+    yield engine
+    engine.dispose()
@@ -0,0 +1,27 @@
+"""Tests for contract amount parsing."""
+import pytest
+
+from app.amount import parse_amount_cents
+
+
+@pytest.mark.parametrize("raw,cents", [
+    ("$1,234,567.89", 123456789),
+    ("1234567", 123456700),
+    ("  $ 500,000 ", 50000000),
+    ("USD 2,500", 250000),
+    ("$1.2M", 120000000),
+    ("750k", 75000000),
+    ("$3 million", 300000000),
+    ("(1,000.00)", -100000),
+    ("$12.345", 1235),
+    (".5", 50),
+])
+def test_parse_amount_cents(raw, cents):
+    """Test the amount formats sources publish."""
+    assert parse_amount_cents(raw) == cents
+
+
+@pytest.mark.parametrize("raw", [None, "", "$", "TBD", "1,23", "1.2.3", "(100", "$5 per ton"])
+def test_parse_amount_cents_rejects_non_amounts(raw):
+    """Test that anything not recognisably an amount parses to None."""
+    assert parse_amount_cents(raw) is None
@@ -0,0 +1,521 @@
+"""Tests for the API routes."""
+import asyncio
+import json
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from app.models import ContractAward, ContractStatus
+
+
+def _lead(contract_id, score, state="KY", status=ContractStatus.NEW, description="Dump truck hauling",
+          amount_cents=None):
+    return ContractAward(
+        state=state,
+        letting_date=date(2025, 11, 20),
+        contract_id=contract_id,
+        awarded_to="ABC Paving",
+        description=description,
+        source_url="https://example.test/letting",
+        score=score,
+        status=status,
+        amount=None if amount_cents is None else f"${amount_cents / 100:,.2f}",
+        amount_cents=amount_cents,
+    )
+
+
+@pytest.fixture
+def leads(db):
+    """Twenty-five leads across two states, with tied scores."""
+    rows = [
+        _lead(str(100 + i), score=i % 5 * 10, state="KY" if i % 2 else "IN",
+              status=ContractStatus.CONTACTED if i % 3 == 0 else ContractStatus.NEW)
+        for i in range(25)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def _all_pages(client, **params):
+    pages = []
+    cursor = None
+    while True:
+        response = client.get("/leads", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.json()
+        pages.append(body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_get_leads_pages_cover_every_row_once_in_order(client, leads):
+    """Test that walking the cursor returns each lead once, by score desc then id."""
+    pages = _all_pages(client, limit=7)
+
+    assert [len(p) for p in pages] == [7, 7, 7, 4]
+    items = [item for page in pages for item in page]
+    assert [(i["score"], i["id"]) for i in items] == sorted(
+        ((lead.score, lead.id) for lead in leads), key=lambda key: (-key[0], key[1])
+    )
+
+
+def test_get_leads_cursor_respects_filters(client, leads):
+    """Test that filters apply to every page."""
+    pages = _all_pages(client, limit=3, state="ky", status="new", min_score=10)
+    items = [item for page in pages for item in page]
+
+    expected = [l for l in leads if l.state == "KY" and l.status == ContractStatus.NEW and l.score >= 10]
+    assert sorted(i["id"] for i in items) == sorted(l.id for l in expected)
+
+
+def test_get_leads_fields_projection(client, leads):
+    """Test that `fields` limits the returned keys."""
+    response = client.get("/leads", params={"fields": "contract_id,score", "limit": 2})
+
+    assert response.status_code == 200
+    assert [set(item) for item in response.json()["items"]] == [{"contract_id", "score"}] * 2
+
+
+def test_get_leads_full_rows_match_response_schema(client, leads):
+    """Test that unprojected rows keep the ContractAwardResponse shape."""
+    item = client.get("/leads", params={"limit": 1}).json()["items"][0]
+
+    assert item["letting_date"] == "2025-11-20"
+    assert item["status"] in ("new", "contacted")
+    assert {"id", "description", "score_reasons", "created_at", "updated_at"} <= set(item)
+
+
+def test_get_leads_updated_since(client, db, leads):
+    """Test filtering on the last change time, with and without a UTC offset."""
+    from sqlalchemy import text
+
+    db.execute(text("UPDATE contract_awards SET updated_at = '2025-11-20 08:00:00'"))
+    db.execute(text("UPDATE contract_awards SET updated_at = '2025-11-21 12:00:00' WHERE contract_id IN ('101', '102')"))
+    db.commit()
+
+    def ids(**params):
+        items = client.get("/leads", params=params).json()["items"]
+        return sorted(item["contract_id"] for item in items)
+
+    assert ids(updated_since="2025-11-21T12:00:00") == ["101", "102"]
+    assert ids(updated_since="2025-11-21T07:00:00-05:00") == ["101", "102"]
+    assert ids(updated_since="2025-11-21T12:00:01Z") == []
+    assert len(ids(updated_since="2025-11-20T00:00:00Z")) == 25
+
+
+@pytest.fixture
+def priced_leads(db):
+    """Leads with amounts from $0 to $1.1M in $100k steps, plus two without one."""
+    rows = [
+        _lead(str(200 + i), score=i % 3, state="KY" if i % 2 else "IN", amount_cents=(i % 12) * 10_000_000)
+        for i in range(12)
+    ] + [_lead("300", score=50), _lead("301", score=0)]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def test_get_leads_amount_range(client, priced_leads):
+    """Test min_amount/max_amount (in dollars) on both sorts."""
+    for sort in ("score", "amount"):
+        items = [item for page in _all_pages(client, limit=2, min_amount=500000, max_amount=800000, sort=sort)
+                 for item in page]
+        assert sorted(i["amount_cents"] for i in items) == [50_000_000, 60_000_000, 70_000_000, 80_000_000]
+
+    items = client.get("/leads", params={"min_amount": 1000000, "state": "KY"}).json()["items"]
+    assert [i["contract_id"] for i in items] == ["211"]
+
+
+def test_get_leads_sort_by_amount_pages_largest_first(client, priced_leads):
+    """Test that sort=amount walks every lead with an amount, largest first, then id."""
+    pages = _all_pages(client, limit=5, sort="amount", fields="contract_id,amount_cents")
+
+    items = [item for page in pages for item in page]
+    assert [i["amount_cents"] for i in items] == sorted((l.amount_cents for l in priced_leads
+                                                         if l.amount_cents is not None), reverse=True)
+    assert set(items[0]) == {"contract_id", "amount_cents"}
+
+
+def test_get_leads_cursor_is_tied_to_its_sort(client, priced_leads):
+    """Test that a cursor from one sort is rejected by the other."""
+    cursor = client.get("/leads", params={"limit": 2, "sort": "amount"}).json()["next_cursor"]
+
+    assert client.get("/leads", params={"cursor": cursor}).status_code == 400
+    assert client.get("/leads", params={"cursor": cursor, "sort": "amount"}).status_code == 200
+
+
+@pytest.fixture
+def scored_leads(db):
+    """Leads stored as an ingest stores them, keyword matches included."""
+    from app.ingest.runner import upsert_contracts
+    from app.rescore import record_scoring_version
+    from app.scoring import get_scorer
+
+    descriptions = ["Dump truck hauling for earthwork", "Earthwork and grading", "Bridge painting", "Gravel hauling"]
+    rows = []
+    for i, description in enumerate(descriptions):
+        row = {"state": "KY" if i % 2 else "IN", "letting_date": date(2025, 11, 20), "contract_id": str(500 + i),
+               "awarded_to": "ABC Paving", "description": description, "amount": None, "source_url": "u"}
+        rows.append({**row, **get_scorer().score(description, row["contract_id"], row["awarded_to"])})
+    record_scoring_version(db, get_scorer())
+    upsert_contracts(db, rows)
+    db.commit()
+    return rows
+
+
+def test_get_leads_keyword_filter(client, scored_leads):
+    """Test keyword= on its own, with other filters and on the other endpoints."""
+    def ids(path="/leads", **params):
+        return sorted(item["contract_id"] for item in client.get(path, params=params).json()["items"])
+
+    assert ids(keyword="earthwork") == ["500", "501"]
+    assert ids(keyword=" EarthWork ", state="KY") == ["501"]
+    assert ids(keyword="haul") == ["500", "503"]
+    assert ids(keyword="asphalt") == []
+    assert ids("/leads/search", q="hauling", keyword="gravel") == ["503"]
+    export = client.get("/leads/export", params={"keyword": "grading", "fields": "contract_id"})
+    assert [json.loads(line) for line in export.text.splitlines()] == [{"contract_id": "501"}]
+
+
+def test_get_leads_renders_score_reasons_from_matches(client, db, scored_leads):
+    """Test that score_reasons reads exactly as scoring used to store it."""
+    from app.models import ContractAward
+    from app.scoring import score_contract
+
+    items = client.get("/leads", params={"fields": "contract_id,description,score_reasons"}).json()["items"]
+    expected = {row["contract_id"]: score_contract(row["description"], row["contract_id"], row["awarded_to"])
+                for row in scored_leads}
+
+    assert {i["contract_id"]: i["score_reasons"] for i in items} == {
+        contract_id: result["score_reasons"] for contract_id, result in expected.items()
+    }
+    lead = db.query(ContractAward).filter_by(contract_id="500").one()
+    assert lead.score_reasons == expected["500"]["score_reasons"]
+
+
+@pytest.mark.parametrize("params", [
+    {"fields": "contract_id,password"},
+    {"cursor": "not-a-cursor"},
+    {"status": "archived"},
+    {"sort": "letting_date"},
+    {"min_amount": -1},
+])
+def test_get_leads_rejects_bad_parameters(client, leads, params):
+    """Test 400 responses for unknown fields, forged cursors, bad statuses and sorts."""
+    assert client.get("/leads", params=params).status_code in (400, 422)
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    """Fresh job manager so no ingest job leaks between tests."""
+    from app.api import routes
+    from app.ingest.jobs import JobManager
+
+    manager = JobManager()
+    monkeypatch.setattr(routes, "job_manager", manager)
+    return manager
+
+
+@pytest.fixture
+def blocking_sources(fake_source):
+    """KYTC source that blocks until the test releases it."""
+    release = threading.Event()
+
+    def ingest_kytc(**kwargs):
+        assert release.wait(timeout=10)
+        return [{
+            "letting_date": date(2025, 11, 20), "contract_id": "900", "awarded_to": "ABC Paving",
+            "description": "Dump truck hauling", "amount": None, "source_url": "u",
+        }]
+
+    fake_source("kytc", ingest_kytc)
+    fake_source("indot", lambda **kwargs: [])
+    return release
+
+
+def test_ingest_run_returns_job_while_ingest_continues(client, jobs, blocking_sources):
+    """Test that POST /ingest/run returns at once and other routes stay responsive."""
+    response = client.post("/ingest/run")
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "running"
+
+    # The ingest is still blocked in its fetch stage, yet the API answers
+    assert client.get("/health").json()["status"] == "healthy"
+    assert client.get("/leads").status_code == 200
+    deadline = time.monotonic() + 5
+    polled = client.get(f"/ingest/jobs/{job['id']}").json()
+    while polled["stage"] is None and time.monotonic() < deadline:  # Still taking the lease
+        time.sleep(0.01)
+        polled = client.get(f"/ingest/jobs/{job['id']}").json()
+    assert (polled["status"], polled["stage"]) == ("running", "fetch")
+
+    # An overlapping run coalesces onto the running job
+    again = client.post("/ingest/run")
+    assert again.status_code == 200
+    assert again.json()["id"] == job["id"]
+
+    blocking_sources.set()
+    assert jobs.get(job["id"]).wait(timeout=10)
+
+    done = client.get(f"/ingest/jobs/{job['id']}").json()
+    assert done["status"] == "succeeded"
+    assert done["result"]["inserted"] == 1
+    assert {"fetch", "score", "upsert", "commit"} <= set(done["timings"])
+    assert done["progress"]["total_processed"] == 1
+    kytc = done["result"]["sources"]["kytc"]
+    assert (kytc["status"], kytc["records"], kytc["error"]) == ("succeeded", 1, None)
+    assert client.get("/leads").json()["items"][0]["contract_id"] == "900"
+
+
+def test_ingest_job_failure_is_reported(client, jobs, fake_source, monkeypatch):
+    """Test that an exception in the pipeline marks the job failed."""
+    from app.ingest import runner
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    fake_source("kytc", lambda **kwargs: [{
+        "letting_date": date(2025, 11, 20), "contract_id": "900", "awarded_to": "ABC Paving",
+        "description": "Dump truck hauling", "amount": None, "source_url": "u",
+    }])
+    fake_source("indot", lambda **kwargs: [])
+    monkeypatch.setattr(runner, "upsert_contracts", broken)
+
+    job_id = client.post("/ingest/run").json()["id"]
+    assert jobs.get(job_id).wait(timeout=10)
+
+    job = client.get(f"/ingest/jobs/{job_id}").json()
+    assert job["status"] == "failed"
+    assert "disk full" in job["error"]
+
+
+def test_ingest_job_refused_while_another_process_ingests(client, db, jobs, fake_source):
+    """Test that POST /ingest/run does not ingest while another worker holds the ingest lease."""
+    from app.ingest.lease import INGEST_LEASE, acquire_lease
+
+    fetched = []
+    fake_source("kytc", lambda **kwargs: fetched.append("kytc") or [])
+    fake_source("indot", lambda **kwargs: [])
+    acquire_lease(db, INGEST_LEASE, "other-worker")
+
+    job_id = client.post("/ingest/run").json()["id"]
+    assert jobs.get(job_id).wait(timeout=10)
+
+    job = client.get(f"/ingest/jobs/{job_id}").json()
+    assert job["status"] == "failed"
+    assert "LeaseHeld" in job["error"] and "other-worker" in job["error"]
+    assert fetched == []
+
+
+def test_ingest_job_reports_failed_source(client, jobs, fake_source):
+    """Test that a failing source leaves the job succeeded with a partial result."""
+    def broken(**kwargs):
+        raise RuntimeError("source exploded")
+
+    fake_source("kytc", broken)
+    fake_source("indot", lambda **kwargs: [])
+
+    job_id = client.post("/ingest/run").json()["id"]
+    assert jobs.get(job_id).wait(timeout=10)
+
+    job = client.get(f"/ingest/jobs/{job_id}").json()
+    assert job["status"] == "succeeded"
+    assert job["result"]["status"] == "partial"
+    assert job["result"]["sources"]["kytc"]["status"] == "failed"
+    assert job["result"]["sources"]["kytc"]["error"] == "RuntimeError: source exploded"
+
+
+def test_get_ingest_job_unknown_id(client, jobs):
+    """Test 404 for a job id that was never issued."""
+    assert client.get("/ingest/jobs/nope").status_code == 404
+
+
+def test_database_routes_are_offloaded_from_event_loop():
+    """Test that no async handler takes a blocking database session."""
+    from fastapi.routing import APIRoute
+
+    from app.database import get_db, get_read_db
+    from app.main import app
+
+    def uses_db(dependant):
+        return any(d.call in (get_db, get_read_db) or uses_db(d) for d in dependant.dependencies)
+
+    db_routes = [r for r in app.routes if isinstance(r, APIRoute) and uses_db(r.dependant)]
+    assert db_routes
+    for route in db_routes:
+        assert not asyncio.iscoroutinefunction(route.endpoint), route.path
+
+
+@pytest.fixture
+def rescore_jobs(monkeypatch):
+    """Fresh rescore job manager so no job leaks between tests."""
+    from app.api import routes
+    from app.ingest.jobs import JobManager
+
+    manager = JobManager()
+    monkeypatch.setattr(routes, "rescore_job_manager", manager)
+    return manager
+
+
+def test_rescore_job_rescores_unversioned_leads(client, rescore_jobs, db, leads):
+    """Test that POST /admin/rescore rescores rows and reports the counts."""
+    from app.scoring import score_contract
+
+    response = client.post("/admin/rescore")
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert rescore_jobs.get(job_id).wait(timeout=10)
+
+    job = client.get(f"/admin/rescore/jobs/{job_id}").json()
+    assert job["status"] == "succeeded"
+    assert job["result"]["candidates"] == job["result"]["rescored"] == len(leads)
+    assert job["result"]["changed"] == len(leads)  # Fixture scores were made up
+
+    db.expire_all()
+    expected = score_contract("Dump truck hauling", "100", "ABC Paving")["score"]
+    assert {lead.score for lead in db.query(ContractAward)} == {expected}
+    assert client.get("/admin/rescore/jobs/nope").status_code == 404
+
+
+@pytest.fixture
+def searchable(db):
+    """Leads with distinct text for full-text search."""
+    rows = [
+        _lead("301", 10, description="Crushed stone base, Fayette County"),
+        _lead("302", 30, description="Crushed stone and gravel hauling, Pike County", state="IN"),
+        _lead("303", 20, description="Bridge deck overlay, Fayette County"),
+        _lead("304", 5, description="Stone stone stone wall repair", status=ContractStatus.IGNORED),
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def test_search_leads_ranks_matches_with_snippets(client, searchable):
+    """Test that every word must match and results carry highlighted snippets."""
+    response = client.get("/leads/search", params={"q": "crushed stone"})
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert {i["contract_id"] for i in items} == {"301", "302"}
+    assert items[0]["rank"] <= items[1]["rank"]
+    assert "<mark>Crushed</mark> <mark>stone</mark>" in items[0]["snippet"]
+
+
+def test_search_leads_stems_and_searches_contractor_and_id(client, searchable):
+    """Test that stemming applies and awarded_to/contract_id are searchable."""
+    assert [i["contract_id"] for i in client.get("/leads/search", params={"q": "haul"}).json()["items"]] == ["302"]
+    assert len(client.get("/leads/search", params={"q": "ABC paving"}).json()["items"]) == 4
+    assert [i["contract_id"] for i in client.get("/leads/search", params={"q": "303"}).json()["items"]] == ["303"]
+
+
+def test_search_leads_applies_filters_and_projection(client, searchable):
+    """Test the /leads filters and fields parameter on search."""
+    response = client.get(
+        "/leads/search", params={"q": "stone", "state": "KY", "status": "new", "fields": "contract_id,score"}
+    )
+
+    items = response.json()["items"]
+    assert [i["contract_id"] for i in items] == ["301"]
+    assert set(items[0]) == {"contract_id", "score", "snippet", "rank"}
+    assert client.get("/leads/search", params={"q": "stone", "min_score": 25}).json()["items"][0]["contract_id"] == "302"
+
+
+@pytest.mark.parametrize("q", ['stone"', "stone OR", "-stone", "description:stone", "stone*", "NEAR(stone"])
+def test_search_leads_treats_query_syntax_as_text(client, searchable, q):
+    """Test that FTS5 operators in user input never cause a syntax error."""
+    assert client.get("/leads/search", params={"q": q}).status_code == 200
+
+
+def test_search_leads_rejects_empty_query(client, searchable):
+    """Test 400 for a query without any terms."""
+    assert client.get("/leads/search", params={"q": "   "}).status_code == 400
+    assert client.get("/leads/search").status_code == 422
+
+
+def test_get_leads_etag_and_not_modified(client, leads):
+    """Test that an unchanged poll with If-None-Match gets an empty 304."""
+    from app.api.response_cache import leads_cache
+
+    first = client.get("/leads", params={"state": "KY", "limit": 5})
+    etag = first.headers["etag"]
+
+    again = client.get("/leads", params={"state": "ky", "limit": "5"}, headers={"If-None-Match": etag})
+
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert leads_cache.hits == 1  # Same normalized parameters, served from the cache
+    assert client.get("/leads", params={"state": "KY", "limit": 5}).json() == first.json()
+
+
+def test_get_leads_cache_invalidated_by_status_update(client, leads):
+    """Test that a status change produces a new page and ETag."""
+    first = client.get("/leads", params={"status": "new"})
+    lead_id = first.json()["items"][0]["id"]
+
+    client.post(f"/leads/{lead_id}/status", json={"status": "ignored"})
+    second = client.get("/leads", params={"status": "new"}, headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    assert lead_id not in [item["id"] for item in second.json()["items"]]
+
+
+def test_get_leads_cache_invalidated_by_ingest(client, db, leads, fake_source):
+    """Test that an ingest that changes rows invalidates cached pages, and a no-op one does not."""
+    from app.ingest.runner import run_ingestion
+
+    raw = [{"letting_date": date(2025, 11, 20), "contract_id": "999", "awarded_to": "ABC Paving",
+            "description": "Dump truck hauling", "amount": None, "source_url": "u"}]
+    fake_source("kytc", lambda **kwargs: raw)
+    fake_source("indot", lambda **kwargs: [])
+    etag = client.get("/leads").headers["etag"]
+
+    run_ingestion(db)
+    changed = client.get("/leads")
+    run_ingestion(db)
+    unchanged = client.get("/leads", headers={"If-None-Match": changed.headers["etag"]})
+
+    assert changed.headers["etag"] != etag
+    assert "999" in [item["contract_id"] for item in changed.json()["items"]]
+    assert unchanged.status_code == 304
+
+
+def test_metrics_exposes_request_latency_and_ingest_counters(client):
+    """Test that GET /metrics reports per-route latency and declares the ingest metrics."""
+    client.get("/leads")
+    client.post("/leads/999999/status", json={"status": "contacted"})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/leads",status="200"}' in text
+    assert 'method="POST",route="/leads/{lead_id}/status",status="404"' in text
+    assert "# TYPE ingest_stage_seconds histogram" in text
+
+
+def test_list_ingest_runs(client, db, fake_source):
+    """Test that stored run summaries are listed newest first."""
+    from app.ingest import runner
+
+    raw = {
+        "letting_date": date(2025, 11, 20), "contract_id": "900", "awarded_to": "ABC Paving",
+        "description": "Dump truck hauling", "amount": None, "source_url": "u",
+    }
+    fake_source("kytc", lambda **kwargs: [raw])
+    fake_source("indot", lambda **kwargs: [])
+    first = runner.run_ingestion(db)
+    second = runner.run_ingestion(db)
+
+    runs = client.get("/ingest/runs").json()
+    assert [r["id"] for r in runs] == [second["run_id"], first["run_id"]]
+    assert runs[0]["status"] == "succeeded"
+    assert runs[0]["counts"]["unchanged"] == 1
+    assert "kytc" in runs[0]["summary"]["sources"]
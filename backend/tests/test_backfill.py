@@ -0,0 +1,67 @@
+"""Tests for the lettings backfill."""
+from datetime import date, timedelta
+
+from app.ingest.backfill import backfill
+from app.ingest.kytc import normalize_kytc
+from app.ingest.sources import Source
+from app.ingest.watermark import load_watermark
+from app.models import ContractAward
+
+LETTINGS = [date(2025, 1, 16) + timedelta(weeks=4 * i) for i in range(5)]
+
+
+def _source(calls, fail_on=None):
+    """Source with five lettings of one contract each, recording the batches it is asked for."""
+    def fetch(letting_dates=None, cache=None, stats=None, watermark=None):
+        calls.append(list(letting_dates))
+        for letting in letting_dates:
+            if letting == fail_on:
+                raise RuntimeError("letting page vanished")
+            yield {
+                "letting_date": letting, "contract_id": letting.isoformat(), "awarded_to": "ABC Paving",
+                "description": "Dump truck hauling", "amount": None, "source_url": "u",
+            }
+            watermark.complete(letting, 1)
+
+    return Source("kytc", fetch=fetch, normalize=normalize_kytc, discover=lambda: LETTINGS)
+
+
+def test_backfill_runs_resumable_batches_newest_first(db):
+    """Test that each batch is its own run and a later backfill picks up where the last stopped."""
+    calls = []
+
+    first = backfill(db, [_source(calls)], batch_size=2, max_batches=2)
+
+    assert calls == [[LETTINGS[4], LETTINGS[3]], [LETTINGS[2], LETTINGS[1]]]
+    assert first["kytc"]["batches"] == 2
+    assert first["kytc"]["lettings"] == 4
+    assert first["kytc"]["inserted"] == 4
+
+    calls.clear()
+    second = backfill(db, [_source(calls)], batch_size=2)
+
+    assert calls == [[LETTINGS[0]]]
+    assert (second["kytc"]["pending"], second["kytc"]["lettings"]) == (1, 1)
+    assert load_watermark(db, "kytc").completed == set(LETTINGS)
+    assert db.query(ContractAward).count() == 5
+
+
+def test_backfill_stops_a_source_at_a_failed_batch(db):
+    """Test that a failing batch stops the backfill and leaves its lettings pending."""
+    calls = []
+
+    result = backfill(db, [_source(calls, fail_on=LETTINGS[2])], batch_size=2)
+
+    assert len(calls) == 2
+    assert result["kytc"]["error"] == "RuntimeError: letting page vanished"
+    assert load_watermark(db, "kytc").completed == {LETTINGS[4], LETTINGS[3]}
+
+
+def test_backfill_dry_run_only_counts(db):
+    """Test that a dry run reports the pending lettings without fetching any."""
+    calls = []
+
+    result = backfill(db, [_source(calls)], dry_run=True)
+
+    assert calls == []
+    assert (result["kytc"]["discovered"], result["kytc"]["pending"]) == (5, 5)
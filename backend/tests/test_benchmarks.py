@@ -0,0 +1,32 @@
+"""Tests for the benchmark regression check."""
+from benchmarks.compare import compare
+
+
+def _results(**cases):
+    return {"results": {
+        name: {"items": items, "per_item_us": per_item}
+        for name, (items, per_item) in cases.items()
+    }}
+
+
+def test_compare_flags_only_slowdowns_past_threshold():
+    """Test that a case regresses only when it slows down by more than the threshold."""
+    baseline = _results(scoring=(1000, 5.0), ingest=(1000, 100.0), leads=(10, 800.0))
+    current = _results(scoring=(1000, 5.9), ingest=(1000, 130.0), leads=(10, 400.0))
+
+    lines, regressions = compare(baseline, current, threshold=0.2)
+
+    assert regressions == ["ingest"]
+    assert any("REGRESSION" in line and line.startswith("ingest") for line in lines)
+
+
+def test_compare_skips_missing_and_resized_cases():
+    """Test that cases absent from one side or run at another size never fail the check."""
+    baseline = _results(scoring=(1000, 5.0), leads=(10, 100.0))
+    current = _results(scoring=(5000, 50.0), ingest=(1000, 100.0))
+
+    lines, regressions = compare(baseline, current)
+
+    assert regressions == []
+    assert len(lines) == 3
+    assert all("skipped" in line for line in lines)
@@ -0,0 +1,124 @@
+"""Tests for contractor name canonicalisation, fuzzy deduplication and GET /contractors."""
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app.contractors import ContractorIndex, ContractorResolver, canonical_name, dice, trigrams
+from app.ingest.runner import upsert_contracts
+from benchmarks.bench_contractors import AllPairsIndex, dedupe
+from benchmarks.datagen import synthetic_contractor_names
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("ABC Paving, Inc.", "ABC PAVING"),
+    ("ABC PAVING INC", "ABC PAVING"),
+    ("A. B. C. Paving", "ABC PAVING"),
+    ("a.b.c. paving llc", "ABC PAVING"),
+    ("Smith & Sons Co.", "SMITH AND SONS"),
+    ("The Walsh Group, Ltd.", "WALSH GROUP"),
+    ("O'Brien  Excavating, L.L.C.", "OBRIEN EXCAVATING"),
+    ("Müller Hauling Corp", "MULLER HAULING"),
+    ("Company", "COMPANY"),
+    ("", ""),
+])
+def test_canonical_name(raw, expected):
+    assert canonical_name(raw) == expected
+
+
+def test_index_matches_typos_and_keeps_companies_apart():
+    """Test that close spellings join one contractor and different companies do not."""
+    index = ContractorIndex()
+    ids = iter(range(1, 100))
+    assigned = {
+        name: index.assign(canonical_name(name), lambda: next(ids))
+        for name in [
+            "Bluegrass Hauling LLC", "Bluegras Hauling", "BLUEGRASS HAULNG INC",
+            "Bluegrass Paving", "Ohio Valley Earthworks", "Ohio Valley Earthwork", "Valley Paving",
+        ]
+    }
+    assert assigned == {
+        "Bluegrass Hauling LLC": 1, "Bluegras Hauling": 1, "BLUEGRASS HAULNG INC": 1,
+        "Bluegrass Paving": 2, "Ohio Valley Earthworks": 3, "Ohio Valley Earthwork": 3, "Valley Paving": 4,
+    }
+    assert dice(trigrams("BLUEGRASS HAULING"), trigrams("BLUEGRASS PAVING")) < index.threshold
+
+
+@pytest.mark.parametrize("threshold", [0.6, 0.8, 0.9])
+def test_blocked_index_finds_what_all_pairs_finds(threshold):
+    """Test that probing the rarest trigrams gives the all-pairs result exactly."""
+    names = list(dict.fromkeys(name for name, _ in synthetic_contractor_names(600, seed=7)))
+
+    blocked, brute = ContractorIndex(threshold), AllPairsIndex(threshold)
+    assert dedupe(blocked, names)[0] == dedupe(brute, names)[0]
+    assert blocked.scored < brute.scored / 10
+
+
+def test_resolver_stores_and_reuses_aliases(db):
+    """Test that names resolve once, persist as aliases and match across resolvers."""
+    resolved = ContractorResolver().resolve(db, ["ABC Paving, Inc.", "Bluegrass Hauling", "ABC PAVING INC"])
+    db.commit()
+    assert resolved["ABC Paving, Inc."] == resolved["ABC PAVING INC"] != resolved["Bluegrass Hauling"]
+    assert db.execute(text("SELECT name, canonical_name FROM contractors ORDER BY id")).all() == [
+        ("ABC Paving, Inc.", "ABC PAVING"), ("Bluegrass Hauling", "BLUEGRASS HAULING"),
+    ]
+
+    # A later run looks known names up and matches new spellings against the stored ones
+    again = ContractorResolver().resolve(db, ["ABC Paving, Inc.", "Bluegras Hauling", "Ohio Valley Earthworks"])
+    db.commit()
+    assert again["ABC Paving, Inc."] == resolved["ABC Paving, Inc."]
+    assert again["Bluegras Hauling"] == resolved["Bluegrass Hauling"]
+    assert db.execute(text("SELECT count(*) FROM contractors")).scalar() == 3
+    assert db.execute(text("SELECT count(*) FROM contractor_aliases")).scalar() == 5
+
+
+def _row(contract_id, awarded_to):
+    return {
+        "state": "KY",
+        "letting_date": date(2025, 11, 20),
+        "contract_id": contract_id,
+        "awarded_to": awarded_to,
+        "description": "Asphalt resurfacing",
+        "amount": None,
+        "source_url": "https://example.test/letting",
+        "score": 0,
+    }
+
+
+def _linked(db):
+    return dict(db.execute(text(
+        "SELECT a.contract_id, c.name FROM contract_awards a JOIN contractors c ON c.id = a.contractor_id"
+    )).all())
+
+
+def test_upsert_links_and_relinks_contractors(db):
+    """Test that ingest links each lead to its contractor and follows awarded_to changes."""
+    upsert_contracts(db, [_row("1", "ABC Paving, Inc."), _row("2", "ABC PAVING INC"), _row("3", "Bluegrass Hauling")])
+    db.commit()
+    assert _linked(db) == {"1": "ABC Paving, Inc.", "2": "ABC Paving, Inc.", "3": "Bluegrass Hauling"}
+
+    upsert_contracts(db, [_row("2", "Bluegras Hauling LLC")])
+    db.commit()
+    assert _linked(db)["2"] == "Bluegrass Hauling"
+
+
+def test_list_contractors(db, client):
+    """Test GET /contractors counts, aliases and cursor pagination."""
+    names = ["ABC Paving, Inc.", "ABC PAVING INC", "A.B.C. Paving", "Bluegrass Hauling", "Bluegras Hauling",
+             "Ohio Valley Earthworks"]
+    upsert_contracts(db, [_row(str(i), name) for i, name in enumerate(names)])
+    db.commit()
+
+    first = client.get("/contractors", params={"limit": 2}).json()
+    assert [(c["name"], c["leads"]) for c in first["items"]] == [("ABC Paving, Inc.", 3), ("Bluegrass Hauling", 2)]
+    assert first["items"][0]["aliases"] == ["A.B.C. Paving", "ABC PAVING INC", "ABC Paving, Inc."]
+    assert first["next_cursor"]
+
+    second = client.get("/contractors", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [(c["name"], c["leads"]) for c in second["items"]] == [("Ohio Valley Earthworks", 1)]
+    assert second["next_cursor"] is None
+
+
+def test_list_contractors_rejects_bad_cursor(client):
+    assert client.get("/contractors", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/contractors").json() == {"items": [], "next_cursor": None}
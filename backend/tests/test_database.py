@@ -0,0 +1,94 @@
+"""Tests for the SQLite connection profile and reader/writer engines."""
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeout
+
+from app.database import SQLiteProfile, create_sqlite_engine
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def _count(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM contract_awards")).scalar()
+
+
+def test_profile_applied_on_connect(engine):
+    """Every pooled connection gets the WAL profile."""
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "synchronous") == 1  # NORMAL
+    assert _pragma(engine, "cache_size") == -SQLiteProfile.cache_size_kb
+    assert _pragma(engine, "busy_timeout") == SQLiteProfile.busy_timeout_ms
+
+
+def test_profile_from_env(monkeypatch):
+    """SQLITE_* variables override the defaults."""
+    monkeypatch.setenv("SQLITE_JOURNAL_MODE", "DELETE")
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "FULL")
+    monkeypatch.setenv("SQLITE_CACHE_SIZE_KB", "1024")
+    monkeypatch.setenv("SQLITE_MMAP_SIZE", "0")
+    monkeypatch.setenv("SQLITE_BUSY_TIMEOUT_MS", "250")
+
+    profile = SQLiteProfile.from_env()
+
+    assert profile == SQLiteProfile("DELETE", "FULL", 1024, 0, 250)
+    assert "PRAGMA cache_size = -1024" in profile.pragmas()
+
+
+def test_readonly_engine_rejects_writes(tmp_path, engine):
+    """The read pool opens connections with query_only."""
+    reader = create_sqlite_engine(f"sqlite:///{tmp_path / 'test.db'}", readonly=True)
+    try:
+        with reader.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM contract_awards")).scalar() == 0
+            with pytest.raises(OperationalError, match="readonly"):
+                conn.execute(text("DELETE FROM contract_awards"))
+    finally:
+        reader.dispose()
+
+
+def test_reader_not_blocked_by_open_write_transaction(tmp_path, engine):
+    """Under WAL a reader sees the last commit while a writer holds its transaction open."""
+    reader = create_sqlite_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        profile=SQLiteProfile(busy_timeout_ms=0),
+        readonly=True,
+    )
+    insert = text(
+        "INSERT INTO contract_awards (state, letting_date, contract_id, awarded_to, description, source_url) "
+        "VALUES ('KY', '2025-11-20', :contract_id, 'ACME', 'Haul', 'https://example.com')"
+    )
+    try:
+        with engine.begin() as conn:
+            conn.execute(insert, {"contract_id": "1"})
+
+        with engine.connect() as writer:
+            tx = writer.begin()
+            writer.execute(insert, {"contract_id": "2"})
+
+            counts = []
+            thread = threading.Thread(target=lambda: counts.append(_count(reader)))
+            thread.start()
+            thread.join(timeout=5)
+            tx.commit()
+
+        assert counts == [1]
+        assert _count(reader) == 2
+    finally:
+        reader.dispose()
+
+
+def test_single_writer_pool_queues_second_writer(tmp_path):
+    """With one pooled writer connection, a second checkout waits rather than opening another."""
+    writer = create_sqlite_engine(f"sqlite:///{tmp_path / 'w.db'}", pool_size=1, max_overflow=0, pool_timeout=0.1)
+    try:
+        with writer.connect():
+            with pytest.raises(PoolTimeout):
+                writer.connect()
+    finally:
+        writer.dispose()
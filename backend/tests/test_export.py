@@ -0,0 +1,90 @@
+"""Tests for streaming lead export."""
+import json
+import tracemalloc
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.api.export import stream_export
+from app.api.routes import LEAD_FIELDS, lead_filters, leads_export_query
+
+
+def _seed(engine, count):
+    """Insert count leads in one statement."""
+    with engine.begin() as conn:
+        conn.execute(text(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :count) "
+            "INSERT INTO contract_awards (state, letting_date, contract_id, awarded_to, description, "
+            "source_url, score, status) "
+            "SELECT 'KY', '2025-11-20', 'C' || i, 'ABC Paving', "
+            "'Dump truck hauling and aggregate delivery, lot ' || i, 'https://example.test/letting', "
+            "i % 50, 'NEW' FROM n"
+        ), {"count": count})
+
+
+def _peak_export_memory(engine, fmt):
+    """Peak Python allocation while streaming every lead, and the number of rows streamed."""
+    Session = sessionmaker(bind=engine)
+    stmt = leads_export_query(lead_filters(None, None, None), LEAD_FIELDS)
+    tracemalloc.start()
+    try:
+        lines = 0
+        for chunk in stream_export(Session, stmt, LEAD_FIELDS, fmt, batch_size=500):
+            lines += chunk.count("\n")
+        return tracemalloc.get_traced_memory()[1], lines
+    finally:
+        tracemalloc.stop()
+
+
+def test_export_memory_does_not_grow_with_row_count(tmp_path):
+    """Test that peak memory is the same for an export ten times larger."""
+    from app.database import Base, create_sqlite_engine
+
+    peaks = {}
+    for count in (2_000, 20_000):
+        engine = create_sqlite_engine(f"sqlite:///{tmp_path / f'{count}.db'}")
+        Base.metadata.create_all(bind=engine)
+        _seed(engine, count)
+        for fmt in ("ndjson", "csv"):
+            peak, lines = _peak_export_memory(engine, fmt)
+            assert lines == count + (fmt == "csv")
+            peaks[count, fmt] = peak
+        engine.dispose()
+
+    for fmt in ("ndjson", "csv"):
+        assert peaks[20_000, fmt] < peaks[2_000, fmt] * 1.5, peaks
+
+
+def test_export_ndjson(client, engine):
+    """Test that NDJSON export streams one JSON object per lead in /leads order."""
+    _seed(engine, 60)
+
+    response = client.get("/leads/export", params={"state": "ky", "min_score": 40})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    leads = [json.loads(line) for line in response.text.splitlines()]
+    assert len(leads) == 10  # i = 40..49
+    assert [lead["score"] for lead in leads] == sorted((lead["score"] for lead in leads), reverse=True)
+    assert leads[0]["status"] == "new"
+    assert leads[0]["letting_date"] == "2025-11-20"
+    assert set(leads[0]) == set(LEAD_FIELDS)
+
+
+def test_export_csv_with_fields(client, engine):
+    """Test CSV export with a header row and only the requested columns."""
+    _seed(engine, 3)
+
+    response = client.get("/leads/export", params={"format": "csv", "fields": "contract_id,score,status"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="leads.csv"' in response.headers["content-disposition"]
+    assert response.text.splitlines() == ["contract_id,score,status", "C3,3,new", "C2,2,new", "C1,1,new"]
+
+
+def test_export_rejects_bad_params(client):
+    """Test 400 for an unknown format, field or status."""
+    assert client.get("/leads/export", params={"format": "xml"}).status_code == 400
+    assert client.get("/leads/export", params={"fields": "nope"}).status_code == 400
+    assert client.get("/leads/export", params={"status": "nope"}).status_code == 400
@@ -0,0 +1,160 @@
+"""Tests for the concurrent fetch stage."""
+import asyncio
+
+import httpx
+import pytest
+
+from app.ingest.fetch import FetchConfig, fetch_pages, iter_sync, run_sync
+
+FAST = FetchConfig(concurrency=4, per_host_delay=0.0, retries=2, backoff=0.0, timeout=5.0)
+
+
+async def _collect(urls, handler, config=FAST):
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        return [result async for result in fetch_pages(urls, config, client)]
+
+
+@pytest.mark.asyncio
+async def test_fetch_pages_respects_concurrency_limit():
+    """Test that no more than `concurrency` requests are in flight at once."""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, text=request.url.path)
+
+    urls = [f"https://example.test/page/{i}" for i in range(12)]
+    results = await _collect(urls, handler, FetchConfig(concurrency=3, per_host_delay=0.0))
+
+    assert peak == 3
+    assert sorted(r.url for r in results) == sorted(urls)
+    assert all(r.ok for r in results)
+
+
+@pytest.mark.asyncio
+async def test_fetch_pages_yields_in_completion_order():
+    """Test that fast pages are yielded before slow ones."""
+    async def handler(request):
+        if request.url.path == "/slow":
+            await asyncio.sleep(0.05)
+        return httpx.Response(200, text="ok")
+
+    results = await _collect(["https://example.test/slow", "https://example.test/fast"], handler)
+
+    assert [r.url for r in results] == ["https://example.test/fast", "https://example.test/slow"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_pages_retries_server_errors():
+    """Test that retryable statuses are retried until the page succeeds."""
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503 if calls < 3 else 200, text="ok")
+
+    [result] = await _collect(["https://example.test/"], handler)
+
+    assert result.ok
+    assert result.text == "ok"
+    assert result.attempts == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_pages_does_not_retry_client_errors():
+    """Test that a 404 fails immediately without retries."""
+    async def handler(request):
+        return httpx.Response(404)
+
+    [result] = await _collect(["https://example.test/missing"], handler)
+
+    assert not result.ok
+    assert result.status_code == 404
+    assert result.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_pages_reports_timeouts_after_retries():
+    """Test that timeouts are retried and then reported instead of raised."""
+    async def handler(request):
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    [result] = await _collect(["https://example.test/"], handler)
+
+    assert not result.ok
+    assert "ReadTimeout" in result.error
+    assert result.attempts == FAST.retries + 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_pages_spaces_requests_per_host():
+    """Test the politeness delay between request starts to the same host."""
+    loop = asyncio.get_running_loop()
+    starts = {}
+
+    async def handler(request):
+        starts.setdefault(request.url.host, []).append(loop.time())
+        return httpx.Response(200)
+
+    urls = [f"https://{host}.test/{i}" for host in ("a", "b") for i in range(3)]
+    await _collect(urls, handler, FetchConfig(concurrency=6, per_host_delay=0.05))
+
+    for times in starts.values():
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        assert all(gap >= 0.045 for gap in gaps)
+    # Different hosts are not delayed by each other
+    assert abs(starts["a.test"][0] - starts["b.test"][0]) < 0.04
+
+
+@pytest.mark.asyncio
+async def test_run_sync_inside_running_loop():
+    """Test that run_sync works when called from async code."""
+    async def answer():
+        return 42
+
+    assert run_sync(answer()) == 42
+
+
+def test_iter_sync_yields_in_order_and_raises_errors():
+    """Test that iter_sync streams an async generator and re-raises its failure."""
+    async def numbers():
+        for i in range(5):
+            await asyncio.sleep(0)
+            yield i
+        raise ValueError("source failed")
+
+    seen = []
+    with pytest.raises(ValueError, match="source failed"):
+        for i in iter_sync(numbers(), maxsize=2):
+            seen.append(i)
+    assert seen == [0, 1, 2, 3, 4]
+
+
+def test_iter_sync_stays_bounded_and_stops_on_close():
+    """Test that the producer runs at most maxsize items ahead and stops when closed."""
+    produced = []
+    closed = []
+
+    async def endless():
+        try:
+            i = 0
+            while True:
+                produced.append(i)
+                yield i
+                i += 1
+        finally:
+            closed.append(True)
+
+    items = iter_sync(endless(), maxsize=3)
+    assert next(items) == 0
+    items.close()
+
+    assert closed == [True]
+    # One taken, three queued and at most one waiting to be queued
+    assert len(produced) <= 5
@@ -0,0 +1,357 @@
+"""Tests for the KYTC ingestion module."""
+import json
+from datetime import date
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.ingest.cache import PageCache
+from app.ingest.fetch import FetchConfig
+from app.ingest.kytc import (
+    HTML_PARSER, ingest_kytc_async, iter_letting_rows, letting_url, parse_letting_page, parse_lettings_index,
+)
+from app.ingest.stats import IngestStats
+from app.ingest.watermark import Watermark
+from benchmarks.bench_kytc_parse import legacy_parse_letting_page
+
+FIXTURES = Path(__file__).parent / "fixtures"
+LETTING_PAGE = (FIXTURES / "kytc_letting_11-20-2025.html").read_text()
+# Every letting page under fixtures/, named kytc_letting_MM-DD-YYYY.html
+LETTING_PAGES = sorted(FIXTURES.glob("kytc_letting_*.html"))
+PARSERS = sorted({"html.parser", HTML_PARSER})
+
+HEADER = ["Call", "Status", "Awarded To", "Contract ID", "District", "County", "Project Description"]
+
+
+def _table(rows, header=HEADER):
+    cells = lambda tag, values: "".join(f"<{tag}>{v}</{tag}>" for v in values)
+    body = "".join(f"<tr>{cells('td', row)}</tr>" for row in rows)
+    return f"<html><body><table><tr>{cells('th', header)}</tr>{body}</table></body></html>"
+
+
+@pytest.mark.parametrize("features", PARSERS)
+@pytest.mark.parametrize("snapshot,letting", [
+    ("kytc_letting_11-20-2025", "11/20/2025"),
+    ("kytc_letting_01-15-2026", "01/15/2026"),
+])
+def test_iter_letting_rows_matches_snapshot(snapshot, letting, features):
+    """
+    Test that both backends reproduce the recorded output of a letting page.
+
+    The recorded output is the row parser's own (11/20/2025 is a hand-written
+    page, 01/15/2026 a benchmarks.datagen one), so this guards against
+    regressions; agreement with the legacy parser is tested below.
+    """
+    html = (FIXTURES / f"{snapshot}.html").read_text()
+    expected = json.loads((FIXTURES / f"{snapshot}.expected.json").read_text())
+
+    rows = list(iter_letting_rows(html, letting, letting_url(letting), features=features))
+    for row in rows:
+        row["letting_date"] = row["letting_date"].isoformat()
+
+    assert rows == expected
+
+
+@pytest.mark.parametrize("features", PARSERS)
+@pytest.mark.parametrize("page", LETTING_PAGES, ids=lambda page: page.stem)
+def test_iter_letting_rows_agrees_with_the_legacy_parser(page, features):
+    """
+    Test that the row parser yields the legacy flat-token parser's contracts.
+
+    The one intended difference: the legacy parser took the District cell
+    for the county it skips, so the County cell started its description.
+    """
+    html = page.read_text()
+    letting = page.stem.rsplit("_", 1)[1].replace("-", "/")
+
+    legacy = legacy_parse_letting_page(html, letting, letting_url(letting))
+    rows = list(iter_letting_rows(html, letting, letting_url(letting), features=features))
+
+    assert legacy
+    assert len(rows) == len(legacy)
+    for old, row in zip(legacy, rows):
+        assert old["description"].endswith(" " + row["description"])
+        assert {**old, "description": row["description"]} == row
+
+
+def test_iter_letting_rows_keeps_pipes_and_missing_counties():
+    """Test that cell text with separators and empty cells do not shift fields."""
+    html = _table([
+        ["1", "Awarded", "A | B Hauling", "252101", "", "", "Haul | place aggregate"],
+        ["2", "Awarded", "C Paving", "252102", "07", "", "Resurfacing"],
+    ])
+
+    rows = list(iter_letting_rows(html, "11/20/2025", "u"))
+
+    assert [(r["awarded_to"], r["contract_id"], r["description"]) for r in rows] == [
+        ("A | B Hauling", "252101", "Haul | place aggregate"),
+        ("C Paving", "252102", "Resurfacing"),
+    ]
+
+
+@pytest.mark.parametrize("features", PARSERS)
+def test_iter_letting_rows_leaves_nested_tables_out_of_the_outer_rows(features):
+    """Test that a table nested in a cell adds neither rows nor text to the letting table."""
+    html = (
+        "<table><thead><tr><th>Call</th><th>Status</th><th>Awarded To</th><th>Contract ID</th>"
+        "<th>Project Description</th></tr></thead><tbody>"
+        "<tr><td>1</td><td>Awarded</td><td>A Paving</td><td>252101</td><td>Resurfacing"
+        "<table><tr><td>2</td><td>Awarded</td><td>B Hauling</td><td>252102</td><td>Inner</td></tr></table>"
+        "</td></tr></tbody></table>"
+    )
+
+    rows = list(iter_letting_rows(html, "11/20/2025", "u", features=features))
+
+    assert [(r["contract_id"], r["description"]) for r in rows] == [("252101", "Resurfacing")]
+
+
+def test_iter_letting_rows_maps_columns_by_header_name():
+    """Test that columns are located by header name, not by position."""
+    header = ["Contract ID", "Project Description", "Call", "Awarded To", "Status"]
+    html = _table([["252201", "Earthwork", "5", "D Excavating", "Awarded"]], header=header)
+
+    [row] = iter_letting_rows(html, "11/20/2025", "u")
+
+    assert (row["contract_id"], row["awarded_to"], row["description"]) == ("252201", "D Excavating", "Earthwork")
+
+
+def test_iter_letting_rows_without_header_yields_nothing():
+    """Test that a table without the letting header produces no rows."""
+    html = "<table><tr><td>1</td><td>Awarded</td><td>X</td></tr></table>"
+
+    assert list(iter_letting_rows(html, "11/20/2025", "u")) == []
+
+
+def test_parse_letting_page_awarded_rows_only():
+    """Test that only awarded contracts are emitted from a letting page."""
+    contracts = parse_letting_page(LETTING_PAGE, "11/20/2025", "https://example.test/letting")
+
+    assert [c["contract_id"] for c in contracts] == ["252001", "252002", "252004", "252006"]
+    first = contracts[0]
+    assert first["awarded_to"] == "Bluegrass Paving, Inc."
+    assert first["letting_date"] == date(2025, 11, 20)
+    assert first["amount"] is None
+    assert first["source_url"] == "https://example.test/letting"
+
+
+@pytest.mark.asyncio
+async def test_ingest_kytc_async_parses_each_letting_and_skips_failures():
+    """Test concurrent ingest of several lettings with one failing page."""
+    async def handler(request):
+        if request.url.params["letting"] == "12/18/2025":
+            return httpx.Response(500)
+        return httpx.Response(200, text=LETTING_PAGE)
+
+    config = FetchConfig(concurrency=2, per_host_delay=0.0, retries=1, backoff=0.0)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        contracts = [c async for c in ingest_kytc_async(
+            ["10/23/2025", "11/20/2025", "12/18/2025"], config=config, client=client
+        )]
+
+    assert len(contracts) == 8
+    assert {c["letting_date"] for c in contracts} == {date(2025, 10, 23), date(2025, 11, 20)}
+    assert all("letting=10%2F23%2F2025" in c["source_url"] or "letting=11%2F20%2F2025" in c["source_url"]
+               for c in contracts)
+
+
+def test_parse_lettings_index_finds_links_and_options():
+    """Test that letting dates are read from links and dropdown values, once each."""
+    html = """
+    <select name="letting">
+      <option value="">Select a letting</option>
+      <option value="12/18/2025">December 18, 2025</option>
+      <option value='11/20/2025'>November 20, 2025</option>
+    </select>
+    <a href="Letting-Contracts.aspx?letting=11%2F20%2F2025">Nov</a>
+    <a href="Letting-Contracts.aspx?Letting=1/15/2026">Jan</a>
+    <a href="Letting-Contracts.aspx?letting=13%2F40%2F2025">Typo</a>
+    <p>Next letting 02/19/2026</p>
+    """
+
+    assert parse_lettings_index(html) == [date(2025, 11, 20), date(2025, 12, 18), date(2026, 1, 15)]
+
+
+@pytest.mark.asyncio
+async def test_ingest_kytc_fetches_only_lettings_after_the_watermark():
+    """Test that discovery skips old lettings and stages each fetched letting as complete."""
+    index = "".join(
+        f'<a href="?letting={d.replace("/", "%2F")}">{d}</a>'
+        for d in ("01/16/2025", "10/23/2025", "11/20/2025", "12/18/2025")
+    )
+    requested = []
+
+    async def handler(request):
+        letting = request.url.params.get("letting")
+        if letting is None:
+            return httpx.Response(200, text=index)
+        requested.append(letting)
+        return httpx.Response(200, text=LETTING_PAGE)
+
+    watermark = Watermark("kytc", latest=date(2025, 11, 20))
+    config = FetchConfig(per_host_delay=0.0, retries=0)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        contracts = [c async for c in ingest_kytc_async(config=config, client=client, watermark=watermark)]
+
+    # 12/18 is new; 10/23 and 11/20 fall in the 45-day re-check window; 01/16 is history
+    assert sorted(requested) == ["10/23/2025", "11/20/2025", "12/18/2025"]
+    assert len(contracts) == 12
+    assert watermark.staged() == {date(2025, 10, 23): 4, date(2025, 11, 20): 4, date(2025, 12, 18): 4}
+
+
+@pytest.mark.asyncio
+async def test_ingest_kytc_fails_when_the_index_cannot_be_read():
+    """Test that an unreadable lettings index fails the source instead of ingesting nothing quietly."""
+    async def handler(request):
+        return httpx.Response(503)
+
+    config = FetchConfig(per_host_delay=0.0, retries=0)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(RuntimeError, match="lettings index"):
+            [c async for c in ingest_kytc_async(config=config, client=client)]
+
+
+@pytest.mark.parametrize("features", PARSERS)
+def test_iter_letting_rows_reports_skip_reasons(features):
+    """Test that every dropped row after the header is reported with its reason."""
+    html = _table([
+        ["1", "Awarded", "ABC Paving", "251001", "", "Pike", "Resurfacing"],
+        ["2", "Rejected", "", "251002", "", "Pike", "Bridge"],
+        ["Section", "", "", "", "", "", ""],
+        ["3", "Awarded", "", "251003", "", "Pike", "Guardrail"],
+        ["4", "Awarded", "XYZ Co", "TBD", "", "Pike", "Striping"],
+        ["5", "Awarded"],
+    ])
+    reasons = []
+
+    rows = list(iter_letting_rows(html, "11/20/2025", "u", features=features, on_skip=reasons.append))
+
+    assert [r["contract_id"] for r in rows] == ["251001"]
+    assert reasons == ["not_awarded", "no_call", "no_company", "bad_contract_id", "short_row"]
+
+
+@pytest.mark.asyncio
+async def test_ingest_kytc_records_stats_and_logs_failed_pages(caplog):
+    """Test that pages, bytes, rows and skips are counted and a failed page is logged, not hidden."""
+    async def handler(request):
+        if request.url.params["letting"] == "12/18/2025":
+            return httpx.Response(404)
+        if request.url.params["letting"] == "01/15/2026":
+            return httpx.Response(200, text="<html><p>No lettings</p></html>")
+        return httpx.Response(200, text=LETTING_PAGE)
+
+    stats = IngestStats()
+    config = FetchConfig(per_host_delay=0.0, retries=0)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        contracts = [c async for c in ingest_kytc_async(
+            ["11/20/2025", "12/18/2025", "01/15/2026"], config=config, client=client, stats=stats
+        )]
+
+    kytc = stats.summary()["sources"]["kytc"]
+    assert kytc["pages"] == {"fetched": 2, "failed": 1}
+    assert kytc["bytes"] == len(LETTING_PAGE.encode()) + len(b"<html><p>No lettings</p></html>")
+    assert kytc["rows"] == len(contracts) == 4
+    assert kytc["skipped"]["no_header"] == 1
+    assert {"fetch", "parse"} <= set(kytc["seconds"])
+    assert "HTTP 404" in caplog.text
+
+
+def _etag_handler(pages, requests):
+    """Mock server that honours If-None-Match with a per-letting ETag."""
+    async def handler(request):
+        letting = request.url.params["letting"]
+        requests.append(request)
+        etag = f'"{letting}-{hash(pages[letting])}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, text=pages[letting], headers={"ETag": etag})
+    return handler
+
+
+async def _ingest(handler, cache, dates=("11/20/2025",)):
+    config = FetchConfig(per_host_delay=0.0, retries=0)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        return [c async for c in ingest_kytc_async(list(dates), config=config, client=client, cache=cache)]
+
+
+@pytest.mark.asyncio
+async def test_ingest_kytc_skips_pages_answered_with_304(tmp_path):
+    """Test that a flushed page is fetched conditionally and not re-parsed."""
+    pages = {"11/20/2025": LETTING_PAGE}
+    requests = []
+    handler = _etag_handler(pages, requests)
+
+    cache = PageCache(str(tmp_path))
+    assert len(await _ingest(handler, cache)) == 4
+    assert (cache.hits, cache.misses) == (0, 1)
+    cache.flush()
+
+    cache = PageCache(str(tmp_path))
+    assert await _ingest(handler, cache) == []
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert requests[-1].headers["If-None-Match"].startswith('"11/20/2025-')
+
+
+@pytest.mark.asyncio
+async def test_ingest_kytc_skips_pages_with_identical_hash(tmp_path):
+    """Test that servers without validators still get skipped on an identical body."""
+    async def handler(request):
+        return httpx.Response(200, text=LETTING_PAGE)
+
+    cache = PageCache(str(tmp_path))
+    await _ingest(handler, cache)
+    cache.flush()
+
+    cache = PageCache(str(tmp_path))
+    assert await _ingest(handler, cache) == []
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_ingest_kytc_reparses_changed_or_unflushed_pages(tmp_path):
+    """Test that changed pages and pages from an unflushed run are parsed again."""
+    pages = {"11/20/2025": LETTING_PAGE}
+    handler = _etag_handler(pages, [])
+
+    cache = PageCache(str(tmp_path))
+    await _ingest(handler, cache)
+    # No flush: the run's commit never happened
+
+    cache = PageCache(str(tmp_path))
+    assert len(await _ingest(handler, cache)) == 4
+    cache.flush()
+
+    pages["11/20/2025"] = LETTING_PAGE.replace("Bluegrass Paving, Inc.", "Bluegrass Paving, LLC")
+    cache = PageCache(str(tmp_path))
+    contracts = await _ingest(handler, cache)
+    assert contracts[0]["awarded_to"] == "Bluegrass Paving, LLC"
+    assert cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_ingest_kytc_refresh_ignores_cache(tmp_path):
+    """Test that refresh mode sends no validators and parses every page."""
+    requests = []
+    handler = _etag_handler({"11/20/2025": LETTING_PAGE}, requests)
+
+    cache = PageCache(str(tmp_path))
+    await _ingest(handler, cache)
+    cache.flush()
+
+    cache = PageCache(str(tmp_path), refresh=True)
+    assert len(await _ingest(handler, cache)) == 4
+    assert "If-None-Match" not in requests[-1].headers
+
+
+@pytest.mark.parametrize("features", PARSERS)
+def test_iter_letting_rows_closes_omitted_end_tags(features):
+    """Test rows written without </td> and </tr> end tags."""
+    html = (
+        "<table><tr><th>Call<th>Status<th>Awarded To<th>Contract ID<th>County<th>Project Description"
+        "<tr><td>7<td>Awarded<td>E <b>Trucking</b><td>252301<td>Pike<td>Dump truck hauling"
+        "</table>"
+    )
+
+    [row] = iter_letting_rows(html, "11/20/2025", "u", features=features)
+
+    assert (row["awarded_to"], row["contract_id"], row["description"]) == ("E Trucking", "252301", "Dump truck hauling")
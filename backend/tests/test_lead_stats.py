@@ -0,0 +1,148 @@
+"""Tests for the incrementally maintained GET /stats summaries."""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.ingest.runner import upsert_contracts
+from app.lead_stats import SCORE_BUCKET_WIDTH, letting_week, rebuild_lead_stats
+from app.rescore import record_scoring_version, rescore
+from app.scoring import KEYWORD_WEIGHTS, KeywordScorer
+
+DESCRIPTIONS = [
+    "Dump truck hauling",
+    "Gravel and sand delivery",
+    "Bridge painting",
+    "Gravel base and earthwork grading with excavation",
+    "Office cleaning",
+]
+CONTRACTORS = ["ABC Paving", "Bluegrass Hauling", "Ohio Valley Earthworks"]
+
+# What each summary table must hold, counted straight from contract_awards
+BRUTE_FORCE = {
+    "lead_stats_status": "SELECT state, status, count(*) FROM contract_awards GROUP BY state, status",
+    "lead_stats_score": (
+        f"SELECT score - score % {SCORE_BUCKET_WIDTH}, count(*) FROM contract_awards "
+        f"GROUP BY score - score % {SCORE_BUCKET_WIDTH}"
+    ),
+    "lead_stats_contractors": (
+        "SELECT contractor_id, count(*) FROM contract_awards WHERE contractor_id IS NOT NULL GROUP BY contractor_id"
+    ),
+}
+
+
+def _summaries(db):
+    return {
+        table: sorted(db.execute(text(f"SELECT * FROM {table}")).all())
+        for table in ("lead_stats_status", "lead_stats_score", "lead_stats_weekly", "lead_stats_contractors")
+    }
+
+
+def _brute_force(db):
+    expected = {table: sorted(db.execute(text(query)).all()) for table, query in BRUTE_FORCE.items()}
+    weeks = {}
+    for (letting_date,) in db.execute(text("SELECT letting_date FROM contract_awards")):
+        week = letting_week(letting_date)
+        weeks[week] = weeks.get(week, 0) + 1
+    expected["lead_stats_weekly"] = sorted(weeks.items())
+    return expected
+
+
+def _assert_consistent(db):
+    db.commit()
+    assert _summaries(db) == _brute_force(db)
+
+
+def _rows(scorer, count, state="KY", first_letting=date(2025, 11, 3), offset=0):
+    rows = []
+    for i in range(count):
+        description = DESCRIPTIONS[(i + offset) % len(DESCRIPTIONS)]
+        row = {
+            "state": state,
+            "letting_date": first_letting + timedelta(days=3 * ((i + offset) % 7)),
+            "contract_id": f"{state}{i:03d}",
+            "awarded_to": CONTRACTORS[(i + offset) % len(CONTRACTORS)],
+            "description": description,
+            "amount": None,
+            "source_url": "https://example.test/letting",
+            "score_version": scorer.fingerprint,
+        }
+        row.update(scorer.score(description, row["contract_id"], row["awarded_to"]))
+        rows.append(row)
+    return rows
+
+
+@pytest.fixture
+def scorer(db):
+    scorer = KeywordScorer(KEYWORD_WEIGHTS)
+    record_scoring_version(db, scorer)
+    return scorer
+
+
+def test_summaries_match_brute_force_through_every_write(db, client, scorer):
+    """Test that ingest, status updates and rescoring keep every summary equal to a GROUP BY."""
+    upsert_contracts(db, _rows(scorer, 30) + _rows(scorer, 12, state="IN"), chunk_size=7)
+    _assert_consistent(db)
+
+    # Re-ingest: contractors, letting dates and scores move; some rows are new, some unchanged
+    upsert_contracts(db, _rows(scorer, 40, offset=1)[10:] + _rows(scorer, 12, state="IN"), chunk_size=7)
+    _assert_consistent(db)
+
+    ids = db.execute(text("SELECT id FROM contract_awards ORDER BY id")).scalars().all()
+    for lead_id, status in zip(ids[::3], ["contacted", "ignored", "converted", "new", "contacted"] * 10):
+        assert client.post(f"/leads/{lead_id}/status", json={"status": status}).status_code == 200
+    assert client.post(f"/leads/{ids[0]}/status", json={"status": "contacted"}).status_code == 200  # no change
+    _assert_consistent(db)
+
+    # A status moved off "new" is kept by the next ingest; the row still moves between buckets
+    upsert_contracts(db, _rows(scorer, 40, offset=2), chunk_size=7)
+    _assert_consistent(db)
+
+    rescore(db, KeywordScorer({**KEYWORD_WEIGHTS, "gravel": 13, "dump truck": 1}), batch_size=4)
+    _assert_consistent(db)
+
+
+def test_rebuild_repairs_drifted_summaries(db, scorer):
+    """Test that the rebuild recomputes the summaries from contract_awards."""
+    upsert_contracts(db, _rows(scorer, 20))
+    db.commit()
+    expected = _summaries(db)
+    db.execute(text("UPDATE lead_stats_contractors SET leads = leads + 5"))
+    db.execute(text("DELETE FROM lead_stats_weekly"))
+
+    rebuild_lead_stats(db)
+
+    _assert_consistent(db)
+    assert _summaries(db) == expected
+
+
+def test_get_stats(db, client, scorer):
+    """Test the /stats response shape, ordering and limits."""
+    upsert_contracts(db, _rows(scorer, 20) + _rows(scorer, 5, state="IN"))
+    db.commit()
+    lead_id = db.execute(text("SELECT id FROM contract_awards WHERE state = 'IN' LIMIT 1")).scalar()
+    client.post(f"/leads/{lead_id}/status", json={"status": "contacted"})
+
+    stats = client.get("/stats", params={"weeks": 2, "top": 2}).json()
+
+    assert stats["total"] == 25
+    assert stats["by_state_status"] == [
+        {"state": "IN", "status": "contacted", "leads": 1},
+        {"state": "IN", "status": "new", "leads": 4},
+        {"state": "KY", "status": "new", "leads": 20},
+    ]
+    assert sum(bucket["leads"] for bucket in stats["score_buckets"]) == 25
+    assert all(b["max_score"] - b["min_score"] == SCORE_BUCKET_WIDTH - 1 for b in stats["score_buckets"])
+    weeks = [week["week"] for week in stats["weekly"]]
+    assert weeks == ["2025-11-10", "2025-11-17"]
+    assert all(date.fromisoformat(week).weekday() == 0 for week in weeks)
+    assert [(c["name"], c["leads"]) for c in stats["top_contractors"]] == [("ABC Paving", 9), ("Bluegrass Hauling", 9)]
+
+
+def test_get_stats_validates_limits(client):
+    """Test that out-of-range weeks/top are rejected."""
+    assert client.get("/stats", params={"weeks": 0}).status_code == 422
+    assert client.get("/stats", params={"top": 1000}).status_code == 422
+    assert client.get("/stats").json() == {
+        "total": 0, "by_state_status": [], "score_buckets": [], "weekly": [], "top_contractors": []
+    }
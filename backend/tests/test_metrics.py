@@ -0,0 +1,45 @@
+"""Tests for the Prometheus metrics registry."""
+import pytest
+
+from app.metrics import Registry
+
+
+def test_counter_renders_labelled_series():
+    """Test counter exposition with escaped label values."""
+    registry = Registry()
+    pages = registry.counter("pages_total", "Pages fetched", ("source",))
+    pages.inc(source="kytc")
+    pages.inc(2, source='in"dot')
+
+    text = registry.render()
+
+    assert "# TYPE pages_total counter" in text
+    assert 'pages_total{source="kytc"} 1' in text
+    assert 'pages_total{source="in\\"dot"} 2' in text
+    assert pages.value(source="kytc") == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test that bucket counts include every smaller bucket and +Inf equals the count."""
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value, route="/leads")
+
+    lines = registry.render().splitlines()
+
+    assert 'latency_seconds_bucket{route="/leads",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/leads",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/leads",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/leads"} 4.25' in lines
+    assert 'latency_seconds_count{route="/leads"} 4' in lines
+
+
+def test_labels_must_match_declaration():
+    """Test that a missing or unknown label is rejected instead of creating a stray series."""
+    registry = Registry()
+    pages = registry.counter("pages_total", "Pages fetched", ("source",))
+    with pytest.raises(ValueError):
+        pages.inc(host="x")
+    with pytest.raises(ValueError):
+        registry.counter("pages_total", "Again")
@@ -0,0 +1,242 @@
+"""Tests for schema migrations."""
+import logging
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app.database import Base, create_sqlite_engine
+from app.migrations import MIGRATIONS, check_sqlite_version, migrate, schema_version
+
+LATEST = MIGRATIONS[-1][0]
+
+
+def _index_names(engine):
+    return {ix["name"] for ix in inspect(engine).get_indexes("contract_awards")}
+
+
+def _model_index_names():
+    return {ix.name for ix in Base.metadata.tables["contract_awards"].indexes}
+
+
+@pytest.fixture
+def fresh_engine(tmp_path):
+    """Engine on a database built by create_all() alone, not yet migrated."""
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def test_migrate_fresh_database_is_noop(fresh_engine):
+    """Test that a create_all() database keeps its indexes and gets its version stamped."""
+    before = _index_names(fresh_engine)
+
+    assert migrate(fresh_engine) == LATEST
+    assert _index_names(fresh_engine) == before == _model_index_names()
+
+
+def test_migrate_legacy_database(legacy_engine, caplog):
+    """Test upgrading a pre-migration database to the current schema."""
+    with legacy_engine.begin() as conn:
+        for description in ("old", "new"):
+            conn.execute(text(
+                "INSERT INTO contract_awards (state, letting_date, contract_id, awarded_to, "
+                "description, source_url, score, status) VALUES "
+                "('KY', '2025-11-20', '101', 'ABC', :d, 'x', 0, 'NEW')"
+            ), {"d": description})
+
+    with caplog.at_level(logging.WARNING, logger="app.migrations"):
+        assert migrate(legacy_engine) == LATEST
+
+    assert _index_names(legacy_engine) == _model_index_names()
+    with legacy_engine.connect() as conn:
+        assert schema_version(conn) == LATEST
+        rows = conn.execute(text("SELECT description FROM contract_awards")).all()
+    assert rows == [("new",)]
+    # The dropped duplicate is reported, not lost silently
+    assert "Removed 1 duplicate contract_awards row(s)" in caplog.text
+
+
+def test_migrate_refuses_an_sqlite_without_drop_column(legacy_engine, monkeypatch):
+    """Test that a too-old SQLite library fails with a clear error before any migration runs."""
+    import sqlite3
+
+    check_sqlite_version((3, 35, 0))
+    monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 34, 1))
+
+    with pytest.raises(RuntimeError, match=r"SQLite 3\.34\.1 is too old.*3\.35\.0 or newer"):
+        migrate(legacy_engine)
+    with legacy_engine.connect() as conn:
+        assert schema_version(conn) == 0
+
+
+def test_migrate_skips_applied_versions(engine):
+    """Test that running migrate twice applies nothing the second time."""
+    migrate(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX ix_contract_awards_state ON contract_awards (state)"))
+
+    migrate(engine)
+
+    assert "ix_contract_awards_state" in _index_names(engine)
+
+
+def test_search_index_backfilled_and_kept_in_sync(legacy_engine):
+    """Test that existing rows are indexed on upgrade and later writes reach the index."""
+    insert = text(
+        "INSERT INTO contract_awards (state, letting_date, contract_id, awarded_to, "
+        "description, source_url, score, status) VALUES "
+        "('KY', '2025-11-20', :id, 'ABC', :d, 'x', 0, 'NEW')"
+    )
+    with legacy_engine.begin() as conn:
+        conn.execute(insert, {"id": "101", "d": "Crushed stone delivery"})
+    migrate(legacy_engine)
+
+    def search(q):
+        with legacy_engine.connect() as conn:
+            return conn.execute(
+                text("SELECT rowid FROM contract_awards_fts WHERE contract_awards_fts MATCH :q"), {"q": q}
+            ).scalars().all()
+
+    assert search("stone") == [1]
+    with legacy_engine.begin() as conn:
+        conn.execute(insert, {"id": "102", "d": "Gravel hauling"})
+        conn.execute(text("UPDATE contract_awards SET description = 'Bridge deck' WHERE contract_id = '101'"))
+    assert search("stone") == []
+    assert search("haul") == [2]  # Porter stemming
+    with legacy_engine.begin() as conn:
+        conn.execute(text("DELETE FROM contract_awards WHERE contract_id = '102'"))
+    assert search("gravel") == []
+
+
+def test_content_hash_backfilled_to_match_ingest(legacy_engine):
+    """Test that upgraded rows get the hash an ingest of the same contract computes."""
+    from datetime import date
+    from app.row_hash import row_hash
+
+    with legacy_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO contract_awards (state, letting_date, contract_id, awarded_to, description, "
+            "source_url, score, score_reasons, status) VALUES "
+            "('KY', '2025-11-20', '101', 'ABC', 'Haul', 'x', 8, '[\"r\"]', 'NEW')"
+        ))
+    migrate(legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        stored = conn.execute(text("SELECT content_hash FROM contract_awards")).scalar()
+    assert stored == row_hash((date(2025, 11, 20), "ABC", "Haul", None, "x", 8))
+
+
+def _migrate_to(engine, target):
+    """Apply the migrations up to and including version target."""
+    for number, _, upgrade in MIGRATIONS:
+        if number <= target:
+            with engine.begin() as conn:
+                upgrade(conn)
+                conn.execute(text(f"PRAGMA user_version = {number}"))
+
+
+def test_content_hash_backfill_hashes_the_columns_of_its_version(legacy_engine):
+    """Test that migration 7 hashes score_reasons, which the ingest hashed at that version."""
+    from app.migrations import _frozen_row_hash
+
+    with legacy_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO contract_awards (state, letting_date, contract_id, awarded_to, description, "
+            "source_url, score, score_reasons, status) VALUES "
+            "('KY', '2025-11-20', '101', 'ABC', 'Haul', 'x', 8, '[\"r\"]', 'NEW')"
+        ))
+    _migrate_to(legacy_engine, 7)
+
+    with legacy_engine.connect() as conn:
+        stored = conn.execute(text("SELECT content_hash FROM contract_awards")).scalar()
+    assert stored == _frozen_row_hash(("2025-11-20", "ABC", "Haul", None, "x", 8, '["r"]'))
+
+
+def test_amount_cents_backfilled(legacy_engine):
+    """Test that upgraded rows get amount_cents parsed from their amount string."""
+    with legacy_engine.begin() as conn:
+        for contract_id, amount in (("101", "$1,250,000.50"), ("102", "TBD"), ("103", None)):
+            conn.execute(text(
+                "INSERT INTO contract_awards (state, letting_date, contract_id, awarded_to, description, "
+                "amount, source_url, score, status) VALUES "
+                "('KY', '2025-11-20', :id, 'ABC', 'Haul', :amount, 'x', 0, 'NEW')"
+            ), {"id": contract_id, "amount": amount})
+    migrate(legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        rows = dict(conn.execute(text("SELECT contract_id, amount_cents FROM contract_awards")).all())
+    assert rows == {"101": 125000050, "102": None, "103": None}
+
+
+def test_score_reasons_moved_to_keyword_matches(legacy_engine):
+    """Test that stored reasons become keyword rows that render back to the same text."""
+    from app.models import ContractAward
+    from sqlalchemy import select
+
+    reasons = (
+        '["Matched keyword \'dump truck\' (+10 points)", "Matched keyword \'hauling\' (+8 points)", '
+        '"Matched keyword \'haul\' (+8 points)", "Matched keyword \'earthwork\' (+7 points)", '
+        '"Multiple relevant keywords bonus (+2 points)"]'
+    )
+    with legacy_engine.begin() as conn:
+        for contract_id, score, score_reasons in (("101", 35, reasons), ("102", 0, None)):
+            conn.execute(text(
+                "INSERT INTO contract_awards (state, letting_date, contract_id, awarded_to, description, "
+                "source_url, score, score_reasons, status) VALUES "
+                "('KY', '2025-11-20', :id, 'ABC', 'Haul', 'x', :score, :reasons, 'NEW')"
+            ), {"id": contract_id, "score": score, "reasons": score_reasons})
+    migrate(legacy_engine)
+
+    assert "score_reasons" not in {c["name"] for c in inspect(legacy_engine).get_columns("contract_awards")}
+    with legacy_engine.connect() as conn:
+        rendered = dict(conn.execute(select(ContractAward.contract_id, ContractAward.score_reasons)).all())
+        by_keyword = conn.execute(text(
+            "SELECT k.keyword, m.weight FROM contract_keywords m JOIN keywords k ON k.id = m.keyword_id"
+        )).all()
+        deleted = conn.execute(text("DELETE FROM contract_awards WHERE contract_id = '101'"))
+        remaining = conn.execute(text("SELECT COUNT(*) FROM contract_keywords")).scalar()
+    assert rendered == {"101": reasons, "102": None}
+    assert sorted(by_keyword) == [("dump truck", 10), ("earthwork", 7), ("haul", 8), ("hauling", 8)]
+    assert deleted.rowcount == 1 and remaining == 0
+
+
+def test_lead_stats_built_from_existing_leads(legacy_engine):
+    """Test that upgraded databases get summary tables counting the leads already stored."""
+    with legacy_engine.begin() as conn:
+        for contract_id, letting_date, score in (("101", "2025-11-20", 12), ("102", "2025-11-17", 3), ("103", "2025-11-24", 14)):
+            conn.execute(text(
+                "INSERT INTO contract_awards (state, letting_date, contract_id, awarded_to, description, "
+                "source_url, score, status) VALUES "
+                "('KY', :letting_date, :id, 'ABC', 'Haul', 'x', :score, 'NEW')"
+            ), {"id": contract_id, "letting_date": letting_date, "score": score})
+    migrate(legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        assert conn.execute(text("SELECT state, status, leads FROM lead_stats_status")).all() == [("KY", "NEW", 3)]
+        assert conn.execute(text("SELECT bucket, leads FROM lead_stats_score ORDER BY bucket")).all() == [(0, 1), (10, 2)]
+        assert conn.execute(text("SELECT week, leads FROM lead_stats_weekly ORDER BY week")).all() == [
+            ("2025-11-17", 2), ("2025-11-24", 1)
+        ]
+        assert conn.execute(text("SELECT contractor_id, leads FROM lead_stats_contractors")).all() == [(1, 3)]
+
+
+def test_existing_leads_linked_to_contractors(legacy_engine):
+    """Test that upgraded leads are resolved to contractors, variants of one name to the same one."""
+    names = ["ABC Paving, Inc.", "Bluegrass Hauling LLC", "ABC PAVING INC", "A.B.C. Paving", "Bluegras Hauling"]
+    with legacy_engine.begin() as conn:
+        for i, name in enumerate(names):
+            conn.execute(text(
+                "INSERT INTO contract_awards (state, letting_date, contract_id, awarded_to, description, "
+                "source_url, score, status) VALUES ('KY', '2025-11-20', :id, :name, 'Haul', 'x', 0, 'NEW')"
+            ), {"id": str(101 + i), "name": name})
+    migrate(legacy_engine)
+
+    with legacy_engine.connect() as conn:
+        contractors = conn.execute(text("SELECT id, name, canonical_name FROM contractors ORDER BY id")).all()
+        links = dict(conn.execute(text("SELECT awarded_to, contractor_id FROM contract_awards")).all())
+        counts = conn.execute(text("SELECT contractor_id, leads FROM lead_stats_contractors ORDER BY contractor_id")).all()
+    assert contractors == [(1, "ABC Paving, Inc.", "ABC PAVING"), (2, "Bluegrass Hauling LLC", "BLUEGRASS HAULING")]
+    assert links == {"ABC Paving, Inc.": 1, "ABC PAVING INC": 1, "A.B.C. Paving": 1,
+                     "Bluegrass Hauling LLC": 2, "Bluegras Hauling": 2}
+    assert counts == [(1, 3), (2, 2)]
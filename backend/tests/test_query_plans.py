@@ -0,0 +1,93 @@
+"""Query-plan regression tests for the GET /leads query shapes."""
+import itertools
+
+import pytest
+from sqlalchemy import text
+
+from app.api.routes import LEAD_FIELDS, lead_filters, leads_page_query
+from app.migrations import migrate
+
+# Every filter combination get_leads supports, with and without a cursor
+COMBINATIONS = list(itertools.product(
+    [None, "KY"],        # state
+    [None, "new"],       # status
+    [None, 10],          # min_score
+    [None, (30, 5)],     # cursor position (score, id)
+))
+
+
+# Amount range and sort combinations, with the other filters at their extremes
+AMOUNT_COMBINATIONS = list(itertools.product(
+    ["score", "amount"],  # sort
+    [None, "KY"],         # state
+    [None, "new"],        # status
+    [None, 10],           # min_score
+    [None, 500000],       # min_amount
+    [None, 900000],       # max_amount
+    [None, (30, 5)],      # cursor position (sort value, id)
+))
+
+
+def _plan(engine, state, status, min_score, after, min_amount=None, max_amount=None, sort="score"):
+    if after is not None and sort == "amount":
+        max_amount = None  # As get_leads does: the cursor bounds amount from above
+    clauses = lead_filters(state, status, min_score, None, min_amount, max_amount, sort)
+    query = leads_page_query(clauses, LEAD_FIELDS, after, 101, sort)
+    sql = str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return [row[3] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def _assert_indexed(plan, filtered):
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+    table_steps = [step for step in plan if "contract_awards" in step]
+    assert table_steps and all("USING INDEX" in step for step in table_steps), plan
+    if filtered:
+        # A filter must narrow the index range rather than walk all of it
+        assert all(step.startswith("SEARCH") for step in table_steps), plan
+
+
+@pytest.mark.parametrize("state,status,min_score,after", COMBINATIONS)
+def test_leads_query_uses_index_without_sort(engine, state, status, min_score, after):
+    """Test that each /leads query shape is an index walk with no temp sort."""
+    migrate(engine)
+    plan = _plan(engine, state, status, min_score, after)
+
+    _assert_indexed(plan, filtered=any(v is not None for v in (state, status, min_score, after)))
+
+
+@pytest.mark.parametrize("state,status,min_score,after", COMBINATIONS)
+def test_leads_query_plans_after_legacy_migration(legacy_engine, state, status, min_score, after):
+    """Test that migrated databases get the same plans as fresh ones."""
+    migrate(legacy_engine)
+    plan = _plan(legacy_engine, state, status, min_score, after)
+
+    _assert_indexed(plan, filtered=any(v is not None for v in (state, status, min_score, after)))
+
+
+@pytest.mark.parametrize("sort,state,status,min_score,min_amount,max_amount,after", AMOUNT_COMBINATIONS)
+def test_amount_query_shapes_use_index_without_sort(engine, sort, state, status, min_score, min_amount, max_amount, after):
+    """Test that amount filters and sort=amount never fall back to a temp sort."""
+    migrate(engine)
+    plan = _plan(engine, state, status, min_score, after, min_amount, max_amount, sort)
+
+    _assert_indexed(plan, filtered=sort == "amount" or any(v is not None for v in (state, status, min_score, after)))
+    if state and status:
+        assert f"state_status_{sort}" in plan[0], plan
+
+
+@pytest.mark.parametrize("sort,state,status,after", list(itertools.product(
+    ["score", "amount"], [None, "KY"], [None, "new"], [None, (30, 5)],
+)))
+def test_keyword_filter_keeps_walking_the_sort_index(engine, sort, state, status, after):
+    """Test that keyword= is checked per lead rather than driving the query."""
+    migrate(engine)
+    clauses = lead_filters(state, status, None, sort=sort, keyword="earthwork")
+    query = leads_page_query(clauses, LEAD_FIELDS, after, 101, sort)
+    sql = str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        plan = [row[3] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+    _assert_indexed(plan, filtered=sort == "amount" or any(v is not None for v in (state, status, after)))
+    assert any("contract_keywords USING PRIMARY KEY (contract_award_id=? AND keyword_id=?)" in step
+               for step in plan), plan
@@ -0,0 +1,175 @@
+"""Tests for incremental rescoring."""
+from datetime import date
+
+import pytest
+from sqlalchemy import update
+
+from app.ingest.runner import upsert_contracts
+from app.keyword_matches import stored_matches
+from app.models import ContractAward, ScoringVersion
+from app.rescore import changed_keywords, record_scoring_version, rescore
+from app.scoring import KEYWORD_WEIGHTS, KeywordScorer, render_score_reasons
+
+DESCRIPTIONS = [
+    "Dump truck hauling",
+    "Gravel and sand delivery",
+    "Bridge painting",
+    "Gravel base and earthwork grading with excavation",
+    "Office cleaning",
+]
+
+
+def _store(db, scorer, descriptions=DESCRIPTIONS):
+    rows = []
+    for i, description in enumerate(descriptions):
+        row = {
+            "state": "KY",
+            "letting_date": date(2025, 11, 20),
+            "contract_id": str(100 + i),
+            "awarded_to": "ABC Paving",
+            "description": description,
+            "amount": None,
+            "source_url": "https://example.test/letting",
+            "score_version": scorer.fingerprint,
+        }
+        row.update(scorer.score(description, row["contract_id"], row["awarded_to"]))
+        rows.append(row)
+    # As run_ingestion does: the version's keywords are numbered before any row matches them
+    record_scoring_version(db, scorer)
+    upsert_contracts(db, rows)
+    db.commit()
+
+
+def _scores(db):
+    db.expire_all()
+    return {c.description: (c.score, c.score_reasons, c.score_version) for c in db.query(ContractAward)}
+
+
+def _expected(scorer):
+    expected = {}
+    for i, d in enumerate(DESCRIPTIONS):
+        result = scorer.score(d, str(100 + i), "ABC Paving")
+        expected[d] = (result["score"], render_score_reasons(result["matches"], result["score"]), scorer.fingerprint)
+    return expected
+
+
+@pytest.fixture
+def old_scorer():
+    return KeywordScorer(KEYWORD_WEIGHTS)
+
+
+def test_single_weight_change_rescores_only_rows_with_that_keyword(db, old_scorer):
+    """Test that only rows containing the retuned keyword are touched."""
+    _store(db, old_scorer)
+    new_scorer = KeywordScorer({**KEYWORD_WEIGHTS, "gravel": 9})
+
+    result = rescore(db, new_scorer, batch_size=1)
+
+    assert result == {"score_version": new_scorer.fingerprint, "candidates": 2, "rescored": 2, "changed": 2}
+    scores = _scores(db)
+    for description in ("Gravel and sand delivery", "Gravel base and earthwork grading with excavation"):
+        assert scores[description] == _expected(new_scorer)[description]
+    for description in ("Dump truck hauling", "Bridge painting", "Office cleaning"):
+        assert scores[description][2] == old_scorer.fingerprint
+        assert scores[description][:2] == _expected(new_scorer)[description][:2]
+
+
+def test_rescore_twice_is_noop(db, old_scorer):
+    """Test that a second run finds nothing stale."""
+    _store(db, old_scorer)
+    new_scorer = KeywordScorer({**KEYWORD_WEIGHTS, "sand": 1})
+    rescore(db, new_scorer)
+
+    assert rescore(db, new_scorer)["candidates"] == 0
+
+
+def test_chained_changes_diff_against_each_rows_own_version(db, old_scorer):
+    """Test that rows left on an old version are still caught by a later change."""
+    _store(db, old_scorer)
+    second = KeywordScorer({**KEYWORD_WEIGHTS, "gravel": 9})
+    rescore(db, second)
+    third = KeywordScorer({**KEYWORD_WEIGHTS, "gravel": 9, "haul": 1})
+
+    result = rescore(db, third)
+
+    assert result["candidates"] == 1  # Only "Dump truck hauling" contains "haul"
+    scores = _scores(db)
+    assert {d: s[:2] for d, s in scores.items()} == {d: s[:2] for d, s in _expected(third).items()}
+
+
+def test_keyword_added_mid_table_is_rendered_after_older_keywords(db, old_scorer):
+    """Test that score_reasons lists keywords in id order, not where the table has them."""
+    _store(db, old_scorer)
+    new_scorer = KeywordScorer({"delivery": 3, **KEYWORD_WEIGHTS})
+    rescore(db, new_scorer)
+
+    contract = db.query(ContractAward).filter_by(description="Gravel and sand delivery").one()
+    matches = stored_matches(db, [contract.id])[contract.id]
+    assert matches == (("gravel", 5), ("sand", 4), ("delivery", 3))
+    assert new_scorer.score(contract.description)["matches"][0] == ("delivery", 3)
+    assert contract.score_reasons == render_score_reasons(matches, contract.score)
+
+
+def test_new_keyword_finds_rows_with_non_ascii_capitals(db, old_scorer):
+    """Test that stale rows are selected with the case folding the scorer matches with."""
+    _store(db, old_scorer, descriptions=["ÉCLAIRAGE DU PONT", "Bridge painting"])
+    new_scorer = KeywordScorer({**KEYWORD_WEIGHTS, "éclairage": 4})
+
+    result = rescore(db, new_scorer)
+
+    assert result["candidates"] == 1
+    assert _scores(db)["ÉCLAIRAGE DU PONT"][0] == 4
+
+
+def test_added_and_removed_keywords_are_changes(old_scorer):
+    """Test that keywords present on only one side count as changed."""
+    old = ScoringVersion(weights='{"haul": 8, "sand": 4}', bonus_threshold=3, bonus_per_keyword=2)
+
+    assert changed_keywords(old, KeywordScorer({"haul": 8, "tar": 2})) == {"sand", "tar"}
+    assert changed_keywords(old, KeywordScorer({"haul": 8, "sand": 4}, bonus_threshold=2)) is None
+    assert changed_keywords(None, old_scorer) is None
+
+
+def test_unversioned_rows_are_fully_rescored(db, old_scorer):
+    """Test that rows scored before versioning existed are all rescored."""
+    _store(db, old_scorer)
+    db.execute(update(ContractAward).values(score_version=None, score=0))
+    db.commit()
+
+    result = rescore(db, old_scorer)
+
+    assert result["rescored"] == len(DESCRIPTIONS)
+    assert result["changed"] == 3  # Rows with no keyword already scored 0
+    assert _scores(db) == _expected(old_scorer)
+
+
+def test_dry_run_only_counts(db, old_scorer):
+    """Test that a dry run writes nothing."""
+    _store(db, old_scorer)
+    new_scorer = KeywordScorer({**KEYWORD_WEIGHTS, "gravel": 9})
+    before = _scores(db)
+
+    result = rescore(db, new_scorer, dry_run=True)
+
+    assert result["candidates"] == 2
+    assert result["rescored"] == 0
+    assert _scores(db) == before
+
+
+def test_rescored_rows_stay_unchanged_for_the_next_ingest(db, old_scorer):
+    """Test that rescore keeps content_hash in step with the new scores."""
+    _store(db, old_scorer)
+    new_scorer = KeywordScorer({**KEYWORD_WEIGHTS, "gravel": 9})
+    rescore(db, new_scorer)
+
+    rows = []
+    for i, description in enumerate(DESCRIPTIONS):
+        row = {
+            "state": "KY", "letting_date": date(2025, 11, 20), "contract_id": str(100 + i),
+            "awarded_to": "ABC Paving", "description": description, "amount": None,
+            "source_url": "https://example.test/letting", "score_version": new_scorer.fingerprint,
+        }
+        row.update(new_scorer.score(description, row["contract_id"], row["awarded_to"]))
+        rows.append(row)
+
+    assert upsert_contracts(db, rows)["unchanged"] == len(DESCRIPTIONS)
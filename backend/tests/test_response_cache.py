@@ -0,0 +1,54 @@
+"""Tests for the GET /leads response cache."""
+from app.api.response_cache import ResponseCache, etag_matches, make_etag
+
+
+def test_entry_only_served_for_its_version():
+    """Test that a version bump invalidates without clearing the cache."""
+    cache = ResponseCache()
+    cache.put("k", 1, b"body")
+
+    assert cache.get("k", 1).body == b"body"
+    assert cache.get("k", 2) is None
+    assert cache.get("k", 1) is None  # The stale entry was dropped
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_evicts_least_recently_used_beyond_max_entries():
+    """Test LRU eviction by entry count."""
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", 0, b"a")
+    cache.put("b", 0, b"b")
+    cache.get("a", 0)
+    cache.put("c", 0, b"c")
+
+    assert cache.get("b", 0) is None
+    assert cache.get("a", 0) is not None
+    assert cache.get("c", 0) is not None
+
+
+def test_evicts_beyond_max_bytes_and_skips_oversized_bodies():
+    """Test the size cap on stored bodies."""
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", 0, b"12345")
+    cache.put("b", 0, b"12345")
+    cache.put("c", 0, b"1")
+
+    assert cache.get("a", 0) is None
+    assert len(cache) == 2
+
+    entry = cache.put("big", 0, b"x" * 11)
+    assert entry.etag == make_etag(b"x" * 11)
+    assert cache.get("big", 0) is None
+    assert len(cache) == 2
+
+
+def test_etag_matches():
+    """Test If-None-Match parsing."""
+    etag = make_etag(b"body")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
@@ -0,0 +1,401 @@
+"""Tests for the ingestion runner."""
+from datetime import date
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from app.ingest.cache import PageCache
+from app.ingest import runner
+from app.ingest.kytc import normalize_kytc
+from app.ingest.runner import run_ingestion, upsert_contracts
+from app.ingest.sources import Source
+from app.models import ContractAward, ContractStatus
+
+
+def _raw(contract_id, description="Dump truck hauling", awarded_to="ABC Paving", amount=None):
+    return {
+        "letting_date": date(2025, 11, 20),
+        "contract_id": contract_id,
+        "awarded_to": awarded_to,
+        "description": description,
+        "amount": amount,
+        "source_url": "https://example.test/letting",
+    }
+
+
+@pytest.fixture
+def sources(fake_source):
+    """Replace the network sources with in-memory lists the test can edit."""
+    data = {"kytc": [], "indot": []}
+    fake_source("kytc", lambda **kwargs: list(data["kytc"]))
+    fake_source("indot", lambda **kwargs: list(data["indot"]))
+    return data
+
+
+def test_run_ingestion_inserts_then_reports_unchanged(db, sources):
+    """Test that a repeated run with identical data writes nothing."""
+    sources["kytc"] = [_raw("101"), _raw("102")]
+    sources["indot"] = [_raw("101")]
+
+    first = run_ingestion(db)
+    assert first["inserted"] == 3
+    assert first["updated"] == 0
+    assert first["total_processed"] == 3
+    assert db.query(ContractAward).count() == 3
+
+    second = run_ingestion(db)
+    assert second["inserted"] == 0
+    assert second["updated"] == 0
+    assert second["unchanged"] == 3
+
+
+def test_unchanged_contracts_are_not_written(db, sources):
+    """Test that a re-ingest leaves updated_at alone and writes only the changed row."""
+    from sqlalchemy import text
+    from app.row_hash import HASHED_COLUMNS, row_hash
+
+    sources["kytc"] = [_raw("101"), _raw("102")]
+    run_ingestion(db)
+    db.execute(text("UPDATE contract_awards SET updated_at = '2000-01-01 00:00:00'"))
+    db.commit()
+
+    sources["kytc"] = [_raw("101"), _raw("102", description="Bridge painting")]
+    result = run_ingestion(db)
+
+    assert (result["inserted"], result["updated"], result["unchanged"]) == (0, 1, 1)
+    stamps = dict(db.execute(text("SELECT contract_id, updated_at FROM contract_awards")).all())
+    assert stamps["101"] == "2000-01-01 00:00:00"
+    assert stamps["102"] > "2000-01-01 00:00:00"
+    db.expire_all()
+    lead = db.query(ContractAward).filter_by(contract_id="102").one()
+    assert lead.content_hash == row_hash([getattr(lead, column) for column in HASHED_COLUMNS])
+
+
+def test_run_ingestion_updates_changed_rows_and_keeps_status(db, sources):
+    """Test that changed contracts are updated without resetting a manual status."""
+    sources["kytc"] = [_raw("101"), _raw("102")]
+    run_ingestion(db)
+
+    lead = db.query(ContractAward).filter_by(contract_id="101").one()
+    lead.status = ContractStatus.CONTACTED
+    db.commit()
+
+    sources["kytc"] = [_raw("101", description="Bridge painting"), _raw("102")]
+    result = run_ingestion(db)
+    assert result["updated"] == 1
+    assert result["unchanged"] == 1
+
+    db.expire_all()
+    lead = db.query(ContractAward).filter_by(contract_id="101").one()
+    assert lead.description == "Bridge painting"
+    assert lead.score == 0
+    assert lead.status == ContractStatus.CONTACTED
+
+
+def test_run_ingestion_replaces_keyword_matches_of_changed_rows(db, sources):
+    """Test that matches follow each written row and unchanged rows keep theirs."""
+    from app.keyword_matches import stored_matches
+
+    sources["kytc"] = [_raw("101", description="Gravel hauling"), _raw("102", description="Earthwork")]
+    run_ingestion(db)
+    sources["kytc"] = [_raw("101", description="Bridge painting"), _raw("102", description="Earthwork")]
+    run_ingestion(db)
+
+    ids = dict(db.query(ContractAward.contract_id, ContractAward.id).all())
+    assert stored_matches(db, ids.values()) == {ids["102"]: (("earthwork", 7),)}
+
+
+def test_run_ingestion_parses_amounts(db, sources):
+    """Test that ingests store the raw amount and its cents, and re-parse it when it changes."""
+    sources["kytc"] = [_raw("101", amount="$1,234.50"), _raw("102", amount="TBD")]
+    run_ingestion(db)
+    sources["kytc"] = [_raw("101", amount="$2,000"), _raw("102", amount="TBD")]
+    run_ingestion(db)
+
+    db.expire_all()
+    stored = {lead.contract_id: (lead.amount, lead.amount_cents) for lead in db.query(ContractAward)}
+    assert stored == {"101": ("$2,000", 200000), "102": ("TBD", None)}
+
+
+def test_upsert_contracts_chunks_and_dedupes(db):
+    """Test chunked upserts and last-wins handling of repeated keys."""
+    rows = [
+        {"state": "KY", **_raw(str(i)), "score": 0}
+        for i in range(25)
+    ]
+    rows.append({"state": "KY", **_raw("3", description="Later copy"), "score": 0})
+
+    counts = upsert_contracts(db, rows, chunk_size=7)
+    db.commit()
+
+    assert counts == {"inserted": 25, "updated": 0, "unchanged": 0}
+    assert db.query(ContractAward).filter_by(contract_id="3").one().description == "Later copy"
+
+
+def test_run_ingestion_flushes_page_cache_after_commit(db, sources, fake_source, tmp_path):
+    """Test that pages staged during a run are persisted and reported."""
+    def fake_kytc(cache=None, stats=None, **kwargs):
+        cache.misses += 1
+        cache.stage("https://example.test/letting", '"v1"', None, "abc")
+        return [_raw("101")]
+
+    fake_source("kytc", fake_kytc)
+
+    result = run_ingestion(db, cache=PageCache(str(tmp_path)))
+
+    assert result["cache_misses"] == 1
+    assert PageCache(str(tmp_path)).get("https://example.test/letting")["etag"] == '"v1"'
+
+
+def test_run_ingestion_stamps_score_version(db, sources):
+    """Test that ingested rows carry the scorer fingerprint and its rules are stored."""
+    from app.models import ScoringVersion
+    from app.scoring import get_scorer
+
+    sources["kytc"] = [_raw("101")]
+    run_ingestion(db)
+
+    fingerprint = get_scorer().fingerprint
+    assert db.query(ContractAward).one().score_version == fingerprint
+    assert db.get(ScoringVersion, fingerprint) is not None
+
+
+def test_run_ingestion_commits_in_chunks(db, sources):
+    """Test that records are committed commit_every at a time and counted per source."""
+    sources["kytc"] = [_raw(str(i)) for i in range(25)]
+    sources["indot"] = [_raw("I1")]
+    reported = []
+
+    result = run_ingestion(db, commit_every=10, progress=lambda stage, **counts: reported.append(counts))
+
+    assert result["chunks"] == 3
+    assert (result["sources"]["kytc"]["records"], result["sources"]["indot"]["records"]) == (25, 1)
+    assert result["inserted"] == 26
+    assert [c["total_processed"] for c in reported if "chunks" in c] == [10, 20, 26]
+
+
+def test_run_ingestion_isolates_a_failing_source(db, sources, fake_source, tmp_path):
+    """Test that a source failing part way keeps its records, does not stop the others, and is not cached."""
+    import json
+    from app.models import IngestRun
+
+    def failing_kytc(cache=None, stats=None, **kwargs):
+        cache.stage("https://example.test/letting", '"v1"', None, "abc")
+        for i in range(15):
+            yield _raw(str(i))
+        raise RuntimeError("connection reset")
+
+    fake_source("kytc", failing_kytc)
+    sources["indot"] = [_raw("I1")]
+
+    result = run_ingestion(db, cache=PageCache(str(tmp_path)), commit_every=10)
+
+    assert result["status"] == "partial"
+    assert result["sources"]["kytc"]["status"] == "failed"
+    assert result["sources"]["kytc"]["error"] == "RuntimeError: connection reset"
+    assert result["sources"]["kytc"]["records"] == 15
+    assert result["sources"]["indot"]["status"] == "succeeded"
+    assert db.query(ContractAward).count() == 16
+    assert PageCache(str(tmp_path)).get("https://example.test/letting") is None
+
+    run = db.get(IngestRun, result["run_id"])
+    assert run.status == "partial"
+    assert run.error == "kytc: RuntimeError: connection reset"
+    assert json.loads(run.summary)["sources"]["kytc"]["status"] == "failed"
+
+
+def test_run_ingestion_saves_watermarks_of_sources_that_succeeded(db, fake_source):
+    """Test that completed lettings are recorded for a source that succeeded, not for one that failed."""
+    from app.ingest.watermark import load_watermark
+
+    def completing(fail):
+        def fetch(cache=None, stats=None, watermark=None, **kwargs):
+            yield _raw("101")
+            watermark.complete(date(2025, 11, 20), 1)
+            if fail:
+                raise RuntimeError("connection reset")
+        return fetch
+
+    fake_source("kytc", completing(fail=True))
+    fake_source("indot", completing(fail=False))
+
+    run_ingestion(db)
+
+    assert load_watermark(db, "kytc").latest is None
+    assert load_watermark(db, "indot").latest == date(2025, 11, 20)
+
+
+def test_run_ingestion_abandons_a_source_that_times_out(db, sources, fake_source, monkeypatch, tmp_path):
+    """Test that a hung source is cut off at its timeout while the others are ingested."""
+    release = threading.Event()
+    # Hand over every record at once, so K1 has reached the pipeline when the source hangs
+    monkeypatch.setattr(runner, "SOURCE_BATCH_SIZE", 1)
+
+    def hung_kytc(cache=None, stats=None, **kwargs):
+        yield _raw("K1")
+        cache.stage("https://example.test/letting", '"v1"', None, "abc")
+        release.wait(10)
+        yield _raw("K2")
+
+    fake_source("kytc", hung_kytc, timeout=0.3)
+    sources["indot"] = [_raw("I1")]
+
+    started = time.perf_counter()
+    try:
+        result = run_ingestion(db, cache=PageCache(str(tmp_path)))
+    finally:
+        release.set()
+
+    assert time.perf_counter() - started < 5
+    assert result["status"] == "partial"
+    assert result["sources"]["kytc"]["status"] == "timed_out"
+    assert result["sources"]["indot"]["status"] == "succeeded"
+    assert {c.contract_id for c in db.query(ContractAward)} == {"K1", "I1"}
+    assert PageCache(str(tmp_path)).get("https://example.test/letting") is None
+
+
+def test_run_ingestion_runs_sources_concurrently(db, sources, fake_source):
+    """Test that each source runs on its own worker (neither finishes unless both are running)."""
+    both_running = threading.Barrier(2, timeout=5)
+
+    def waiting_source(contract_id):
+        def fetch(cache=None, stats=None, **kwargs):
+            both_running.wait()
+            yield _raw(contract_id)
+        return fetch
+
+    fake_source("kytc", waiting_source("K1"))
+    fake_source("indot", waiting_source("I1"))
+
+    result = run_ingestion(db)
+
+    assert result["status"] == "succeeded"
+    assert result["inserted"] == 2
+
+
+def test_run_ingestion_holds_no_connection_while_fetching(db, engine, sources, fake_source):
+    """Test that other writers are not locked out while the first chunk is being fetched."""
+    import sqlite3
+
+    seen = {}
+
+    def fetch(**kwargs):
+        seen["checked_out"] = engine.pool.checkedout()
+        other = sqlite3.connect(engine.url.database, timeout=0)
+        try:
+            other.execute("BEGIN IMMEDIATE")  # Fails at once if a write transaction is open
+            other.rollback()
+            seen["locked"] = False
+        except sqlite3.OperationalError:
+            seen["locked"] = True
+        finally:
+            other.close()
+        yield _raw("101")
+
+    fake_source("kytc", fetch)
+    result = run_ingestion(db)
+
+    assert result["inserted"] == 1
+    assert seen == {"checked_out": 0, "locked": False}
+
+
+def test_run_ingestion_stops_writing_once_cancelled(db, sources):
+    """Test that a set cancelled event fails the run before its next chunk is written."""
+    from app.models import IngestRun
+
+    sources["kytc"] = [_raw("101"), _raw("102"), _raw("103")]
+    cancelled = threading.Event()
+
+    def progress(stage, **counts):
+        if counts.get("total_processed") == 1:
+            cancelled.set()  # e.g. the ingest lease was lost
+
+    with pytest.raises(runner.IngestCancelled):
+        run_ingestion(db, commit_every=1, progress=progress, cancelled=cancelled)
+
+    assert [c.contract_id for c in db.query(ContractAward)] == ["101"]
+    assert db.query(IngestRun.status).scalar() == "failed"
+
+
+def test_run_ingestion_with_every_source_failing_is_a_failed_run(db, sources, fake_source):
+    """Test that a run in which no source succeeded is stored as failed without raising."""
+    from app.models import IngestRun
+
+    def broken(**kwargs):
+        raise RuntimeError("source exploded")
+
+    fake_source("kytc", broken)
+    fake_source("indot", broken)
+
+    result = run_ingestion(db)
+
+    assert result["status"] == "failed"
+    assert db.get(IngestRun, result["run_id"]).status == "failed"
+
+
+def _peak_ingest_memory(db, count):
+    """Peak Python allocation while ingesting count generated records."""
+    source = Source("kytc", fetch=lambda **kwargs: (_raw(f"C{i}") for i in range(count)), normalize=normalize_kytc)
+    tracemalloc.start()
+    try:
+        result = run_ingestion(db, commit_every=500, sources=[source])
+        assert result["inserted"] == count
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_run_ingestion_memory_does_not_grow_with_source_size(tmp_path):
+    """Test that peak memory is about the same for a source ten times larger."""
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base, create_sqlite_engine
+
+    peaks = {}
+    for count in (2_000, 20_000):
+        engine = create_sqlite_engine(f"sqlite:///{tmp_path / f'{count}.db'}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            peaks[count] = _peak_ingest_memory(db, count)
+        finally:
+            db.close()
+            engine.dispose()
+
+    assert peaks[20_000] < peaks[2_000] * 1.5, peaks
+
+
+def test_run_ingestion_stores_run_summary(db, sources):
+    """Test that each run is stored in ingest_runs with its counts and stage timings."""
+    import json
+    from app.models import IngestRun
+
+    sources["kytc"] = [_raw("101"), _raw("102")]
+    result = run_ingestion(db)
+
+    run = db.get(IngestRun, result["run_id"])
+    assert run.status == "succeeded"
+    assert json.loads(run.counts)["inserted"] == 2
+    summary = json.loads(run.summary)
+    assert summary == result["summary"]
+    assert {"score", "upsert", "commit"} <= set(summary["stages"])
+    assert "source" in summary["sources"]["kytc"]["seconds"]
+
+
+def test_run_ingestion_stores_failed_run(db, sources, monkeypatch):
+    """Test that a pipeline failure aborts the run and is recorded with its error."""
+    from app.models import IngestRun
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    sources["kytc"] = [_raw("101")]
+    monkeypatch.setattr(runner, "upsert_contracts", broken)
+
+    with pytest.raises(RuntimeError):
+        run_ingestion(db)
+
+    run = db.query(IngestRun).one()
+    assert run.status == "failed"
+    assert run.error == "RuntimeError: disk full"
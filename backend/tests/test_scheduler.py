@@ -0,0 +1,197 @@
+"""Tests for the ingest lease and the in-process ingest scheduler."""
+import random
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.ingest import scheduler as scheduler_module
+from app.ingest.jobs import JobManager
+from app.ingest.lease import (
+    HOLDER, INGEST_LEASE, LeaseHeld, acquire_lease, held_lease, lease_holder, release_lease, renew_lease,
+)
+from app.ingest.scheduler import IngestScheduler, due_sources, next_delay, run_leased_ingestion
+from app.ingest.sources import Source, get_sources
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def sources(fake_source):
+    """KYTC succeeding with no records and INDOT failing until told otherwise."""
+    state = {"indot_fails": True}
+
+    def ingest_indot(**kwargs):
+        if state["indot_fails"]:
+            raise ConnectionError("INDOT is down")
+        return []
+
+    fake_source("kytc", lambda **kwargs: [], interval=3600)
+    fake_source("indot", ingest_indot, interval=7200)
+    return state
+
+
+def _schedule(db):
+    db.commit()
+    return {
+        source: (next_run_at, failures, last_status)
+        for source, next_run_at, failures, last_status in db.execute(text(
+            "SELECT source, next_run_at, failures, last_status FROM ingest_schedule"
+        ))
+    }
+
+
+def test_lease_excludes_other_holders_until_it_expires(db):
+    """Test acquire, re-acquire, renew, expiry and release of a lease."""
+    assert acquire_lease(db, "ingest", "a", seconds=60, now=1000)
+    assert acquire_lease(db, "ingest", "a", seconds=60, now=1010)  # The holder extends it
+    assert not acquire_lease(db, "ingest", "b", seconds=60, now=1069)
+    assert lease_holder(db, "ingest", now=1069) == ("a", 1070)
+
+    assert acquire_lease(db, "ingest", "b", seconds=60, now=1070)  # Expired
+    assert not renew_lease(db, "ingest", "a")
+    assert renew_lease(db, "ingest", "b")
+
+    release_lease(db, "ingest", "a")  # Not a's to release
+    assert lease_holder(db, "ingest")[0] == "b"
+    release_lease(db, "ingest", "b")
+    assert lease_holder(db, "ingest") is None
+
+
+def test_held_lease_raises_while_another_process_holds_it(db, session_factory):
+    """Test that held_lease refuses a held lease and releases its own on exit."""
+    acquire_lease(db, INGEST_LEASE, "other-worker")
+    with pytest.raises(LeaseHeld, match="other-worker"):
+        with held_lease(session_factory):
+            pass
+
+    release_lease(db, INGEST_LEASE, "other-worker")
+    with held_lease(session_factory):
+        assert lease_holder(db, INGEST_LEASE)[0] == HOLDER
+    assert lease_holder(db, INGEST_LEASE) is None
+
+
+def test_held_lease_renews_while_the_writer_connection_is_busy(engine):
+    """Test that renewals do not wait for the writer pool the ingest has checked out."""
+    from app.database import create_sqlite_engine
+
+    writer = create_sqlite_engine(str(engine.url), pool_size=1, max_overflow=0, pool_timeout=0.05)
+    busy = writer.connect()  # As an ingest's session holds it
+    try:
+        with held_lease(sessionmaker(bind=writer), seconds=0.3) as lease:
+            time.sleep(0.5)
+            with engine.connect() as conn:
+                expires_at = conn.execute(text("SELECT expires_at FROM leases")).scalar()
+            assert expires_at > time.time()
+            assert not lease.lost.is_set()
+    finally:
+        busy.close()
+        writer.dispose()
+
+
+def test_held_lease_reports_a_lost_lease(db, session_factory):
+    """Test that the lost event is set once another process takes the lease over."""
+    with held_lease(session_factory, seconds=0.3) as lease:
+        db.execute(text("UPDATE leases SET holder = 'other-worker'"))
+        db.commit()
+        assert lease.lost.wait(timeout=2)
+    assert lease_holder(db, INGEST_LEASE)[0] == "other-worker"  # Not released by the loser
+
+
+def test_next_delay_backs_off_and_jitters(monkeypatch):
+    """Test the interval after a success, the doubling backoff after failures, and the jitter."""
+    monkeypatch.setattr(scheduler_module, "INGEST_RETRY_SECONDS", 300)
+    monkeypatch.setattr(scheduler_module, "INGEST_RETRY_MAX_SECONDS", 2000)
+    source = Source("test", fetch=list, normalize=list, interval=3600)
+
+    assert next_delay(source, 0, jitter=0) == 3600
+    assert [next_delay(source, failures, jitter=0) for failures in (1, 2, 3, 4, 5)] == [300, 600, 1200, 2000, 2000]
+    rng = random.Random(1)
+    delays = [next_delay(source, 0, rng, jitter=0.1) for _ in range(200)]
+    assert all(3240 <= delay <= 3960 for delay in delays)
+    assert len(set(delays)) == len(delays)
+
+    monkeypatch.setenv("INGEST_INTERVAL_SECONDS_TEST", "60")
+    assert next_delay(source, 0, jitter=0) == 60
+
+
+def test_run_leased_ingestion_reschedules_each_source(db, session_factory, sources, monkeypatch):
+    """Test that a success schedules the source's interval and failures back off."""
+    monkeypatch.setattr(scheduler_module, "INGEST_SCHEDULE_JITTER", 0)
+    monkeypatch.setattr(scheduler_module, "INGEST_RETRY_SECONDS", 300)
+
+    before = time.time()
+    result = run_leased_ingestion(session_factory)
+    assert result["status"] == "partial"
+    schedule = _schedule(db)
+    assert schedule["kytc"][1:] == (0, "succeeded")
+    assert before + 3600 <= schedule["kytc"][0] <= time.time() + 3600
+    assert schedule["indot"][1:] == (1, "failed")
+    assert before + 300 <= schedule["indot"][0] <= time.time() + 300
+
+    run_leased_ingestion(session_factory)
+    assert _schedule(db)["indot"][1] == 2
+    assert _schedule(db)["indot"][0] >= before + 600
+
+    sources["indot_fails"] = False
+    run_leased_ingestion(session_factory)
+    assert _schedule(db)["indot"][1:] == (0, "succeeded")
+    assert lease_holder(db, INGEST_LEASE) is None
+
+
+def test_scheduler_runs_only_due_sources(db, session_factory, sources):
+    """Test that a tick ingests the due sources once and then waits for them."""
+    jobs = JobManager()
+    scheduler = IngestScheduler(session_factory, jobs=jobs)
+
+    job = scheduler.tick()
+    assert job is not None and job.wait(timeout=10)
+    assert job.params["sources"] == ["kytc", "indot"]
+    assert set(job.result["sources"]) == {"kytc", "indot"}
+
+    # Neither is due again yet; INDOT is once its backoff has passed
+    assert scheduler.tick() is None
+    indot_due = _schedule(db)["indot"][0]
+    job = scheduler.tick(now=indot_due + 1)
+    assert job is not None and job.wait(timeout=10)
+    assert job.params["sources"] == ["indot"]
+    assert set(job.result["sources"]) == {"indot"}
+
+
+def test_scheduler_skips_while_another_process_ingests(db, session_factory, sources):
+    """Test that a tick starts nothing while another worker holds the ingest lease."""
+    jobs = JobManager()
+    acquire_lease(db, INGEST_LEASE, "other-worker")
+    assert IngestScheduler(session_factory, jobs=jobs).tick() is None
+    assert jobs.current is None
+
+    # If the other worker ingested everything before the lease was taken, the run is skipped
+    kytc, indot = [source for source in get_sources() if source.name in ("kytc", "indot")]
+    release_lease(db, INGEST_LEASE, "other-worker")
+    db.execute(text(
+        "INSERT INTO ingest_schedule (source, next_run_at, failures) VALUES ('kytc', :later, 0), ('indot', :later, 0)"
+    ), {"later": time.time() + 3600})
+    db.commit()
+    assert due_sources(db, [kytc, indot], time.time()) == []
+    result = run_leased_ingestion(session_factory, [kytc, indot], due_at=time.time())
+    assert result["status"] == "skipped"
+    assert db.execute(text("SELECT count(*) FROM ingest_runs")).scalar() == 0
+
+
+def test_scheduler_thread_starts_and_stops(db, session_factory, sources):
+    """Test that the background thread ticks and stops promptly."""
+    jobs = JobManager()
+    scheduler = IngestScheduler(session_factory, jobs=jobs, poll_seconds=0.01)
+    scheduler.start()
+    try:
+        deadline = time.time() + 10
+        while not _schedule(db) and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        scheduler.stop(timeout=5)
+    assert set(_schedule(db)) == {"kytc", "indot"}
+    assert scheduler._thread is None
@@ -1,6 +1,7 @@
 """Tests for the scoring module."""
+import json
 import pytest
-from app.scoring import score_contract, KEYWORD_WEIGHTS
+from app.scoring import render_score_reasons, score_contract, score_many, KEYWORD_WEIGHTS
 
 
 def test_score_contract_with_dump_truck_keyword():
@@ -78,3 +79,48 @@ def test_score_contract_with_awarded_to():
     assert result["score"] >= 10  # Should match "dump truck"
     assert result["score_reasons"] is not None
 
+
+
+def test_score_contract_overlapping_keywords():
+    """Test that overlapping keywords each count ('haul' inside 'hauling')."""
+    result = score_contract("Material hauling")
+
+    reasons = json.loads(result["score_reasons"])
+    assert reasons == [
+        "Matched keyword 'hauling' (+8 points)",
+        "Matched keyword 'haul' (+8 points)",
+        "Matched keyword 'material hauling' (+9 points)",
+    ]
+    assert result["score"] == 8 + 8 + 9
+
+
+def test_score_contract_bonus_amount():
+    """Test the exact bonus for more than three matched keywords."""
+    result = score_contract("Earthwork, excavation, grading and fill")
+
+    reasons = json.loads(result["score_reasons"])
+    assert reasons[-1] == "Multiple relevant keywords bonus (+2 points)"
+    assert result["score"] == 7 + 6 + 6 + 5 + 2
+
+
+def test_score_many_matches_score_contract():
+    """Test that batch scoring returns the same results in input order."""
+    records = [
+        {"description": "Dump truck hauling", "contract_id": "101", "awarded_to": "ABC Paving"},
+        {"description": "Bridge painting", "contract_id": "102", "awarded_to": "XYZ Inc."},
+        {"description": "Grading", "contract_id": "103", "awarded_to": "Stone Trucking LLC"},
+    ]
+    results = score_many(records)
+
+    assert [{"score": r["score"], "score_reasons": render_score_reasons(r["matches"], r["score"])} for r in results] == [
+        score_contract(r["description"], contract_id=r["contract_id"], awarded_to=r["awarded_to"])
+        for r in records
+    ]
+
+
+def test_score_contract_picks_up_weight_changes(monkeypatch):
+    """Test that the compiled table is rebuilt when KEYWORD_WEIGHTS changes."""
+    monkeypatch.setitem(KEYWORD_WEIGHTS, "riprap", 3)
+    result = score_contract("Riprap placement")
+
+    assert result["score"] == 3
@@ -0,0 +1,31 @@
+"""Tests for the ingest source registry."""
+import pytest
+
+from app.ingest.indot import ingest_indot, normalize_indot
+from app.ingest.kytc import discover_lettings, ingest_kytc, normalize_kytc
+from app.ingest.sources import SOURCES, Source, get_sources, register_source
+
+
+def test_sources_in_the_package_are_discovered():
+    """Test that every source module registers its fetch and normalize callables."""
+    sources = {source.name: source for source in get_sources()}
+
+    assert sources["kytc"] == Source("kytc", fetch=ingest_kytc, normalize=normalize_kytc, discover=discover_lettings)
+    assert sources["indot"] == Source("indot", fetch=ingest_indot, normalize=normalize_indot)
+
+
+def test_register_source_rejects_a_second_source_with_the_same_name(monkeypatch):
+    """Test that two different sources cannot share a name, but re-registering is harmless."""
+    monkeypatch.setattr("app.ingest.sources.SOURCES", dict(SOURCES))
+
+    register_source(Source("kytc", fetch=ingest_kytc, normalize=normalize_kytc, discover=discover_lettings))
+    with pytest.raises(ValueError):
+        register_source(Source("kytc", fetch=ingest_indot, normalize=normalize_kytc))
+
+
+def test_source_timeout_defaults_to_the_configured_one(monkeypatch):
+    """Test that a source without its own timeout uses INGEST_SOURCE_TIMEOUT."""
+    monkeypatch.setattr("app.ingest.sources.INGEST_SOURCE_TIMEOUT", 42.0)
+
+    assert Source("x", fetch=ingest_kytc, normalize=normalize_kytc).timeout_seconds == 42.0
+    assert Source("x", fetch=ingest_kytc, normalize=normalize_kytc, timeout=5).timeout_seconds == 5
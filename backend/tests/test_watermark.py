@@ -0,0 +1,56 @@
+"""Tests for per-source watermarks."""
+from datetime import date
+
+from app.ingest.watermark import Watermark, load_watermark, pending_lettings, save_watermark, select_lettings
+
+LETTINGS = [date(2025, 1, 16), date(2025, 9, 18), date(2025, 10, 23), date(2025, 11, 20), date(2025, 12, 18)]
+
+
+def test_select_lettings_takes_new_ones_and_the_recheck_window():
+    """Test that a regular run fetches lettings after the watermark and a window before it."""
+    watermark = Watermark("kytc", latest=date(2025, 10, 23))
+
+    assert select_lettings(LETTINGS, watermark, recheck_days=40) == [
+        date(2025, 9, 18), date(2025, 10, 23), date(2025, 11, 20), date(2025, 12, 18),
+    ]
+    assert select_lettings(LETTINGS, watermark, recheck_days=0) == [
+        date(2025, 10, 23), date(2025, 11, 20), date(2025, 12, 18),
+    ]
+
+
+def test_select_lettings_first_run_only_takes_the_newest():
+    """Test that without a watermark the window ends at the newest letting, leaving history to the backfill."""
+    assert select_lettings(LETTINGS, Watermark("kytc"), recheck_days=30) == [date(2025, 11, 20), date(2025, 12, 18)]
+    assert select_lettings([], Watermark("kytc")) == []
+
+
+def test_save_and_load_watermark(db):
+    """Test that completed lettings are stored, the latest only moves forward, and unknown counts keep the stored one."""
+    watermark = load_watermark(db, "kytc")
+    assert (watermark.latest, watermark.completed) == (None, set())
+
+    watermark.complete(date(2025, 11, 20), 4)
+    watermark.complete(date(2025, 10, 23), 2)
+    save_watermark(db, watermark)
+    db.commit()
+
+    watermark = load_watermark(db, "kytc")
+    watermark.complete(date(2025, 10, 23))  # Re-checked and unchanged
+    watermark.complete(date(2025, 1, 16), 7)  # Backfilled
+    save_watermark(db, watermark)
+    db.commit()
+
+    stored = load_watermark(db, "kytc")
+    assert stored.latest == date(2025, 11, 20)
+    assert stored.completed == {date(2025, 1, 16), date(2025, 10, 23), date(2025, 11, 20)}
+    assert load_watermark(db, "indot").latest is None
+
+    from app.models import IngestedLetting
+    assert db.get(IngestedLetting, ("kytc", date(2025, 10, 23))).records == 2
+
+
+def test_pending_lettings_newest_first():
+    """Test that the backfill's to-do list skips completed lettings and starts with the newest."""
+    watermark = Watermark("kytc", completed=[date(2025, 11, 20), date(2025, 12, 18)])
+
+    assert pending_lettings(LETTINGS, watermark) == [date(2025, 10, 23), date(2025, 9, 18), date(2025, 1, 16)]